@@ -4,14 +4,17 @@ import os
 import threading
 import dotenv
 
-from config import FLASK_PORT
+from config import FLASK_PORT, YOUTUBE_CACHE_WARM
 from routes.health import bp as health_bp
 from routes.skill_gap import bp as skill_gap_bp
 from routes.jobs import bp as jobs_bp
+from utils import metrics
+from worker_pool import PoolBusy
 
 dotenv.load_dotenv()
 
 app = Flask(__name__)
+metrics.init_app(app)
 
 
 def _preload_job_recommender():
@@ -22,6 +25,24 @@ def _preload_job_recommender():
         pass
 
 
+def _warm_worker_pool():
+    try:
+        from services import get_worker_pool
+        pool = get_worker_pool()
+        if pool is not None:
+            pool.warm_up()
+    except Exception:
+        pass
+
+
+def _warm_video_cache():
+    try:
+        from services import warm_video_cache
+        warm_video_cache()
+    except Exception:
+        pass
+
+
 @app.after_request
 def add_cors_headers(response):
     """Add CORS headers to every response."""
@@ -31,6 +52,12 @@ def add_cors_headers(response):
     return response
 
 
+@app.errorhandler(PoolBusy)
+def pool_busy(e):
+    """Backpressure from the worker pool: ask the client to retry."""
+    return {"error": str(e)}, 503, {"Retry-After": str(e.retry_after)}
+
+
 @app.route("/<path:path>", methods=["OPTIONS"])
 @app.route("/", methods=["OPTIONS"])
 def options_handler(path=""):
@@ -42,6 +69,9 @@ def options_handler(path=""):
 def warm():
     """Return 200 immediately; preload job recommender in background (avoids Render 30s timeout)."""
     threading.Thread(target=_preload_job_recommender, daemon=True).start()
+    threading.Thread(target=_warm_worker_pool, daemon=True).start()
+    if YOUTUBE_CACHE_WARM:
+        threading.Thread(target=_warm_video_cache, daemon=True).start()
     return {"status": "ok", "message": "Preload started"}
 
 app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-here')
@@ -0,0 +1 @@
+"""Benchmarks for the recommendation and skill-gap pipelines (run from the flask/ directory)."""
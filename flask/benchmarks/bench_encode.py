@@ -0,0 +1,96 @@
+"""Resume encoding under concurrent requests: one encode call each vs micro-batched.
+
+    python -m benchmarks.bench_encode [--clients 1 4 16 32] [--requests 400] [--max-wait-ms 5]
+                                      [--model stub] [--call-ms 8] [--text-ms 0.5]
+
+Each client thread encodes single resumes back to back, as request threads do. ``--model stub``
+(the default) is synthetic.HashingEncoder plus a simulated forward pass that costs
+``--call-ms`` per call and ``--text-ms`` per text. Like a real model it releases the GIL but
+occupies the CPU, so forward passes run one at a time; any other value is loaded as a sentence-transformers model. Reports throughput, p50/p95
+latency, and mean batch size for micro_batch.MicroBatchEncoder.
+"""
+import argparse
+import json
+import threading
+import time
+
+from job_recommender.micro_batch import MicroBatchEncoder
+
+from .bench_pipeline import percentiles
+from .synthetic import HashingEncoder, load_base_jobs, synthetic_resumes
+
+
+class SimulatedEncoder(HashingEncoder):
+    """HashingEncoder with a forward-pass cost: fixed per call plus per text, one pass at a time."""
+
+    def __init__(self, call_ms: float, text_ms: float, dim: int = 384):
+        super().__init__(dim)
+        self.call_s, self.text_s = call_ms / 1000.0, text_ms / 1000.0
+        self._device = threading.Lock()
+
+    def encode(self, texts, batch_size: int = 32, show_progress_bar: bool = False, **kwargs):
+        with self._device:
+            time.sleep(self.call_s + self.text_s * len(texts))
+        return super().encode(texts, batch_size, show_progress_bar, **kwargs)
+
+
+def _run(model, texts, clients: int, requests: int) -> dict:
+    latencies, lock = [], threading.Lock()
+    per_client = max(1, requests // clients)
+
+    def client(offset: int):
+        own = []
+        for i in range(per_client):
+            text = texts[(offset * per_client + i) % len(texts)]
+            start = time.perf_counter()
+            model.encode([text])
+            own.append((time.perf_counter() - start) * 1000.0)
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return {'throughput_rps': round(len(latencies) / elapsed, 1), **percentiles(latencies)}
+
+
+def run(clients, requests: int, max_batch: int, max_wait_ms: float, model_name: str,
+        call_ms: float, text_ms: float) -> dict:
+    if model_name == 'stub':
+        model = SimulatedEncoder(call_ms, text_ms)
+    else:
+        from job_recommender.models import load_sentence_model
+        model = load_sentence_model(model_name)
+    texts = synthetic_resumes(load_base_jobs(), 200)
+    results = []
+    for n in clients:
+        batcher = MicroBatchEncoder(model, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        direct = _run(model, texts, n, requests)
+        batched = _run(batcher, texts, n, requests)
+        results.append({'clients': n, 'direct': direct, 'micro_batched': batched,
+                        'mean_batch': batcher.stats()['mean_batch'],
+                        'speedup': round(batched['throughput_rps'] / direct['throughput_rps'], 2)})
+    return {'benchmark': 'encode', 'model': model_name, 'max_batch': max_batch, 'max_wait_ms': max_wait_ms,
+            'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--model', default='stub')
+    parser.add_argument('--call-ms', type=float, default=8.0, help="stub: simulated cost per encode call")
+    parser.add_argument('--text-ms', type=float, default=0.5, help="stub: simulated cost per text")
+    args = parser.parse_args()
+    print(json.dumps(run(args.clients, args.requests, args.max_batch, args.max_wait_ms, args.model,
+                         args.call_ms, args.text_ms), indent=2))
+
+
+if __name__ == '__main__':
+    main()
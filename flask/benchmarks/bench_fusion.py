@@ -0,0 +1,82 @@
+"""Score fusion: per-candidate loop vs columnar combine_similarity_scores.
+
+    python -m benchmarks.bench_fusion [--sizes 1000 10000 100000] [--pool 150] [--repeat 20]
+"""
+import argparse
+import json
+import random
+import time
+
+from job_recommender import similarity
+from job_recommender.features import build_job_features
+
+from . import reference
+from .synthetic import load_base_jobs, scale_jobs
+
+RESUME_SKILLS = ['Python', 'Django', 'React', 'AWS', 'Docker', 'SQL', 'Git', 'JavaScript']
+RESUME_TITLES = ['software engineer', 'backend developer']
+
+
+def _candidates(n_jobs: int, pool: int, rng: random.Random):
+    tfidf = [(i, rng.random() * 0.4) for i in rng.sample(range(n_jobs), min(pool, n_jobs))]
+    emb = [(i, rng.random()) for i in rng.sample(range(n_jobs), min(pool, n_jobs))]
+    return sorted(tfidf, key=lambda x: -x[1]), sorted(emb, key=lambda x: -x[1])
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def run(sizes, pool: int, repeat: int, seed: int = 0) -> dict:
+    base = load_base_jobs()
+    results = []
+    for n in sizes:
+        jobs = scale_jobs(base, n, seed=seed)
+        t0 = time.perf_counter()
+        feats = build_job_features(jobs)
+        build_ms = (time.perf_counter() - t0) * 1000.0
+
+        rng = random.Random(seed)
+        tfidf, emb = _candidates(n, pool, rng)
+        cases = [
+            dict(resume_experience_level='mid', resume_job_titles=RESUME_TITLES),
+            dict(resume_experience_level='fresher', location_filter='bengaluru hyderabad'),
+            dict(),
+        ]
+        loop_ms = vec_ms = 0.0
+        identical = True
+        for kwargs in cases:
+            old = reference.combine_similarity_scores_loop(jobs, tfidf, emb, RESUME_SKILLS, **kwargs)
+            new = similarity.combine_similarity_scores(jobs, tfidf, emb, RESUME_SKILLS, features=feats, **kwargs)
+            identical = identical and old == new
+            loop_ms += _time(lambda: reference.combine_similarity_scores_loop(
+                jobs, tfidf, emb, RESUME_SKILLS, **kwargs), repeat)
+            vec_ms += _time(lambda: similarity.combine_similarity_scores(
+                jobs, tfidf, emb, RESUME_SKILLS, features=feats, **kwargs), repeat)
+
+        results.append({
+            'jobs': n,
+            'pool_per_retriever': pool,
+            'feature_build_ms': round(build_ms, 1),
+            'loop_ms': round(loop_ms / len(cases), 3),
+            'vectorized_ms': round(vec_ms / len(cases), 3),
+            'speedup': round(loop_ms / vec_ms, 1) if vec_ms else None,
+            'identical_rankings': identical,
+        })
+    return {'benchmark': 'fusion', 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--pool', type=int, default=150)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.pool, args.repeat), indent=2))
+
+
+if __name__ == '__main__':
+    main()
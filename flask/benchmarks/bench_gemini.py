@@ -0,0 +1,115 @@
+"""Skill gap analyses: Gemini calls saved by the analysis cache.
+
+    python -m benchmarks.bench_gemini [--latency 0.5] [--repeat 3]
+
+Uses fakes.FakeGeminiClient (with --latency seconds per call), so no API key or
+network is needed. Checks, in a temporary SQLite cache:
+
+- a repeated (resume, JD) pair and a whitespace-only variant of the JD make one Gemini call;
+- a second analyzer on the same SQLite file is served from disk without calling Gemini;
+- a fallback analysis (unparseable reply) is not cached, so the next request calls Gemini again.
+
+Exits non-zero when a check fails.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from skill_gap.analyzer import SkillGapAnalyzer, analysis_key
+from utils.cache import TieredCache
+
+from .fakes import FakeGeminiClient
+
+RESUME = "Backend engineer, 5 years of Python, Flask, PostgreSQL and Docker. Some AWS (EC2, S3)."
+JOB_DESCRIPTION = "We need a Python developer with Docker, Kubernetes and AWS experience.\nReact is a plus."
+JOB_DESCRIPTION_SPACED = "  We need a Python developer   with Docker, Kubernetes and AWS experience. React is a plus.\n"
+REPLY = {
+    'present_skills': ['Python', 'Docker', 'AWS'],
+    'missing_skills': ['Kubernetes'],
+    'additional_skills': ['React'],
+    'skill_details': {},
+}
+
+
+def _client(reply, latency: float) -> FakeGeminiClient:
+    text = json.dumps(reply) if isinstance(reply, dict) else reply
+
+    def respond(prompt: str) -> str:
+        time.sleep(latency)
+        return text
+    return FakeGeminiClient(respond)
+
+
+def _analyzer(client: FakeGeminiClient, disk_path: str) -> SkillGapAnalyzer:
+    cache = TieredCache(max_entries=64, disk_path=disk_path, table='skill_gap_analysis')
+    return SkillGapAnalyzer(gemini_client=client, analysis_cache=cache)
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000.0, result
+
+
+def _memory_case(disk_path: str, latency: float, repeat: int) -> dict:
+    client = _client(REPLY, latency)
+    analyzer = _analyzer(client, disk_path)
+    first_ms, first = _time(lambda: analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION))
+    cached_ms, cached = _time(lambda: [analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION) for _ in range(repeat)])
+    spaced = analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION_SPACED)
+    return {'case': 'repeated pair + whitespace-only JD variant', 'requests': repeat + 2,
+            'gemini_calls': len(client.calls), 'first_ms': round(first_ms, 1),
+            'cached_ms': round(cached_ms / repeat, 3),
+            'passed': len(client.calls) == 1 and all(c == first for c in cached) and spaced == first}
+
+
+def _disk_case(disk_path: str, latency: float) -> dict:
+    client = _client(REPLY, latency)
+    analyzer = _analyzer(client, disk_path)
+    elapsed_ms, analysis = _time(lambda: analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION))
+    return {'case': 'second analyzer, same SQLite file', 'gemini_calls': len(client.calls),
+            'ms': round(elapsed_ms, 2),
+            'passed': not client.calls and analysis.get('missing_skills') == REPLY['missing_skills']}
+
+
+def _fallback_case(disk_path: str, latency: float) -> dict:
+    client = _client("the model is overloaded", latency)
+    analyzer = _analyzer(client, disk_path)
+    resume = RESUME + " Fallback case."
+    analyzer.analyze_skill_gap(resume, JOB_DESCRIPTION)
+    analyzer.analyze_skill_gap(resume, JOB_DESCRIPTION)
+    on_disk = _analyzer(FakeGeminiClient(), disk_path).analysis_cache.get(analysis_key(resume, JOB_DESCRIPTION))
+    return {'case': 'fallback analysis not cached', 'gemini_calls': len(client.calls),
+            'passed': len(client.calls) == 2 and on_disk is None}
+
+
+def run(latency: float, repeat: int) -> dict:
+    directory = tempfile.mkdtemp(prefix='bench-gemini-')
+    try:
+        disk_path = os.path.join(directory, 'analysis.sqlite')
+        results = [
+            _memory_case(disk_path, latency, repeat),
+            _disk_case(disk_path, latency),
+            _fallback_case(disk_path, latency),
+        ]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {'benchmark': 'gemini', 'latency_s': latency, 'results': results,
+            'passed': all(r['passed'] for r in results)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.5, help="seconds per fake Gemini call")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    result = run(args.latency, args.repeat)
+    print(json.dumps(result, indent=2))
+    raise SystemExit(0 if result['passed'] else 1)
+
+
+if __name__ == '__main__':
+    main()
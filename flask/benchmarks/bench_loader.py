@@ -0,0 +1,132 @@
+"""Memory and time to load a large job dump: json.load + list stages, the streaming pipeline
+into a list of dicts, and the streaming pipeline into the columnar JobStore.
+
+    python -m benchmarks.bench_loader [--jobs 1000000] [--format array|jsonl] [--skip-eager]
+
+Each loader runs in its own process so peak RSS (ru_maxrss) and the RSS still held once
+loading is done (retained, i.e. what the recommender keeps) are measured in isolation.
+The synthetic dump is written to a temporary directory as naukridatas.json.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from .synthetic import load_raw_naukri
+
+
+def write_dump(directory: str, n_jobs: int, fmt: str, seed: int = 0) -> int:
+    """Write n_jobs raw Naukri records (unique ids and titles) and an empty primary file."""
+    base = load_raw_naukri()
+    rng = random.Random(seed)
+    path = os.path.join(directory, 'naukridatas.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        if fmt == 'array':
+            f.write('[\n')
+        for i in range(n_jobs):
+            record = dict(base[i % len(base)] if i < len(base) else rng.choice(base))
+            record['jobId'] = f"{record.get('jobId', '')}-{i}"
+            record['title'] = f"{record.get('title', '')} #{i}"
+            line = json.dumps(record, ensure_ascii=False)
+            if fmt == 'array':
+                f.write(line + (',\n' if i < n_jobs - 1 else '\n'))
+            else:
+                f.write(line + '\n')
+        if fmt == 'array':
+            f.write(']\n')
+    with open(os.path.join(directory, 'data.json'), 'w', encoding='utf-8') as f:
+        f.write('[]')
+    return os.path.getsize(path)
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _current_rss_mb() -> float:
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2 ** 20
+
+
+def child(mode: str, directory: str) -> dict:
+    """Load the dump with one pipeline; runs inside the measuring subprocess."""
+    from job_recommender import data_loader, preprocessing
+    from . import reference
+
+    data_path = os.path.join(directory, 'data.json')
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    if mode == 'eager':
+        jobs = reference.load_jobs_eager(data_path)
+    elif mode == 'stream':
+        jobs = preprocessing.preprocess_jobs(data_loader.iter_jobs_data(data_path))
+    else:
+        from job_recommender.job_store import JobStore
+        jobs = JobStore.from_jobs(preprocessing.iter_preprocessed(data_loader.iter_jobs_data(data_path)))
+    seconds = time.perf_counter() - start
+    gc.collect()
+    retained = _current_rss_mb() - baseline
+    return {
+        'loader': mode,
+        'jobs_loaded': len(jobs),
+        'seconds': round(seconds, 2),
+        'baseline_rss_mb': round(baseline, 1),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+        'retained_mb': round(retained, 1),
+        'retained_bytes_per_job': int(retained * 2 ** 20 / max(1, len(jobs))),
+    }
+
+
+def measure(mode: str, directory: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_loader', '--child', mode, '--dir', directory],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if proc.returncode != 0:
+        return {'loader': mode, 'error': f"exit code {proc.returncode}", 'stderr': proc.stderr[-500:]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(n_jobs: int, fmt: str, skip_eager: bool = False) -> dict:
+    directory = tempfile.mkdtemp(prefix='bench-loader-')
+    try:
+        size = write_dump(directory, n_jobs, fmt)
+        results = {'benchmark': 'loader', 'jobs': n_jobs, 'format': fmt, 'file_mb': round(size / 2 ** 20, 1)}
+        if not skip_eager:
+            results['eager'] = measure('eager', directory)
+        results['streaming'] = measure('stream', directory)
+        results['job_store'] = measure('store', directory)
+        eager, stream, columnar = results.get('eager', {}), results['streaming'], results['job_store']
+        if 'peak_rss_mb' in eager and 'peak_rss_mb' in stream:
+            results['peak_rss_reduction'] = round(eager['peak_rss_mb'] / stream['peak_rss_mb'], 2)
+        if 'retained_mb' in stream and 'retained_mb' in columnar:
+            results['job_store_memory_reduction'] = round(stream['retained_mb'] / columnar['retained_mb'], 2)
+        return results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--format', choices=('array', 'jsonl'), default='array')
+    parser.add_argument('--skip-eager', action='store_true', help="only measure the streaming loaders")
+    parser.add_argument('--child', choices=('eager', 'stream', 'store'), help=argparse.SUPPRESS)
+    parser.add_argument('--dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(child(args.child, args.dir)))
+        return
+    print(json.dumps(run(args.jobs, args.format, args.skip_eager), indent=2))
+
+
+if __name__ == '__main__':
+    main()
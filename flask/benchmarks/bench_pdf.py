@@ -0,0 +1,103 @@
+"""PDF text extraction: the original PyPDF2 ``+=`` loop vs utils.pdf_text backends.
+
+    python -m benchmarks.bench_pdf [--corpus ../node/uploads] [--long-pages 300] [--repeat 3]
+
+The corpus is every *.pdf under --corpus (the sample uploads by default). A long document is
+added by repeating the corpus pages up to --long-pages pages, the case where the page cap and
+the process pool matter. Each backend runs in-process and through the pool (page cap off),
+and its text is checked against the original loop; PyMuPDF is skipped when not installed.
+"""
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import tempfile
+import time
+
+from utils import pdf_text
+
+from . import reference
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'node', 'uploads')
+
+
+def _time(fn, repeat: int):
+    result, start = None, time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000.0, result
+
+
+def _page_count(path: str) -> int:
+    import PyPDF2
+
+    with open(path, 'rb') as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+def build_long_pdf(paths, pages: int, out_path: str) -> None:
+    """Write a PDF of ``pages`` pages cycling through the pages of ``paths``."""
+    import PyPDF2
+
+    source_pages = [page for path in paths for page in PyPDF2.PdfReader(path).pages]
+    writer = PyPDF2.PdfWriter()
+    for i in range(pages):
+        writer.add_page(source_pages[i % len(source_pages)])
+    with open(out_path, 'wb') as f:
+        writer.write(f)
+
+
+def _document(path: str, backends, workers: int, repeat: int) -> dict:
+    with open(path, 'rb') as f:
+        data = f.read()
+    result = {'file': os.path.basename(path), 'pages': _page_count(path), 'kb': len(data) // 1024}
+    concat_ms, expected = _time(lambda: reference.extract_pdf_text_concat(path), repeat)
+    result['pypdf2_concat_ms'] = round(concat_ms, 1)
+    for backend in backends:
+        inline_ms, text = _time(lambda: pdf_text.extract_pdf_text(data, backend, max_pages=0, pool_min_pages=0),
+                                repeat)
+        result[f'{backend}_ms'] = round(inline_ms, 1)
+        if backend == 'pypdf2':
+            result['pypdf2_same_text'] = text == expected
+        else:
+            result[f'{backend}_chars_vs_pypdf2'] = round(len(text) / max(1, len(expected)), 2)
+        pooled_ms, pooled = _time(lambda: pdf_text.extract_pdf_text(data, backend, max_pages=0, pool_min_pages=1,
+                                                                    pool_workers=workers), repeat)
+        result[f'{backend}_pool_ms'] = round(pooled_ms, 1)
+        result[f'{backend}_pool_same_text'] = pooled == text
+    return result
+
+
+def run(corpus: str, long_pages: int, workers: int, repeat: int) -> dict:
+    paths = sorted(glob.glob(os.path.join(corpus, '*.pdf')))
+    if not paths:
+        raise SystemExit(f"No PDFs found in {corpus}")
+    backends = ['pypdf2'] + (['pymupdf'] if importlib.util.find_spec('fitz') is not None else [])
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench-pdf-') as directory:
+        documents = list(paths)
+        if long_pages:
+            long_path = os.path.join(directory, f'long-{long_pages}-pages.pdf')
+            build_long_pdf(paths, long_pages, long_path)
+            documents.append(long_path)
+        # Start the pool outside the timings: workers are spawned once per process.
+        pdf_text.start_pool(workers)
+        for path in documents:
+            results.append(_document(path, backends, workers, repeat))
+    pdf_text.shutdown_pool()
+    return {'benchmark': 'pdf', 'backends': backends, 'pool_workers': workers, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="directory of sample PDFs")
+    parser.add_argument('--long-pages', type=int, default=300, help="pages of the synthetic long PDF (0 = none)")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.corpus, args.long_pages, args.workers, args.repeat), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+"""End-to-end pipeline benchmark per corpus size: cold start, recommend_jobs latency, skill gap
+latency, HTTP throughput under concurrent clients, peak RSS and skill-extraction throughput.
+
+    python -m benchmarks.bench_pipeline [--jobs 1000 10000] [--requests 200] [--clients 1 4 16]
+                                        [--model stub] [--output results.json] [--compare baseline.json]
+
+Each size runs in its own process over a synthetic dump (naukridatas.json scaled, written to a
+temporary directory), so peak RSS is per size and the model store is built from scratch: cold
+start covers loading, preprocessing, TF-IDF fitting, encoding and index building, warm start
+reopens the store. ``--model stub`` (the default) uses synthetic.HashingEncoder so runs are
+offline and repeatable; any other value is loaded as a sentence-transformers model. Requests
+bypass the resume cache, so every latency sample does the full work.
+
+The result is JSON; save it with ``--output`` and pass it to a later run as ``--compare`` to
+print the relative change of every metric between commits.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .bench_loader import write_dump, _peak_rss_mb
+from .synthetic import FLASK_DIR, HashingEncoder, load_base_jobs, synthetic_resumes
+
+LOCATIONS = [None, None, None, 'Bengaluru', 'Pune', 'Hyderabad', 'Remote']
+
+
+def percentiles(samples_ms) -> dict:
+    import numpy as np
+
+    if not samples_ms:
+        return {'count': 0}
+    values = np.asarray(samples_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': len(values),
+        'mean_ms': round(float(values.mean()), 2),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'max_ms': round(float(values.max()), 2),
+    }
+
+
+def _stage_totals() -> dict:
+    from utils import metrics
+    return {labels[0]: (s['count'], s['sum']) for labels, s in metrics.STAGE_SECONDS.snapshot().items()}
+
+
+def _stage_means(before: dict, after: dict) -> dict:
+    """Mean milliseconds per call of each stage recorded between two _stage_totals snapshots."""
+    means = {}
+    for stage, (count, total) in sorted(after.items()):
+        prev_count, prev_total = before.get(stage, (0, 0.0))
+        if count > prev_count:
+            means[stage] = round((total - prev_total) / (count - prev_count) * 1000, 3)
+    return means
+
+
+def _throughput(name: str, fn, items) -> dict:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    seconds = time.perf_counter() - start
+    return {'function': name, 'docs': len(items), 'docs_per_s': round(len(items) / max(seconds, 1e-9), 1)}
+
+
+def bench_recommend(recommender, resumes, top_k: int) -> dict:
+    samples, empty = [], 0
+    before = _stage_totals()
+    for i, text in enumerate(resumes):
+        start = time.perf_counter()
+        result = recommender.recommend_jobs(text, location_filter=LOCATIONS[i % len(LOCATIONS)], top_k=top_k)
+        samples.append((time.perf_counter() - start) * 1000)
+        empty += not result.get('top_jobs')
+    return {**percentiles(samples), 'empty_results': empty,
+            'stages_mean_ms': _stage_means(before, _stage_totals())}
+
+
+def bench_skill_gap(resumes, descriptions) -> dict:
+    from skill_gap_analyzer import SkillGapAnalyzer
+
+    analyzer = SkillGapAnalyzer()  # no API keys: the regex fallback, no YouTube calls
+    samples = []
+    for text, description in zip(resumes, descriptions):
+        start = time.perf_counter()
+        analyzer.analyze_skill_gap_with_resources(text, description)
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def bench_skills(jobs, resumes) -> list:
+    from job_recommender import data_loader, preprocessing
+    from skill_gap import skills_extractor
+    from .synthetic import load_raw_naukri
+
+    descriptions = [j.get('description', '') for j in jobs]
+    raw = data_loader.normalize_naukri_jobs(load_raw_naukri())
+    return [
+        _throughput('preprocessing.extract_skills_from_description', preprocessing.extract_skills_from_description,
+                    descriptions),
+        _throughput('preprocessing.iter_preprocessed', lambda job: list(preprocessing.iter_preprocessed([job])), raw),
+        _throughput('skills_extractor.extract_skills_from_text (jobs)', skills_extractor.extract_skills_from_text,
+                    descriptions),
+        _throughput('skills_extractor.extract_skills_from_text (resumes)', skills_extractor.extract_skills_from_text,
+                    resumes),
+        _throughput('skills_extractor.extract_skills_fallback_improved',
+                    lambda pair: skills_extractor.extract_skills_fallback_improved(*pair),
+                    list(zip(resumes, descriptions))),
+    ]
+
+
+def _multipart(text: str, top_k: int):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="top_k"\r\n\r\n{top_k}\r\n'
+        f'--{boundary}\r\nContent-Disposition: form-data; name="resume"; filename="resume.txt"\r\n'
+        f'Content-Type: text/plain\r\n\r\n{text}\r\n--{boundary}--\r\n'
+    ).encode('utf-8')
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def bench_http(recommender, resumes, clients_levels, top_k: int) -> list:
+    """POST /recommend-jobs from ``clients`` concurrent clients against a threaded Werkzeug server."""
+    from werkzeug.serving import make_server
+    import services
+    from app import app
+
+    services.job_recommender = recommender
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/recommend-jobs'
+    payloads = [_multipart(text, top_k) for text in resumes]
+
+    def call(payload):
+        body, content_type = payload
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': content_type})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=300) as response:
+                response.read()
+                ok = response.status == 200
+        except Exception:
+            ok = False
+        return (time.perf_counter() - start) * 1000, ok
+
+    results = []
+    try:
+        call(payloads[0])
+        for clients in clients_levels:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                outcomes = list(pool.map(call, payloads))
+            seconds = time.perf_counter() - start
+            results.append({
+                'clients': clients,
+                'requests_per_s': round(len(outcomes) / seconds, 2),
+                'errors': sum(1 for _, ok in outcomes if not ok),
+                **percentiles([ms for ms, _ in outcomes]),
+            })
+    finally:
+        server.shutdown()
+    return results
+
+
+def child(directory: str, params: dict) -> dict:
+    """Run every measurement for one corpus; executes inside the measuring subprocess."""
+    from job_recommender import JobRecommender
+    from job_recommender.pool import PoolSizer
+
+    data_path = os.path.join(directory, 'data.json')
+    model = params['model']
+    encoder = HashingEncoder() if model == 'stub' else None
+    model_name = 'stub-hashing-384' if model == 'stub' else model
+
+    baseline_rss = _peak_rss_mb()
+    start = time.perf_counter()
+    recommender = JobRecommender(data_path, model_name, pool_sizer=PoolSizer(), sentence_model=encoder)
+    loaded = time.perf_counter()
+    recommender._ensure_models_initialized()
+    initialized = time.perf_counter()
+    cold_rss = _peak_rss_mb()
+
+    start_warm = time.perf_counter()
+    warm = JobRecommender(data_path, model_name, pool_sizer=PoolSizer(), sentence_model=recommender.sentence_model)
+    warm._ensure_models_initialized()
+    warm_s = time.perf_counter() - start_warm
+    del warm
+
+    n_requests, top_k = params['requests'], params['top_k']
+    resumes = synthetic_resumes(load_base_jobs(), n_requests + 5, seed=params['seed'])
+    warmup, resumes = resumes[:5], resumes[5:]
+    for text in warmup:
+        recommender.recommend_jobs(text, top_k=top_k)
+    sample_jobs = [recommender.jobs_data[i] for i in range(0, len(recommender.jobs_data),
+                                                             max(1, len(recommender.jobs_data) // n_requests))]
+    descriptions = [job.get('description', '') for job in sample_jobs][:n_requests]
+
+    return {
+        'jobs_loaded': len(recommender.jobs_data),
+        'cold_start': {
+            'load_preprocess_s': round(loaded - start, 2),
+            'model_init_s': round(initialized - loaded, 2),
+            'total_s': round(initialized - start, 2),
+        },
+        'warm_start_s': round(warm_s, 2),
+        'recommend_jobs': bench_recommend(recommender, resumes, top_k),
+        'skill_gap': bench_skill_gap(resumes, descriptions),
+        'skill_extraction': bench_skills(sample_jobs, resumes),
+        'http_recommend_jobs': bench_http(recommender, resumes, params['clients'], top_k),
+        'rss_mb': {
+            'baseline': round(baseline_rss, 1),
+            'after_cold_start': round(cold_rss, 1),
+            'peak': round(_peak_rss_mb(), 1),
+        },
+    }
+
+
+def measure(n_jobs: int, params: dict) -> dict:
+    directory = tempfile.mkdtemp(prefix='bench-pipeline-')
+    try:
+        write_dump(directory, n_jobs, 'jsonl', seed=params['seed'])
+        env = {k: v for k, v in os.environ.items() if k not in ('GEMINI_API_KEY', 'YOUTUBE_API_KEY')}
+        env.update(INGEST_POLL_SECONDS='0', RESUME_CACHE_PATH='', PYTHONHASHSEED='0')
+        proc = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_pipeline', '--child', directory, '--params', json.dumps(params)],
+            capture_output=True, text=True, cwd=FLASK_DIR, env=env,
+        )
+        if proc.returncode != 0:
+            return {'jobs': n_jobs, 'error': f"exit code {proc.returncode}", 'stderr': proc.stderr[-1000:]}
+        return {'jobs': n_jobs, **json.loads(proc.stdout.strip().splitlines()[-1])}
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=FLASK_DIR).stdout.strip()
+    except OSError:
+        return ''
+
+
+def run(sizes, params: dict) -> dict:
+    return {
+        'benchmark': 'pipeline',
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'params': params,
+        'results': [measure(n, params) for n in sizes],
+    }
+
+
+def _flatten(value, prefix: str = '') -> dict:
+    """Numeric leaves keyed by path; list entries are keyed by their jobs / clients / function field."""
+    flat = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}.{key}" if prefix else key))
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            label = i
+            if isinstance(item, dict):
+                label = next((f"{k}={item[k]}" for k in ('jobs', 'clients', 'function') if k in item), i)
+            flat.update(_flatten(item, f"{prefix}[{label}]"))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        flat[prefix] = value
+    return flat
+
+
+def compare(baseline: dict, current: dict) -> list:
+    """(metric, baseline, current, relative change) for every metric present in both runs."""
+    old, new = _flatten(baseline.get('results', [])), _flatten(current.get('results', []))
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        change = (new[key] - old[key]) / old[key] if old[key] else None
+        rows.append((key, old[key], new[key], change))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--requests', type=int, default=200, help="resumes scored per measurement")
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--model', default='stub', help="'stub' or a sentence-transformers model name")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="also write the JSON result to this file")
+    parser.add_argument('--compare', help="earlier --output file to compare against")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--params', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        import logging
+        logging.disable(logging.WARNING)
+        print(json.dumps(child(args.child, json.loads(args.params))))
+        return
+
+    params = {'requests': args.requests, 'clients': args.clients, 'top_k': args.top_k,
+              'model': args.model, 'seed': args.seed}
+    result = run(args.jobs, params)
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nChange vs {args.compare} (commit {baseline.get('commit', '?')}):", file=sys.stderr)
+        for key, old, new, change in compare(baseline, result):
+            pct = f"{change:+.1%}" if change is not None else 'n/a'
+            print(f"  {key}: {old} -> {new} ({pct})", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
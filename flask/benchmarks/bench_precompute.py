@@ -0,0 +1,73 @@
+"""Per-request cost of experience levels and title dedup keys: recomputed vs precomputed at load.
+
+    python -m benchmarks.bench_precompute [--jobs 10000] [--top-k 30] [--repeat 50]
+"""
+import argparse
+import json
+import random
+import time
+
+from job_recommender import formatters
+from job_recommender.formatters import determine_job_experience_level, get_job_experience_level
+
+from . import reference
+from .synthetic import load_base_jobs, scale_jobs
+
+PRECOMPUTED_FIELDS = ('job_level', 'title_normalized', 'title_core')
+RESUME_ANALYSIS = {'skills': ['Python', 'Django', 'React', 'AWS', 'Docker'], 'job_titles': ['software engineer']}
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def run(n_jobs: int, top_k: int, repeat: int, seed: int = 0) -> dict:
+    jobs = scale_jobs(load_base_jobs(), n_jobs, seed=seed)
+    stripped = [{k: v for k, v in job.items() if k not in PRECOMPUTED_FIELDS} for job in jobs]
+
+    rng = random.Random(seed)
+    pool = top_k * 3
+    tfidf = [(i, rng.random() * 0.4) for i in rng.sample(range(n_jobs), pool)]
+    emb = [(i, rng.random()) for i in rng.sample(range(n_jobs), pool)]
+    scored = sorted(tfidf + emb, key=lambda x: -x[1])[:top_k * 2]
+
+    def before():
+        reference.combine_similarity_scores_loop(
+            stripped, tfidf, emb, RESUME_ANALYSIS['skills'], resume_experience_level='mid',
+            determine_job_level_fn=determine_job_experience_level)
+        formatters.format_recommendations(stripped, scored, RESUME_ANALYSIS)
+
+    def after():
+        reference.combine_similarity_scores_loop(
+            jobs, tfidf, emb, RESUME_ANALYSIS['skills'], resume_experience_level='mid',
+            determine_job_level_fn=get_job_experience_level)
+        formatters.format_recommendations(jobs, scored, RESUME_ANALYSIS)
+
+    identical = formatters.format_recommendations(stripped, scored, RESUME_ANALYSIS) == \
+        formatters.format_recommendations(jobs, scored, RESUME_ANALYSIS)
+    before_ms, after_ms = _time(before, repeat), _time(after, repeat)
+    return {
+        'benchmark': 'precompute',
+        'jobs': n_jobs,
+        'top_k': top_k,
+        'per_request_before_ms': round(before_ms, 3),
+        'per_request_after_ms': round(after_ms, 3),
+        'speedup': round(before_ms / after_ms, 1) if after_ms else None,
+        'identical_output': identical,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=10000)
+    parser.add_argument('--top-k', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.jobs, args.top_k, args.repeat), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Skill extraction throughput: per-skill regex loop vs the shared single-pass SkillMatcher.
+
+    python -m benchmarks.bench_skills [--docs 2000]
+"""
+import argparse
+import json
+import time
+
+from job_recommender import preprocessing
+from skill_gap import skills_extractor
+
+from . import reference
+from .synthetic import load_base_jobs, scale_jobs
+
+
+def _bench(name: str, texts, aliases, matcher) -> dict:
+    start = time.perf_counter()
+    old = [reference.extract_skills_regex_loop(t, aliases) for t in texts]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = [matcher.find(t) for t in texts]
+    matcher_s = time.perf_counter() - start
+
+    differing = {}
+    for a, b in zip(old, new):
+        for skill in set(a) ^ set(b):
+            differing[skill] = differing.get(skill, 0) + 1
+    return {
+        'vocabulary': name,
+        'skills': len(aliases),
+        'docs': len(texts),
+        'regex_loop_docs_per_s': round(len(texts) / loop_s, 1),
+        'matcher_docs_per_s': round(len(texts) / matcher_s, 1),
+        'speedup': round(loop_s / matcher_s, 1),
+        'docs_identical': sum(1 for a, b in zip(old, new) if set(a) == set(b)),
+        'differing_skills': differing,
+    }
+
+
+def run(n_docs: int) -> dict:
+    texts = [job['combined_text'] for job in scale_jobs(load_base_jobs(), n_docs)]
+    job_aliases = {skill: [skill.lower()] for skill in sorted(preprocessing.SKILL_PATTERNS)}
+    return {
+        'benchmark': 'skills',
+        'results': [
+            _bench('job_recommender.preprocessing', texts, job_aliases, preprocessing.SKILL_MATCHER),
+            _bench('skill_gap.skills_extractor', texts, skills_extractor.SKILL_ALIASES, skills_extractor._MATCHER),
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.docs), indent=2))
+
+
+if __name__ == '__main__':
+    main()
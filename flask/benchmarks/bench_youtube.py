@@ -0,0 +1,90 @@
+"""Learning-resource lookups: serial YouTube searches vs the concurrent fan-out with a deadline.
+
+    python -m benchmarks.bench_youtube [--latency 0.3] [--slow-latency 10] [--deadline 1.0] [--repeat 3]
+
+Uses fakes.FakeYouTubeClient, so no API key or network is needed. The second case
+makes one skill far slower than the deadline: the fan-out returns the other skills' videos
+at the deadline, while the serial loop waits for it. The last case repeats the lookup through a
+video_cache.VideoCache in a temporary directory, the steady state for common skills.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from skill_gap.video_cache import VideoCache
+from skill_gap.youtube_client import get_youtube_videos_many
+
+from . import reference
+from .fakes import FakeYouTubeClient
+
+SKILLS = ['Kubernetes', 'Docker', 'AWS', 'React', 'Python']
+
+
+def _time(fn, repeat: int):
+    result, start = None, time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000.0, result
+
+
+def _case(name: str, client: FakeYouTubeClient, deadline: float, repeat: int, run_serial: bool = True) -> dict:
+    result = {'case': name, 'skills': len(SKILLS)}
+    if run_serial:
+        serial_ms, serial = _time(lambda: reference.get_youtube_videos_serial(client, SKILLS), repeat)
+        result.update(serial_ms=round(serial_ms, 1), serial_skills_with_videos=len(serial))
+    concurrent_ms, (videos, timed_out) = _time(
+        lambda: get_youtube_videos_many(client, SKILLS, timeout=None, deadline=deadline), repeat)
+    result.update(concurrent_ms=round(concurrent_ms, 1), concurrent_skills_with_videos=len(videos),
+                  timed_out=timed_out)
+    if run_serial:
+        result['speedup'] = round(result['serial_ms'] / concurrent_ms, 1)
+    return result
+
+
+def _cached_case(latency: float, deadline: float, repeat: int) -> dict:
+    directory = tempfile.mkdtemp(prefix='bench-youtube-')
+    try:
+        client, cache = FakeYouTubeClient(latency=latency), VideoCache(os.path.join(directory, 'videos.sqlite'))
+        lookup = lambda: get_youtube_videos_many(client, SKILLS, timeout=None, deadline=deadline, cache=cache)
+        first_ms, _ = _time(lookup, 1)
+        cached_ms, (videos, _) = _time(lookup, repeat)
+        return {'case': 'video cache', 'skills': len(SKILLS), 'first_ms': round(first_ms, 1),
+                'cached_ms': round(cached_ms, 2), 'cached_skills_with_videos': len(videos),
+                'api_calls': len(client.calls)}
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def run(latency: float, slow_latency: float, deadline: float, repeat: int) -> dict:
+    slow = {skill: latency for skill in SKILLS}
+    slow[SKILLS[0]] = slow_latency
+    return {
+        'benchmark': 'youtube',
+        'latency_s': latency,
+        'deadline_s': deadline,
+        'results': [
+            _case('uniform latency', FakeYouTubeClient(latency=latency), deadline, repeat),
+            _case('one failing search', FakeYouTubeClient(latency=latency, failing=[SKILLS[1]]), deadline, repeat),
+            # Serial would take slow_latency per repeat; only the fan-out is timed.
+            _case(f'one search takes {slow_latency}s', FakeYouTubeClient(latency=slow), deadline, repeat,
+                  run_serial=False),
+            _cached_case(latency, deadline, repeat),
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.3, help="seconds per fake search")
+    parser.add_argument('--slow-latency', type=float, default=10.0)
+    parser.add_argument('--deadline', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.latency, args.slow_latency, args.deadline, args.repeat), indent=2))
+
+
+if __name__ == '__main__':
+    main()
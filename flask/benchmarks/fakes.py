@@ -0,0 +1,82 @@
+"""Offline stand-ins for the external API clients, shared by benchmarks and tests.
+
+None of them touch the network: latency, failures and replies are scripted, and every call
+is recorded so callers can assert what was (not) sent.
+"""
+import json
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Union
+
+
+class FakeYouTubeClient:
+    """Offline stand-in for the googleapiclient YouTube resource (search().list(...).execute()).
+
+    ``latency`` (seconds, or {skill: seconds}) delays each search, and skills in ``failing``
+    raise, so deadline and partial-result handling can be exercised locally.
+    """
+
+    uses_http = False
+
+    def __init__(self, latency=0.0, failing: Iterable[str] = (), videos_per_skill: int = 3):
+        self.latency = latency
+        self.failing = set(failing)
+        self.videos_per_skill = videos_per_skill
+        self.calls: List[str] = []
+        self._lock = threading.Lock()
+
+    def search(self):
+        return self
+
+    def list(self, q: str, maxResults: int = 3, **kwargs):
+        return _FakeRequest(self, q.replace(' tutorial programming', ''), maxResults)
+
+
+class _FakeRequest:
+    def __init__(self, client: FakeYouTubeClient, skill: str, max_results: int):
+        self.client, self.skill, self.max_results = client, skill, max_results
+
+    def execute(self, http=None, num_retries: int = 0):
+        client = self.client
+        with client._lock:
+            client.calls.append(self.skill)
+        latency = client.latency.get(self.skill, 0.0) if isinstance(client.latency, dict) else client.latency
+        if latency:
+            time.sleep(latency)
+        if self.skill in client.failing:
+            raise RuntimeError(f"fake YouTube failure for {self.skill}")
+        n = min(self.max_results, client.videos_per_skill)
+        return {'items': [{
+            'id': {'videoId': f"{self.skill}-{i}"},
+            'snippet': {'title': f"{self.skill} tutorial {i}", 'channelTitle': 'Fake Channel',
+                        'description': f"Learn {self.skill}", 'thumbnails': {}},
+        } for i in range(n)]}
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiClient:
+    """Offline stand-in for a Gemini client: ``client.models.generate_content(model=..., contents=...)``.
+
+    ``reply`` is the JSON text returned for every prompt, or a function prompt -> text. Every
+    call is recorded in ``calls`` as (model, prompt) so callers can assert what was (not) sent.
+    """
+
+    def __init__(self, reply: Union[str, dict, Callable[[str], str], None] = None):
+        if reply is None:
+            reply = {'present_skills': [], 'missing_skills': [], 'additional_skills': [], 'skill_details': {}}
+        self.reply = json.dumps(reply) if isinstance(reply, dict) else reply
+        self.calls: List[tuple] = []
+        self._lock = threading.Lock()
+
+    @property
+    def models(self) -> 'FakeGeminiClient':
+        return self
+
+    def generate_content(self, model: str, contents: str, config: Optional[dict] = None) -> _Response:
+        with self._lock:
+            self.calls.append((model, contents))
+        return _Response(self.reply(contents) if callable(self.reply) else self.reply)
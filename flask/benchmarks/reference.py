@@ -0,0 +1,175 @@
+"""Reference (pre-optimization) implementations kept for benchmarks and equivalence checks."""
+from typing import List, Tuple, Dict
+
+from job_recommender.similarity import calculate_skill_match_score
+
+
+def combine_similarity_scores_loop(
+    jobs_data: List[Dict],
+    tfidf_scores: List[Tuple[int, float]],
+    embedding_scores: List[Tuple[int, float]],
+    resume_skills: List[str],
+    location_filter: str = None,
+    resume_experience_level: str = None,
+    resume_job_titles: List[str] = None,
+    determine_job_level_fn=None,
+) -> List[Tuple[int, float]]:
+    """Combine TF-IDF, embedding, and skill scores with filtering."""
+    from job_recommender.formatters import determine_job_experience_level
+    fn = determine_job_level_fn or determine_job_experience_level
+
+    tfidf_dict = {idx: s for idx, s in tfidf_scores}
+    embedding_dict = {idx: s for idx, s in embedding_scores}
+    all_indices = set(tfidf_dict.keys()) | set(embedding_dict.keys())
+
+    combined = []
+    for idx in all_indices:
+        if idx >= len(jobs_data):
+            continue
+        job = jobs_data[idx]
+
+        if location_filter and location_filter.strip():
+            kw = location_filter.lower().split()
+            loc = job.get('location', '').lower()
+            if not any(k in loc for k in kw):
+                continue
+
+        if resume_experience_level:
+            job_level = fn(job)
+            level_map = {
+                'fresher': ['fresher', 'internship'],
+                'junior': ['fresher', 'junior', 'mid'],
+                'mid': ['junior', 'mid', 'senior'],
+                'senior': ['mid', 'senior'],
+            }
+            allowed = level_map.get(resume_experience_level, ['fresher', 'junior', 'mid', 'senior'])
+            if job_level not in allowed:
+                continue
+
+        tfidf_s = tfidf_dict.get(idx, 0.0)
+        emb_s = embedding_dict.get(idx, 0.0)
+        skill_s = calculate_skill_match_score(resume_skills, job.get('skills', []))
+        score = 0.20 * tfidf_s + 0.50 * emb_s + 0.30 * skill_s
+
+        if skill_s > 0.5:
+            score *= 1.2
+        if resume_job_titles:
+            jt = job.get('title', '').lower()
+            for t in resume_job_titles:
+                if t.lower() in jt or jt in t.lower():
+                    score *= 1.15
+                    break
+
+        combined.append((idx, score))
+
+    combined.sort(key=lambda x: x[1], reverse=True)
+
+    linkedin = [(i, s) for i, s in combined if jobs_data[i].get('source', 'LinkedIn') != 'Naukri']
+    naukri = [(i, s) for i, s in combined if jobs_data[i].get('source') == 'Naukri']
+    mixed = []
+    for i in range(max(len(linkedin), len(naukri))):
+        if i < len(linkedin):
+            mixed.append(linkedin[i])
+        if i < len(naukri):
+            mixed.append(naukri[i])
+
+    return mixed
+
+
+def extract_skills_regex_loop(text: str, aliases) -> List[str]:
+    """One re.search per skill over the lowercased text (the previous extractors' approach).
+
+    ``aliases`` maps canonical skill -> surface forms; each skill's pattern is
+    ``\\b(?:form1|form2)\\b``, exactly what the old hand-written patterns were.
+    """
+    import re
+    if not text:
+        return []
+    text_lower = text.lower()
+    found = []
+    for skill, forms in aliases.items():
+        pattern = r'\b(?:' + '|'.join(re.escape(f) for f in forms) + r')\b'
+        if re.search(pattern, text_lower):
+            found.append(skill)
+    return found
+
+
+def load_jobs_eager(data_path: str) -> List[Dict]:
+    """The original loading path: json.load each file, normalize, dedup and preprocess as full lists."""
+    import json
+    import os
+    import re
+    from job_recommender import data_loader, preprocessing
+    from job_recommender.formatters import determine_job_experience_level, normalize_title
+
+    all_jobs = []
+    if os.path.exists(data_path):
+        with open(data_path, 'r', encoding='utf-8') as f:
+            all_jobs.extend(json.load(f))
+    naukri_path = os.path.join(os.path.dirname(os.path.abspath(data_path)), "naukridatas.json")
+    if os.path.exists(naukri_path):
+        with open(naukri_path, 'r', encoding='utf-8') as f:
+            naukri_jobs = json.load(f)
+        for job in naukri_jobs:
+            if not job.get('jobId') or not job.get('title'):
+                continue
+            skills_str = job.get('tagsAndSkills', '')
+            level = data_loader._parse_experience_level(job.get('experienceText') or job.get('experience') or "0 Yrs")
+            apply_url = job.get('jdURL') or job.get('companyJobsUrl') or ""
+            all_jobs.append({
+                'id': str(job.get('jobId')), 'title': job.get('title', ''),
+                'companyName': job.get('companyName', ''), 'company': job.get('companyName', ''),
+                'location': job.get('location', ''), 'description': job.get('jobDescription', ''),
+                'descriptionHtml': job.get('jobDescription', '').replace('\n', '<br>'),
+                'skills': [s.strip() for s in skills_str.split(',')] if skills_str else [],
+                'experienceLevel': level, 'experience_level': level,
+                'contractType': 'Full-time', 'workType': 'Full-time', 'sector': '',
+                'applyUrl': apply_url, 'apply_url': apply_url, 'jobUrl': apply_url, 'job_url': apply_url,
+                'postedTime': job.get('footerPlaceholderLabel') or job.get('createdDate', ''),
+                'salary': job.get('salary', 'Not disclosed'), 'source': 'Naukri',
+            })
+    unique = data_loader.remove_duplicates(all_jobs)
+
+    processed = []
+    for job in unique:
+        desc = job.get('description', '') or job.get('descriptionHtml', '')
+        if desc:
+            desc = re.sub(r'<[^>]+>', ' ', desc)
+            desc = re.sub(r'\s+', ' ', desc).strip()
+        existing = job.get('skills', [])
+        extracted = preprocessing.extract_skills_from_description(desc)
+        processed_job = {
+            **job,
+            'description': desc,
+            'skills': list(set(existing + extracted)) if existing else extracted,
+            'combined_text': preprocessing.create_combined_text(job, desc),
+        }
+        processed_job['job_level'] = determine_job_experience_level(processed_job)
+        processed_job['title_normalized'], processed_job['title_core'] = normalize_title(job.get('title', ''))
+        processed.append(processed_job)
+    return processed
+
+
+def get_youtube_videos_serial(youtube_client, skills: List[str], max_results: int = 3) -> Dict[str, List[Dict]]:
+    """The original learning-resource lookup: one YouTube search after another."""
+    from skill_gap.youtube_client import get_youtube_videos
+
+    videos = {}
+    for skill in skills:
+        found = get_youtube_videos(youtube_client, skill, max_results)
+        if found:
+            videos[skill] = found
+    return videos
+
+
+def extract_pdf_text_concat(path: str) -> str:
+    """The original PDF extraction: every page through PyPDF2, appended with ``+=``."""
+    import PyPDF2
+
+    with open(path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        text = ""
+        for page in reader.pages:
+            page_text = page.extract_text() or ""
+            text += page_text + "\n"
+    return text.strip()
@@ -0,0 +1,83 @@
+"""Synthetic corpora built by scaling naukridatas.json."""
+import json
+import os
+import random
+from typing import Dict, List
+
+from job_recommender import data_loader
+from job_recommender import preprocessing
+
+FLASK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NAUKRI_PATH = os.path.join(FLASK_DIR, 'naukridatas.json')
+
+
+def load_raw_naukri() -> List[Dict]:
+    with open(NAUKRI_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_base_jobs() -> List[Dict]:
+    """Normalized and preprocessed Naukri jobs, the seed for every synthetic corpus."""
+    return preprocessing.preprocess_jobs(data_loader.normalize_naukri_jobs(load_raw_naukri()))
+
+
+def scale_jobs(base_jobs: List[Dict], n: int, seed: int = 0) -> List[Dict]:
+    """n jobs sampled from base_jobs with unique ids (and a LinkedIn share, so interleaving is exercised)."""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        job = base_jobs[i % len(base_jobs)] if i < len(base_jobs) else rng.choice(base_jobs)
+        source = job.get('source') if rng.random() < 0.7 else 'LinkedIn'
+        jobs.append({**job, 'id': f"{job.get('id', '')}-{i}", 'source': source})
+    return jobs
+
+
+_SENIORITY = [
+    ('Recent graduate', 0), ('Junior', 1), ('', 3), ('Senior', 6), ('Lead', 10),
+]
+
+
+def synthetic_resumes(base_jobs: List[Dict], n: int, seed: int = 0) -> List[str]:
+    """n plain-text resumes: a seniority, titles and companies from base_jobs, and a sampled skill set."""
+    rng = random.Random(seed)
+    skills = sorted(preprocessing.SKILL_PATTERNS)
+    resumes = []
+    for i in range(n):
+        seniority, years = _SENIORITY[i % len(_SENIORITY)]
+        current, previous = rng.choice(base_jobs), rng.choice(base_jobs)
+        title = f"{seniority} {current.get('title', 'Software Engineer')}".strip()
+        lines = [
+            f"Candidate {i}",
+            f"{title} based in {current.get('location', 'Bengaluru')}",
+            f"Summary: {years} years of experience building production systems." if years else
+            "Summary: fresher looking for an entry level role, completed internship projects.",
+            f"Skills: {', '.join(rng.sample(skills, rng.randint(4, 12)))}",
+            "Experience:",
+            f"- {current.get('title', '')} at {current.get('companyName', '')}",
+            f"- {previous.get('title', '')} at {previous.get('companyName', '')}",
+            "Education: B.Tech in Computer Science",
+        ]
+        resumes.append('\n'.join(lines))
+    return resumes
+
+
+class HashingEncoder:
+    """Deterministic stand-in for a SentenceTransformer: hashed bag of words, L2-normalized.
+
+    Needs no model download, so benchmarks run offline and embeddings are identical across runs.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def encode(self, texts, batch_size: int = 32, show_progress_bar: bool = False, **kwargs):
+        import zlib
+        import numpy as np
+
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                out[i, zlib.crc32(word.encode()) % self.dim] += 1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
@@ -33,6 +33,125 @@ DEFAULT_LOCATION = os.getenv("DEFAULT_LOCATION", "Bangalore")
 DEFAULT_TOP_RESULTS = int(os.getenv("DEFAULT_TOP_RESULTS", "10"))
 DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "all-MiniLM-L6-v2")
 
+# Batch recommendations (/recommend-jobs/batch)
+BATCH_MAX_RESUMES = int(os.getenv("BATCH_MAX_RESUMES", "500"))
+# Resumes encoded and scored together per forward pass / similarity matmul
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "64"))
+
+# Resume uploads are parsed in memory; larger ones are rejected (413)
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+# Non-seekable upload streams are buffered in memory up to this size, then in a temporary file
+RESUME_SPOOL_BYTES = int(os.getenv("RESUME_SPOOL_BYTES", str(1024 * 1024)))
+# PDF text extraction backend: auto (PyMuPDF when installed) | pymupdf | pypdf2
+PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")
+# Pages read per PDF (0 = all) and the time allowed per page (seconds)
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_PAGE_TIMEOUT = float(os.getenv("PDF_PAGE_TIMEOUT", "2"))
+# PDFs with at least this many pages are extracted in a process pool (0 = always in-process)
+PDF_POOL_MIN_PAGES = int(os.getenv("PDF_POOL_MIN_PAGES", "20"))
+PDF_POOL_WORKERS = int(os.getenv("PDF_POOL_WORKERS", "2"))
+
+# Resume cache: analysis / TF-IDF vector / embedding per extracted-text hash
+RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", "512"))
+RESUME_CACHE_TTL = int(os.getenv("RESUME_CACHE_TTL", "3600"))
+# Optional SQLite file to persist the cache across restarts (empty = memory only)
+RESUME_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", "")
+
+# Candidate pool per retriever: at least top_k * RECOMMEND_POOL_FACTOR, doubled for query classes
+# whose observed yield needs more and widened (up to RECOMMEND_POOL_ROUNDS rounds) when filters leave too few jobs
+RECOMMEND_POOL_FACTOR = float(os.getenv("RECOMMEND_POOL_FACTOR", "3"))
+RECOMMEND_POOL_MAX = int(os.getenv("RECOMMEND_POOL_MAX", "1000"))
+RECOMMEND_POOL_ROUNDS = int(os.getenv("RECOMMEND_POOL_ROUNDS", "3"))
+
+# ==========================
+# Model Store
+# ==========================
+# Job embeddings are kept memory-mapped on disk; float16 halves the footprint
+EMBEDDING_STORE_DTYPE = os.getenv("EMBEDDING_STORE_DTYPE", "float32")
+
+# Embedding retrieval backend: exact | faiss_hnsw | faiss_ivf
+VECTOR_INDEX_BACKEND = os.getenv("VECTOR_INDEX_BACKEND", "exact")
+# Below this many jobs an approximate index is not worth it; exact search is used
+VECTOR_INDEX_MIN_JOBS = int(os.getenv("VECTOR_INDEX_MIN_JOBS", "20000"))
+FAISS_HNSW_M = int(os.getenv("FAISS_HNSW_M", "32"))
+FAISS_EF_SEARCH = int(os.getenv("FAISS_EF_SEARCH", "64"))
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "8"))
+
+# Sentence encoder runtime: sentence-transformers (PyTorch) | onnx (exported int8 model, see
+# job_recommender/onnx_encoder.py); stores built by another backend are re-encoded
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "sentence-transformers")
+# Export directory (empty = onnx_models/<model name>), int8 or fp32 weights, ONNX Runtime threads (0 = auto)
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "")
+ONNX_QUANTIZED = os.getenv("ONNX_QUANTIZED", "true").lower() == "true"
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", "0"))
+
+# Concurrent single-resume encodes are batched: up to ENCODE_BATCH_MAX_SIZE texts per forward
+# pass, waiting at most ENCODE_BATCH_MAX_WAIT_MS for more after the first
+ENCODE_BATCH_ENABLED = os.getenv("ENCODE_BATCH_ENABLED", "true").lower() == "true"
+ENCODE_BATCH_MAX_SIZE = int(os.getenv("ENCODE_BATCH_MAX_SIZE", "32"))
+ENCODE_BATCH_MAX_WAIT_MS = float(os.getenv("ENCODE_BATCH_MAX_WAIT_MS", "5"))
+
+# Keyword retrieval engine: tfidf | bm25 (inverted index) or sweep (dense cosine over all jobs)
+SPARSE_RETRIEVAL_ENGINE = os.getenv("SPARSE_RETRIEVAL_ENGINE", "tfidf")
+BM25_K1 = float(os.getenv("BM25_K1", "1.5"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+# ==========================
+# Incremental Ingestion (POST /ingest-jobs)
+# ==========================
+# Required as a Bearer token; ingestion is disabled while unset
+INGEST_TOKEN = os.getenv("INGEST_TOKEN", "")
+# Refit TF-IDF once rows appended since the last fit exceed this fraction of the fitted corpus
+INGEST_REFIT_RATIO = float(os.getenv("INGEST_REFIT_RATIO", "0.2"))
+# Compact the store once tombstoned rows exceed this fraction of it
+INGEST_COMPACT_RATIO = float(os.getenv("INGEST_COMPACT_RATIO", "0.2"))
+# How often other workers check the store for a newer revision (seconds, 0 = never)
+INGEST_POLL_SECONDS = int(os.getenv("INGEST_POLL_SECONDS", "15"))
+INGEST_MAX_JOBS = int(os.getenv("INGEST_MAX_JOBS", "5000"))
+
+# ==========================
+# Skill Gap Analysis and Learning Resources
+# ==========================
+# Socket timeout of each YouTube search, and how long a request waits for all of them (seconds);
+# skills still pending at the deadline get no videos in that response
+YOUTUBE_TIMEOUT = float(os.getenv("YOUTUBE_TIMEOUT", "3"))
+YOUTUBE_DEADLINE = float(os.getenv("YOUTUBE_DEADLINE", "5"))
+YOUTUBE_MAX_WORKERS = int(os.getenv("YOUTUBE_MAX_WORKERS", "8"))
+# SQLite cache of video lookups per skill ("" disables it); entries are fresh for YOUTUBE_CACHE_TTL
+# seconds, then served for up to YOUTUBE_CACHE_STALE_TTL more while refreshed in the background
+YOUTUBE_CACHE_PATH = os.getenv("YOUTUBE_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                  "youtube_cache.sqlite"))
+YOUTUBE_CACHE_TTL = int(os.getenv("YOUTUBE_CACHE_TTL", str(7 * 86400)))
+YOUTUBE_CACHE_STALE_TTL = int(os.getenv("YOUTUBE_CACHE_STALE_TTL", str(30 * 86400)))
+# Fetch videos for learning.SKILL_CATEGORIES not yet cached when /warm is called
+YOUTUBE_CACHE_WARM = os.getenv("YOUTUBE_CACHE_WARM", "false").lower() == "true"
+# Gemini skill gap analyses memoized per (resume, job description, prompt version); the disk tier
+# shares the resume cache's SQLite file unless SKILL_GAP_CACHE_PATH says otherwise ("" = memory only)
+SKILL_GAP_CACHE_SIZE = int(os.getenv("SKILL_GAP_CACHE_SIZE", "256"))
+SKILL_GAP_CACHE_TTL = int(os.getenv("SKILL_GAP_CACHE_TTL", "86400"))
+SKILL_GAP_CACHE_PATH = os.getenv("SKILL_GAP_CACHE_PATH", RESUME_CACHE_PATH)
+
+# ==========================
+# Worker Pool
+# ==========================
+# Run resume text extraction and recommendation scoring in worker processes, each with its own
+# model copy; job embeddings are memory-mapped from the model store and shared between them
+WORKER_POOL_ENABLED = os.getenv("WORKER_POOL_ENABLED", "false").lower() == "true"
+WORKER_POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", "2"))
+# Tasks queued or running at most; further requests get 503 with Retry-After (seconds)
+WORKER_POOL_MAX_PENDING = int(os.getenv("WORKER_POOL_MAX_PENDING", "8"))
+WORKER_POOL_RETRY_AFTER = int(os.getenv("WORKER_POOL_RETRY_AFTER", "2"))
+# How long a request waits for its task before giving up with 503 (seconds)
+WORKER_POOL_TIMEOUT = float(os.getenv("WORKER_POOL_TIMEOUT", "60"))
+
+# ==========================
+# Metrics
+# ==========================
+# Per-stage latency histograms, exported at /metrics in the Prometheus text format
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Add a Server-Timing header listing each request's stage durations
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
 # ==========================
 # API Key Checker
 # ==========================
@@ -1,7 +1,8 @@
 """Job recommendations: TF-IDF + sentence embeddings, resume → top jobs."""
 import logging
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from . import data_loader
 from . import preprocessing
@@ -9,6 +10,16 @@ from . import resume_analyzer
 from . import similarity
 from . import formatters
 from . import models
+from . import features
+from .job_store import JobStore
+from .stats import JobStats
+from .job_index import JobIndex
+from .locations import LocationIndex
+from .pool import PoolSizer
+from . import sparse_retrieval
+from . import store
+from . import ingest
+from utils import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -16,35 +27,250 @@ logger = logging.getLogger(__name__)
 class JobRecommender:
     """Stateless job recommender: analyzes resume and matches with job descriptions."""
 
-    def __init__(self, data_path: str = None, model_name: str = "paraphrase-MiniLM-L3-v2"):
+    def __init__(self, data_path: str = None, model_name: str = "paraphrase-MiniLM-L3-v2", resume_cache=None,
+                 pool_sizer: Optional[PoolSizer] = None, sentence_model=None):
+        """``sentence_model`` replaces loading ``model_name`` (any object with the SentenceTransformer
+        ``encode`` signature, e.g. a deterministic stub for offline benchmarks)."""
         if data_path is None:
             data_path = data_loader.get_default_data_path()
         self.data_path = data_path
         self.model_name = model_name
+        self.resume_cache = resume_cache
+        self.pool_sizer = pool_sizer or PoolSizer()
+        self.store_version = None
         self._models_initialized = False
         self.tfidf_vectorizer = None
         self.tfidf_matrix = None
-        self.sentence_model = None
+        self.sentence_model = sentence_model
         self.job_embeddings = None
+        self.vector_index = None
+        self.sparse_retriever = None
+        self.store_manifest = None
+        self.store_rows = None
+        self._job_index = None
 
-        raw_jobs = data_loader.load_jobs_data(data_path)
-        self.jobs_data = preprocessing.preprocess_jobs(raw_jobs)
-        logger.info(f"Loaded and preprocessed {len(self.jobs_data)} jobs")
+        start = time.perf_counter()
+        # Generator stages end to end: parse -> normalize -> dedup -> ingested changes -> preprocess,
+        # each record landing straight in the columnar JobStore.
+        raw_jobs = data_loader.iter_jobs_data(data_path)
+        ingested = ingest.read_log(ingest.get_ingest_log_path(data_path))
+        if ingested:
+            raw_jobs = ingest.iter_apply_log(raw_jobs, ingested)
+            logger.info(f"Replaying {len(ingested)} ingested change(s)")
+        self.jobs_data = JobStore.from_jobs(preprocessing.iter_preprocessed(raw_jobs))
+        self.job_features = features.build_job_features(self.jobs_data)
+        self.location_index = LocationIndex.build(self.job_features)
+        self.job_stats = JobStats.build(self.jobs_data)
+        logger.info(f"Loaded and preprocessed {len(self.jobs_data)} jobs "
+                    f"in {time.perf_counter() - start:.2f}s")
 
     def _ensure_models_initialized(self) -> None:
         if self._models_initialized:
             return
         logger.info("Initializing models (lazy loading)...")
-        t, m, s, e = models.initialize_models(
-            self.jobs_data, self.data_path, self.model_name
-        )
-        self.tfidf_vectorizer, self.tfidf_matrix, self.sentence_model, self.job_embeddings = t, m, s, e
+        m = models.initialize_models(self.jobs_data, self.data_path, self.model_name,
+                                     sentence_model=self.sentence_model)
+        self._set_models(m)
+
+    def _set_models(self, m: Dict) -> None:
+        self.tfidf_vectorizer = m['tfidf_vectorizer']
+        self.tfidf_matrix = m['tfidf_matrix']
+        self.sentence_model = m['sentence_model']
+        self.job_embeddings = m['job_embeddings']
+        self.vector_index = m['vector_index']
+        self.sparse_retriever = m['sparse_retriever']
+        self.store_manifest = m.get('manifest')
+        self.store_rows = m.get('store_rows')
+        self.store_version = m.get('store_version')
         self._models_initialized = True
 
+    def with_corpus(self, jobs_data, m: Dict, job_stats: Optional[JobStats] = None) -> 'JobRecommender':
+        """A new recommender over jobs_data with the given models; self is left untouched.
+
+        job_stats, when given, must already describe jobs_data; otherwise they are recounted.
+        """
+        other = object.__new__(type(self))
+        other.__dict__.update(self.__dict__)
+        other.jobs_data = jobs_data if isinstance(jobs_data, JobStore) else JobStore.from_jobs(jobs_data)
+        other.job_features = features.build_job_features(other.jobs_data)
+        other.location_index = LocationIndex.build(other.job_features)
+        other.job_stats = job_stats if job_stats is not None else JobStats.build(other.jobs_data)
+        other._job_index = None
+        other._set_models(m)
+        return other
+
+    @property
+    def job_index(self) -> JobIndex:
+        """Filter indexes and sort orders for listing jobs, built on first use."""
+        if self._job_index is None:
+            self._job_index = JobIndex.build(self.jobs_data, self.job_features, self.location_index)
+        return self._job_index
+
+    def ingest(self, records: List[Dict], delete_ids: List[str] = ()):
+        """Add/replace/remove jobs incrementally. Returns (new recommender, summary); see ingest.py."""
+        return ingest.ingest_jobs(self, records, delete_ids)
+
+    def is_stale(self) -> bool:
+        """True when another process published a newer model store (e.g. after ingesting jobs)."""
+        if not self._models_initialized or self.store_manifest is None:
+            return False
+        current = store.read_manifest(store.get_store_dir(self.data_path))
+        if not current:
+            return False
+        return (current.get('version'), current.get('revision', 0)) != (
+            self.store_manifest.get('version'), self.store_manifest.get('revision', 0))
+
     def analyze_resume(self, resume_text: str) -> Dict:
         """Analyze resume and extract key information."""
         return resume_analyzer.analyze_resume(resume_text)
 
+    # Resume-derived data (analysis, TF-IDF vector, embedding) is cached by text hash when a cache is set.
+
+    def _tfidf_field(self) -> Optional[str]:
+        return f"tfidf:{self.store_version}" if self.store_version else None
+
+    def _embedding_field(self) -> str:
+        backend = models.encoder_backend(self.sentence_model)
+        if backend == store.DEFAULT_ENCODER_BACKEND:
+            return f"embedding:{self.model_name}"
+        return f"embedding:{self.model_name}@{backend}"
+
+    def _transform_tfidf(self, texts: List[str]):
+        if self.sparse_retriever is not None:
+            return self.sparse_retriever.query_vectors(texts)
+        return self.tfidf_vectorizer.transform(texts)
+
+    def _cached(self, text_hash: Optional[str], field: Optional[str], compute):
+        if self.resume_cache is None or text_hash is None or field is None:
+            return compute()
+        return self.resume_cache.get_or_compute(text_hash, field, compute)
+
+    def _resume_features(self, resume_text: str):
+        """(analysis, TF-IDF query vector, embedding) for one resume, served from the cache when possible."""
+        text_hash = self.resume_cache.key_for(resume_text) if self.resume_cache is not None else None
+        with metrics.stage('analyze_resume'):
+            analysis = self._cached(text_hash, 'analysis', lambda: self.analyze_resume(resume_text))
+        tfidf_vector = None
+        if self.tfidf_vectorizer is not None:
+            with metrics.stage('tfidf_transform'):
+                tfidf_vector = self._cached(text_hash, self._tfidf_field(),
+                                            lambda: self._transform_tfidf([resume_text]))
+        embedding = None
+        if self.sentence_model is not None:
+            with metrics.stage('encode'):
+                embedding = self._cached(text_hash, self._embedding_field(),
+                                         lambda: self.sentence_model.encode([resume_text]))
+        return analysis, tfidf_vector, embedding
+
+    def _resume_features_batch(self, resume_texts: List[str]):
+        """Batched _resume_features: only cache misses are transformed / encoded, each in one call."""
+        import numpy as np
+        from scipy.sparse import vstack
+
+        if self.resume_cache is None:
+            analyses = [self.analyze_resume(t) for t in resume_texts]
+            tfidf_vectors = self._transform_tfidf(resume_texts) if self.tfidf_vectorizer is not None else None
+            embeddings = None
+            if self.sentence_model is not None:
+                embeddings = self.sentence_model.encode(resume_texts, batch_size=32, show_progress_bar=False)
+            return analyses, tfidf_vectors, embeddings
+
+        cache = self.resume_cache
+        hashes = [cache.key_for(t) for t in resume_texts]
+        analyses = [cache.get_or_compute(h, 'analysis', lambda t=t: self.analyze_resume(t))
+                    for h, t in zip(hashes, resume_texts)]
+
+        def fill(field, compute_many):
+            rows = [cache.get(h, field) if field else None for h in hashes]
+            missing = [i for i, row in enumerate(rows) if row is None]
+            if missing:
+                computed = compute_many([resume_texts[i] for i in missing])
+                for j, i in enumerate(missing):
+                    rows[i] = computed[j:j + 1]
+                    if field:
+                        cache.set(hashes[i], field, rows[i])
+            return rows
+
+        tfidf_vectors = None
+        if self.tfidf_vectorizer is not None:
+            tfidf_vectors = vstack(fill(self._tfidf_field(), self._transform_tfidf)).tocsr()
+        embeddings = None
+        if self.sentence_model is not None:
+            encode = lambda texts: np.asarray(
+                self.sentence_model.encode(texts, batch_size=32, show_progress_bar=False))
+            embeddings = np.vstack(fill(self._embedding_field(), encode))
+        return analyses, tfidf_vectors, embeddings
+
+    def _retrieve(self, resume_text: str, tfidf_vector, embedding, pool: int, rows) -> Tuple[List, List]:
+        """(TF-IDF candidates, embedding candidates), ``pool`` of each, restricted to ``rows`` when given."""
+        with metrics.stage('retrieve_sparse'):
+            if self.sparse_retriever is not None:
+                tfidf_sims = sparse_retrieval.calculate_sparse_similarity(
+                    self.sparse_retriever, resume_text, pool, resume_vector=tfidf_vector, rows=rows,
+                )
+            else:
+                tfidf_sims = similarity.calculate_tfidf_similarity(
+                    self.tfidf_vectorizer, self.tfidf_matrix, resume_text, pool,
+                    resume_vector=tfidf_vector, rows=rows,
+                )
+        with metrics.stage('retrieve_embedding'):
+            emb_sims = similarity.calculate_embedding_similarity(
+                self.sentence_model, self.job_embeddings, resume_text, pool,
+                vector_index=self.vector_index, resume_embedding=embedding, rows=rows,
+            )
+        return tfidf_sims, emb_sims
+
+    def _pool_limit(self, rows) -> int:
+        return len(self.jobs_data) if rows is None else len(rows)
+
+    @staticmethod
+    def _pool_key(resume_analysis: Dict, rows) -> Tuple:
+        return resume_analysis.get('experience_level') or '', rows is not None
+
+    def _recommend_adaptive(self, resume_text: str, resume_analysis: Dict, tfidf_vector, embedding, rows,
+                            top_k: int, pool: int, first_round: Optional[Tuple] = None) -> Dict:
+        """Retrieve, fuse and format, widening the pool while filters and dedup leave fewer than top_k jobs.
+
+        ``first_round`` is an already retrieved (tfidf_sims, emb_sims) for ``pool`` (batch retrieval).
+        """
+        start = time.perf_counter()
+        limit = self._pool_limit(rows)
+        retrieval_s = ranking_s = 0.0
+        rounds = 0
+        while True:
+            rounds += 1
+            t0 = time.perf_counter()
+            if first_round is not None:
+                tfidf_sims, emb_sims = first_round
+                first_round = None
+            else:
+                tfidf_sims, emb_sims = self._retrieve(resume_text, tfidf_vector, embedding, pool, rows)
+            t1 = time.perf_counter()
+            result, used_fraction = self._rank_jobs(resume_analysis, tfidf_sims, emb_sims, top_k)
+            t2 = time.perf_counter()
+            retrieval_s += t1 - t0
+            ranking_s += t2 - t1
+
+            found = len(result['top_jobs'])
+            # More candidates exist only if a retriever filled its pool; stop otherwise.
+            saturated = len(tfidf_sims) >= pool or len(emb_sims) >= pool
+            if found >= top_k or not saturated or pool >= limit or rounds >= self.pool_sizer.rounds:
+                break
+            pool = self.pool_sizer.widen(pool, top_k, found, limit)
+
+        # An unsaturated round saw every eligible job: the pool was large enough, whatever was found.
+        self.pool_sizer.observe(self._pool_key(resume_analysis, rows), top_k, pool,
+                                found if saturated else max(found, top_k), used_fraction)
+        metrics.observe('app_recommend_pool_size', pool, help_text='Final candidate pool per recommendation')
+        result['timing'] = {
+            'pool_size': pool,
+            'pool_rounds': rounds,
+            'retrieval_ms': round(retrieval_s * 1000, 2),
+            'ranking_ms': round(ranking_s * 1000, 2),
+            'total_ms': round((time.perf_counter() - start) * 1000, 2),
+        }
+        return result
+
     def recommend_jobs(
         self,
         resume_text: str,
@@ -62,45 +288,120 @@ class JobRecommender:
                 }
 
             self._ensure_models_initialized()
-            resume_analysis = self.analyze_resume(resume_text)
+            resume_analysis, tfidf_vector, embedding = self._resume_features(resume_text)
+            # Jobs the location filter admits (None = all); both retrievers only score these.
+            rows = self.location_index.rows(location_filter)
+            pool = self.pool_sizer.initial(self._pool_key(resume_analysis, rows), top_k, self._pool_limit(rows))
+            return self._recommend_adaptive(resume_text, resume_analysis, tfidf_vector, embedding, rows, top_k, pool)
 
-            tfidf_sims = similarity.calculate_tfidf_similarity(
-                self.tfidf_vectorizer, self.tfidf_matrix, resume_text, top_k * 3
-            )
-            emb_sims = similarity.calculate_embedding_similarity(
-                self.sentence_model, self.job_embeddings, resume_text, top_k * 3
-            )
+        except Exception as e:
+            logger.error(f"Error in job recommendation: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'top_jobs': [],
+                'resume_analysis': {},
+            }
 
+    def recommend_jobs_batch(
+        self,
+        resume_texts: List[str],
+        top_k: int = 10,
+        location_filter: str = None,
+    ) -> Dict:
+        """Recommend jobs for many resumes: one batched encode and one M x N similarity per retriever.
+
+        Resumes left with fewer than top_k jobs get further (single-resume) rounds with a wider pool.
+        """
+        try:
+            if not self.jobs_data:
+                return {'success': False, 'error': 'No jobs data available', 'results': []}
+
+            self._ensure_models_initialized()
+            with metrics.stage('batch_features'):
+                analyses, tfidf_vectors, embeddings = self._resume_features_batch(resume_texts)
+            rows = self.location_index.rows(location_filter)
+            limit = self._pool_limit(rows)
+            pool = max(self.pool_sizer.initial(self._pool_key(a, rows), top_k, limit) for a in analyses) \
+                if analyses else top_k
+
+            with metrics.stage('batch_retrieve_sparse'):
+                if self.sparse_retriever is not None:
+                    tfidf_batch = sparse_retrieval.calculate_sparse_similarity_batch(
+                        self.sparse_retriever, resume_texts, pool, resume_vectors=tfidf_vectors, rows=rows,
+                    )
+                else:
+                    tfidf_batch = similarity.calculate_tfidf_similarity_batch(
+                        self.tfidf_vectorizer, self.tfidf_matrix, resume_texts, pool,
+                        resume_vectors=tfidf_vectors, rows=rows,
+                    )
+            with metrics.stage('batch_retrieve_embedding'):
+                emb_batch = similarity.calculate_embedding_similarity_batch(
+                    self.sentence_model, self.job_embeddings, resume_texts, pool,
+                    vector_index=self.vector_index, resume_embeddings=embeddings, rows=rows,
+                )
+
+            results = []
+            for i, (resume_analysis, tfidf_sims, emb_sims) in enumerate(zip(analyses, tfidf_batch, emb_batch)):
+                try:
+                    results.append(self._recommend_adaptive(
+                        resume_texts[i], resume_analysis,
+                        tfidf_vectors[i:i + 1] if tfidf_vectors is not None else None,
+                        embeddings[i:i + 1] if embeddings is not None else None,
+                        rows, top_k, pool, first_round=(tfidf_sims, emb_sims),
+                    ))
+                except Exception as e:
+                    logger.error(f"Error in batch job recommendation: {e}")
+                    results.append({'success': False, 'error': str(e), 'top_jobs': [], 'resume_analysis': {}})
+
+            return {
+                'success': True,
+                'results': results,
+                'total_jobs_analyzed': len(self.jobs_data),
+                'timestamp': datetime.now().isoformat(),
+            }
+
+        except Exception as e:
+            logger.error(f"Error in batch job recommendation: {e}")
+            return {'success': False, 'error': str(e), 'results': []}
+
+    def _rank_jobs(
+        self,
+        resume_analysis: Dict,
+        tfidf_sims: List,
+        emb_sims: List,
+        top_k: int,
+    ) -> Tuple[Dict, float]:
+        """Fuse retriever candidates for one resume and format the top matches.
+
+        Candidates already satisfy the location filter (retrieval was restricted to its rows).
+        Returns (result, fraction of the fused candidates consumed to fill top_k).
+        """
+        with metrics.stage('fusion'):
             combined = similarity.combine_similarity_scores(
                 self.jobs_data,
                 tfidf_sims,
                 emb_sims,
                 resume_analysis.get('skills', []),
-                location_filter=location_filter,
                 resume_experience_level=resume_analysis.get('experience_level'),
                 resume_job_titles=resume_analysis.get('job_titles', []),
+                features=self.job_features,
             )
 
-            top_jobs = formatters.format_recommendations(
+        # Walk past duplicates so up to top_k distinct jobs come back.
+        with metrics.stage('format'):
+            top_jobs, consumed = formatters.format_recommendations_counted(
                 self.jobs_data,
-                combined[:top_k],
+                combined,
                 resume_analysis,
+                limit=top_k,
             )
 
-            return {
-                'success': True,
-                'top_jobs': top_jobs,
-                'resume_analysis': resume_analysis,
-                'total_jobs_analyzed': len(self.jobs_data),
-                'query': formatters.generate_search_query(resume_analysis),
-                'timestamp': datetime.now().isoformat(),
-            }
-
-        except Exception as e:
-            logger.error(f"Error in job recommendation: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'top_jobs': [],
-                'resume_analysis': {},
-            }
+        return {
+            'success': True,
+            'top_jobs': top_jobs,
+            'resume_analysis': resume_analysis,
+            'total_jobs_analyzed': len(self.jobs_data),
+            'query': formatters.generate_search_query(resume_analysis),
+            'timestamp': datetime.now().isoformat(),
+        }, consumed / max(len(combined), 1)
@@ -1,9 +1,10 @@
 """Load and normalize job data from JSON files."""
+import itertools
 import json
 import os
 import re
 import logging
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List
 
 logger = logging.getLogger(__name__)
 
@@ -20,44 +21,102 @@ def get_default_data_path() -> str:
 
 def load_jobs_data(data_path: str = None) -> List[Dict]:
     """Load jobs from linkedin.json and naukridatas.json, then deduplicate."""
-    if data_path is None:
-        data_path = get_default_data_path()
-    all_jobs = []
+    return list(iter_jobs_data(data_path))
 
-    # Load primary data
-    try:
-        if os.path.exists(data_path):
-            with open(data_path, 'r', encoding='utf-8') as f:
-                primary_jobs = json.load(f)
-            all_jobs.extend(primary_jobs)
-            logger.info(f"Loaded {len(primary_jobs)} jobs from {data_path}")
-        else:
-            logger.error(f"Primary jobs file not found: {data_path}")
-    except Exception as e:
-        logger.error(f"Error loading primary jobs: {e}")
 
-    # Load Naukri data
+def iter_jobs_data(data_path: str = None) -> Iterator[Dict]:
+    """Stream deduplicated jobs from the primary data file and naukridatas.json.
+
+    Records are parsed one at a time (JSON arrays or JSON Lines), so the raw files are never
+    held in memory as a whole.
+    """
+    if data_path is None:
+        data_path = get_default_data_path()
     data_dir = os.path.dirname(os.path.abspath(data_path))
     naukri_path = os.path.join(data_dir, "naukridatas.json")
-    
-    try:
-        if os.path.exists(naukri_path):
-            with open(naukri_path, 'r', encoding='utf-8') as f:
-                naukri_jobs = json.load(f)
-            normalized = normalize_naukri_jobs(naukri_jobs)
-            all_jobs.extend(normalized)
-            logger.info(f"Loaded {len(normalized)} Naukri jobs")
+    return iter_unique(itertools.chain(
+        _iter_source(data_path, "primary jobs", error_if_missing=True),
+        iter_normalized_naukri(_iter_source(naukri_path, "Naukri jobs")),
+    ))
+
+
+def _iter_source(path: str, label: str, error_if_missing: bool = False) -> Iterator[Dict]:
+    if not os.path.exists(path):
+        if error_if_missing:
+            logger.error(f"Primary jobs file not found: {path}")
         else:
-            logger.warning(f"Naukri file not found: {naukri_path}")
+            logger.warning(f"Naukri file not found: {path}")
+        return
+    count = 0
+    try:
+        for record in iter_json_records(path):
+            count += 1
+            yield record
     except Exception as e:
-        logger.error(f"Error loading Naukri data: {e}")
+        logger.error(f"Error loading {label} from {path} after {count} records: {e}")
+    logger.info(f"Loaded {count} {label} from {path}")
 
-    return remove_duplicates(all_jobs)
+
+def _truncated(error: json.JSONDecodeError, buf: str) -> bool:
+    """Whether the decode failed because ``buf`` ends mid-record rather than on malformed JSON."""
+    if error.msg.startswith('Unterminated string'):
+        return True  # reported at the opening quote; the closing one is past the end
+    # Literals and escapes cut short fail a few characters before the end.
+    return error.pos >= len(buf) - 6
+
+
+def iter_json_records(path: str, chunk_size: int = 1 << 20) -> Iterator[Dict]:
+    """Yield the objects of a top-level JSON array, or of a JSON Lines file, without loading it whole."""
+    with open(path, 'r', encoding='utf-8') as f:
+        head = f.read(chunk_size)
+        start = len(head) - len(head.lstrip())
+        if head[start:start + 1] != '[':
+            f.seek(0)
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+            return
+
+        decoder = json.JSONDecoder()
+        buf, pos, eof = head, start + 1, False
+        while True:
+            # Skip whitespace and separators between array elements.
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buf) and buf[pos] == ']':
+                return
+            if pos >= len(buf):
+                if eof:
+                    raise ValueError(f"Unterminated JSON array in {path}")
+                buf, pos = f.read(chunk_size), 0
+                eof = not buf
+                continue
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                # Only a record cut off by the end of the buffer is worth reading more for.
+                if eof or not _truncated(e, buf):
+                    raise
+                more = f.read(chunk_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+            yield record
+            pos = end
 
 
 def normalize_naukri_jobs(naukri_jobs: List[Dict]) -> List[Dict]:
     """Normalize Naukri job data to match primary schema."""
-    normalized = []
+    return list(iter_normalized_naukri(naukri_jobs))
+
+
+def iter_normalized_naukri(naukri_jobs: Iterable[Dict]) -> Iterator[Dict]:
+    """Map raw Naukri records to the primary schema, one at a time.
+
+    Only the canonical field names are emitted (``companyName``, ``experienceLevel``,
+    ``applyUrl``/``jobUrl``); every reader falls back between the aliases.
+    """
     for job in naukri_jobs:
         try:
             if not job.get('jobId') or not job.get('title'):
@@ -69,31 +128,25 @@ def normalize_naukri_jobs(naukri_jobs: List[Dict]) -> List[Dict]:
             standard_level = _parse_experience_level(exp_text)
             apply_url = job.get('jdURL') or job.get('companyJobsUrl') or ""
             
-            normalized.append({
+            yield {
                 'id': str(job.get('jobId')),
                 'title': job.get('title', ''),
                 'companyName': job.get('companyName', ''),
-                'company': job.get('companyName', ''),
                 'location': job.get('location', ''),
                 'description': job.get('jobDescription', ''),
-                'descriptionHtml': job.get('jobDescription', '').replace('\n', '<br>'),
                 'skills': skills,
                 'experienceLevel': standard_level,
-                'experience_level': standard_level,
                 'contractType': 'Full-time',
                 'workType': 'Full-time',
                 'sector': '',
                 'applyUrl': apply_url,
-                'apply_url': apply_url,
                 'jobUrl': apply_url,
-                'job_url': apply_url,
                 'postedTime': job.get('footerPlaceholderLabel') or job.get('createdDate', ''),
                 'salary': job.get('salary', 'Not disclosed'),
                 'source': 'Naukri'
-            })
+            }
         except Exception as e:
             logger.warning(f"Error normalizing job {job.get('jobId')}: {e}")
-    return normalized
 
 
 def _parse_experience_level(exp_text: str) -> str:
@@ -114,10 +167,14 @@ def _parse_experience_level(exp_text: str) -> str:
 
 def remove_duplicates(jobs_data: List[Dict]) -> List[Dict]:
     """Remove duplicate jobs by ID and title+company."""
+    return list(iter_unique(jobs_data))
+
+
+def iter_unique(jobs_data: Iterable[Dict]) -> Iterator[Dict]:
+    """Drop jobs whose ID, or title+company, was already seen."""
     seen_ids = set()
     seen_combinations = set()
-    unique = []
-    
+
     for job in jobs_data:
         job_id = job.get('id', '')
         title = job.get('title', '').strip().lower()
@@ -133,6 +190,4 @@ def remove_duplicates(jobs_data: List[Dict]) -> List[Dict]:
             seen_ids.add(job_id)
         if title and company:
             seen_combinations.add(combo)
-        unique.append(job)
-    
-    return unique
+        yield job
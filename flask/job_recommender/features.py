@@ -0,0 +1,112 @@
+"""Columnar per-job features used by score fusion (built once when jobs are loaded)."""
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SOURCE_NAUKRI = 'Naukri'
+
+
+class JobFeatures:
+    """Arrays indexed by job position, mirroring what combine_similarity_scores reads per job.
+
+    level_codes     int16 code into ``level_names`` (the job's experience level)
+    is_naukri       bool, ``source == 'Naukri'`` (everything else interleaves as LinkedIn)
+    location_ids    int32 code into ``locations`` (lowercased location strings)
+    skill_matrix    CSR jobs x skills incidence matrix over lowercased skill names
+    skill_counts    number of distinct lowercased skills per job
+    titles          object array of lowercased titles
+    """
+
+    def __init__(self, level_codes, level_names, is_naukri, location_ids, locations,
+                 skill_matrix, skill_vocab, skill_counts, titles):
+        self.level_codes = level_codes
+        self.level_names = level_names
+        self.is_naukri = is_naukri
+        self.location_ids = location_ids
+        self.locations = locations
+        self.skill_matrix = skill_matrix
+        self.skill_vocab = skill_vocab
+        self.skill_counts = skill_counts
+        self.titles = titles
+
+    def __len__(self) -> int:
+        return int(self.level_codes.shape[0])
+
+    def level_code(self, name: str) -> int:
+        """Code for a level name, or -1 if no job has that level."""
+        try:
+            return self.level_names.index(name)
+        except ValueError:
+            return -1
+
+    def resume_skill_vector(self, resume_skills: List[str]):
+        """(dense 0/1 vector over the skill vocabulary, number of distinct lowercased resume skills)."""
+        import numpy as np
+
+        r_lower = {s.lower() for s in resume_skills}
+        vec = np.zeros(len(self.skill_vocab), dtype=np.int32)
+        for s in r_lower:
+            col = self.skill_vocab.get(s)
+            if col is not None:
+                vec[col] = 1
+        return vec, len(r_lower)
+
+
+def build_job_features(jobs_data: List[Dict], determine_job_level_fn: Optional[Callable] = None) -> JobFeatures:
+    """Compute the columnar features for every job."""
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from .formatters import get_job_experience_level
+
+    fn = determine_job_level_fn or get_job_experience_level
+    n = len(jobs_data)
+
+    level_names: List[str] = []
+    level_lookup: Dict[str, int] = {}
+    locations: List[str] = []
+    location_lookup: Dict[str, int] = {}
+    skill_vocab: Dict[str, int] = {}
+
+    level_codes = np.empty(n, dtype=np.int16)
+    is_naukri = np.empty(n, dtype=bool)
+    location_ids = np.empty(n, dtype=np.int32)
+    skill_counts = np.empty(n, dtype=np.int32)
+    titles = np.empty(n, dtype=object)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indices: List[int] = []
+
+    for i, job in enumerate(jobs_data):
+        level = fn(job)
+        code = level_lookup.get(level)
+        if code is None:
+            code = level_lookup[level] = len(level_names)
+            level_names.append(level)
+        level_codes[i] = code
+
+        is_naukri[i] = job.get('source') == SOURCE_NAUKRI
+
+        loc = (job.get('location') or '').lower()
+        loc_id = location_lookup.get(loc)
+        if loc_id is None:
+            loc_id = location_lookup[loc] = len(locations)
+            locations.append(loc)
+        location_ids[i] = loc_id
+
+        skills = {s.lower() for s in job.get('skills', []) or []}
+        skill_counts[i] = len(skills)
+        for s in skills:
+            col = skill_vocab.get(s)
+            if col is None:
+                col = skill_vocab[s] = len(skill_vocab)
+            indices.append(col)
+        indptr[i + 1] = len(indices)
+
+        titles[i] = (job.get('title') or '').lower()
+
+    skill_matrix = csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), indptr),
+        shape=(n, len(skill_vocab)),
+    )
+    return JobFeatures(level_codes, level_names, is_naukri, location_ids, locations,
+                       skill_matrix, skill_vocab, skill_counts, titles)
@@ -1,7 +1,7 @@
 """Format recommendations and determine job experience levels."""
 import re
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -71,18 +71,59 @@ def determine_job_experience_level(job: Dict) -> str:
     return 'mid'
 
 
+def get_job_experience_level(job: Dict) -> str:
+    """Experience level computed at load time by preprocess_jobs, or computed now if absent."""
+    return job.get('job_level') or determine_job_experience_level(job)
+
+
+_TITLE_PARENS_RE = re.compile(r'\s*\(.*?\)\s*')
+_TITLE_PIPE_RE = re.compile(r'\s*\|.*$')
+_TITLE_REF_RE = re.compile(r'\s*-\s*ref#?\d+.*$', re.IGNORECASE)
+_TITLE_HASH_RE = re.compile(r'\s*#\d+.*$')
+_TITLE_WORKMODE_RE = re.compile(r'\s*-\s*(remote|hybrid|onsite|work from home|wfh).*$', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_title(title: str) -> Tuple[str, str]:
+    """Dedup keys for a title: (normalized title, core title without work-mode suffix)."""
+    title_normalized = _TITLE_PARENS_RE.sub('', title.strip().lower())
+    title_normalized = _TITLE_PIPE_RE.sub('', title_normalized)
+    title_normalized = _TITLE_REF_RE.sub('', title_normalized)
+    title_normalized = _TITLE_HASH_RE.sub('', title_normalized)
+    title_normalized = _WHITESPACE_RE.sub(' ', title_normalized).strip()
+
+    title_core = _TITLE_WORKMODE_RE.sub('', title_normalized)
+    title_core = _WHITESPACE_RE.sub(' ', title_core).strip()
+    return title_normalized, title_core
+
+
 def format_recommendations(
     jobs_data: List[Dict],
     scored_jobs: List[Tuple[int, float]],
     resume_analysis: Dict,
+    limit: Optional[int] = None,
 ) -> List[Dict]:
-    """Format job recommendations for API response."""
+    """Format job recommendations for API response (the first ``limit`` distinct jobs, if given)."""
+    return format_recommendations_counted(jobs_data, scored_jobs, resume_analysis, limit)[0]
+
+
+def format_recommendations_counted(
+    jobs_data: List[Dict],
+    scored_jobs: List[Tuple[int, float]],
+    resume_analysis: Dict,
+    limit: Optional[int] = None,
+) -> Tuple[List[Dict], int]:
+    """format_recommendations plus how many of ``scored_jobs`` were consumed to produce them."""
     recommendations = []
     seen_job_ids = set()
     seen_job_urls = set()
     seen_title_company = set()
+    consumed = 0
 
     for idx, score in scored_jobs:
+        if limit is not None and len(recommendations) >= limit:
+            break
+        consumed += 1
         if idx >= len(jobs_data):
             continue
 
@@ -91,17 +132,11 @@ def format_recommendations(
         job_url = job.get('job_url', '') or job.get('jobUrl', '')
         apply_url = job.get('apply_url', '') or job.get('applyUrl', '')
 
-        title_raw = job.get('title', '').strip().lower()
         company_raw = job.get('companyName', job.get('company', '')).strip().lower()
-
-        title_normalized = re.sub(r'\s*\(.*?\)\s*', '', title_raw)
-        title_normalized = re.sub(r'\s*\|.*$', '', title_normalized)
-        title_normalized = re.sub(r'\s*-\s*ref#?\d+.*$', '', title_normalized, flags=re.IGNORECASE)
-        title_normalized = re.sub(r'\s*#\d+.*$', '', title_normalized)
-        title_normalized = re.sub(r'\s+', ' ', title_normalized).strip()
-
-        title_core = re.sub(r'\s*-\s*(remote|hybrid|onsite|work from home|wfh).*$', '', title_normalized, flags=re.IGNORECASE)
-        title_core = re.sub(r'\s+', ' ', title_core).strip()
+        if 'title_normalized' in job:
+            title_normalized, title_core = job['title_normalized'], job['title_core']
+        else:
+            title_normalized, title_core = normalize_title(job.get('title', ''))
 
         title_company_key = f"{title_normalized}|{company_raw}"
         title_core_company_key = f"{title_core}|{company_raw}"
@@ -130,7 +165,7 @@ def format_recommendations(
 
         common_skills = list(set(resume_analysis['skills']) & set(job.get('skills', [])))
         missing_skills = list(set(job.get('skills', [])) - set(resume_analysis['skills']))
-        job_experience_level = determine_job_experience_level(job)
+        job_experience_level = get_job_experience_level(job)
         primary_apply_link = apply_url if apply_url else job_url
 
         description = job.get('description', '')
@@ -162,7 +197,7 @@ def format_recommendations(
             'source': job.get('source', 'LinkedIn'),
         })
 
-    return recommendations
+    return recommendations, consumed
 
 
 def generate_search_query(resume_analysis: Dict) -> str:
@@ -0,0 +1,306 @@
+"""Incremental ingestion: add, replace or remove jobs without re-encoding the whole corpus.
+
+Jobs are keyed by ``id``. A changed job is tombstoned and appended again, a removed job
+is tombstoned, unchanged jobs are skipped. Only appended jobs are encoded; their TF-IDF
+rows come from the fitted vectorizer (frozen vocabulary and idf). Once the rows appended
+since the last fit exceed INGEST_REFIT_RATIO of the fitted corpus, or tombstones exceed
+INGEST_COMPACT_RATIO of the store, TF-IDF is refit over the live corpus and a compacted
+store version is written, reusing the existing embeddings.
+
+Every effective change is appended to ``ingested_jobs.jsonl`` next to the jobs data file,
+which is replayed on top of the data files at startup; the store's content hash then
+matches and the ingested rows are opened from the store instead of being rebuilt.
+
+Ingestion never mutates the recommender that is serving requests: it returns a new
+JobRecommender which the caller swaps in (see services.ingest_jobs).
+
+CLI (posts to a running server, or ingests into the local store with --local):
+
+    python -m job_recommender.ingest new_jobs.json [--delete ID ...] [--url URL] [--token TOKEN]
+"""
+import itertools
+import json
+import logging
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import INGEST_REFIT_RATIO, INGEST_COMPACT_RATIO
+from . import data_loader
+from . import preprocessing
+from . import store
+from . import vector_index
+from . import models
+from .job_store import JobStore
+
+logger = logging.getLogger(__name__)
+
+INGEST_LOG_NAME = 'ingested_jobs.jsonl'
+
+
+def get_ingest_log_path(data_path: str) -> str:
+    """The ingestion log sits next to the jobs data file."""
+    return os.path.join(os.path.dirname(os.path.abspath(data_path)), INGEST_LOG_NAME)
+
+
+def normalize_ingested_jobs(records: Iterable[Dict]) -> List[Dict]:
+    """Accept jobs in the primary schema (``id``) or raw Naukri records (``jobId``)."""
+    naukri, primary = [], []
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        if 'id' not in record and record.get('jobId'):
+            naukri.append(record)
+        elif record.get('id') and record.get('title'):
+            primary.append({**record, 'id': str(record['id'])})
+        else:
+            logger.warning("Skipping ingested job without id/title")
+    return primary + data_loader.normalize_naukri_jobs(naukri)
+
+
+def read_log(log_path: str) -> List[Dict]:
+    """Entries of the ingestion log: {"op": "upsert", "job": {...}} or {"op": "delete", "id": ...}."""
+    entries = []
+    if not os.path.exists(log_path):
+        return entries
+    with open(log_path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A torn final line from a crash mid-append; everything before it is intact.
+                logger.warning(f"Ignoring unreadable line {line_no} of {log_path}")
+    return entries
+
+
+def append_log(log_path: str, entries: List[Dict]) -> None:
+    if not entries:
+        return
+    with open(log_path, 'a', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def apply_log(raw_jobs: Iterable[Dict], entries: List[Dict]) -> List[Dict]:
+    """Replay the log over the raw jobs: upserts replace by id and move to the end, deletes drop."""
+    return list(iter_apply_log(raw_jobs, entries))
+
+
+def iter_apply_log(raw_jobs: Iterable[Dict], entries: List[Dict]) -> Iterator[Dict]:
+    """Streaming apply_log: untouched jobs pass through in order, then the surviving upserts.
+
+    Replaying entries in order leaves every id the log mentions either deleted or at the end,
+    ordered by its last upsert, so only the (small) log is held in memory.
+    """
+    final = {}
+    touched = set()
+    for entry in entries:
+        op = entry.get('op')
+        if op == 'upsert' and entry.get('job', {}).get('id'):
+            job = entry['job']
+            final.pop(job['id'], None)
+            final[job['id']] = job
+            touched.add(job['id'])
+        elif op == 'delete':
+            final.pop(str(entry.get('id')), None)
+            touched.add(str(entry.get('id')))
+    for job in raw_jobs:
+        if job.get('id') not in touched:
+            yield job
+    yield from final.values()
+
+
+@contextmanager
+def store_lock(store_dir: str):
+    """Serialize ingestion across worker processes (advisory file lock where available)."""
+    os.makedirs(store_dir, exist_ok=True)
+    with open(os.path.join(store_dir, '.ingest.lock'), 'a') as f:
+        try:
+            import fcntl
+        except ImportError:
+            fcntl = None
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def plan_changes(jobs_data: List[Dict], raw_upserts: List[Dict], delete_ids: Iterable[str]):
+    """Compare a batch with the live corpus.
+
+    Returns (removed row positions, processed jobs to append, log entries, summary counts).
+    """
+    row_of = {job.get('id'): i for i, job in enumerate(jobs_data) if job.get('id')}
+    removed, appended, entries = set(), [], []
+    counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+
+    latest = {}
+    for raw in raw_upserts:
+        latest.pop(raw['id'], None)
+        latest[raw['id']] = raw
+    for raw in latest.values():
+        processed = preprocessing.preprocess_jobs([raw])
+        if not processed:
+            continue
+        job = processed[0]
+        row = row_of.get(job['id'])
+        if row is not None and jobs_data[row] == job:
+            counts['unchanged'] += 1
+            continue
+        if row is not None:
+            removed.add(row)
+            counts['updated'] += 1
+        else:
+            counts['added'] += 1
+        appended.append(job)
+        entries.append({'op': 'upsert', 'job': raw})
+
+    for job_id in dict.fromkeys(str(i) for i in delete_ids):
+        row = row_of.get(job_id)
+        if row is None or row in removed or job_id in latest:
+            continue
+        removed.add(row)
+        counts['deleted'] += 1
+        entries.append({'op': 'delete', 'id': job_id})
+    return sorted(removed), appended, entries, counts
+
+
+def needs_refit(manifest: Optional[Dict], appended: int, removed: int) -> bool:
+    """Refit TF-IDF (and compact the store) once enough of the corpus changed since the last fit."""
+    if manifest is None:
+        return True
+    fitted = max(1, int(manifest.get('fitted_rows', manifest['job_count'])))
+    store_rows = int(manifest.get('store_rows', manifest['job_count'])) + appended
+    appended_since_fit = store_rows - fitted
+    dead = int(manifest.get('tombstone_count', 0)) + removed
+    return appended_since_fit > INGEST_REFIT_RATIO * fitted or dead > INGEST_COMPACT_RATIO * store_rows
+
+
+def ingest_jobs(recommender, records: List[Dict], delete_ids: Iterable[str] = ()) -> Tuple[object, Dict]:
+    """Apply a batch to ``recommender``. Returns (recommender for the new corpus, summary)."""
+    import numpy as np
+    from scipy.sparse import vstack
+
+    recommender._ensure_models_initialized()
+    store_dir = store.get_store_dir(recommender.data_path)
+    removed, appended, entries, counts = plan_changes(
+        recommender.jobs_data, normalize_ingested_jobs(records), delete_ids
+    )
+    summary = {**counts, 'refit': False}
+    if not entries:
+        return recommender, {**summary, 'total_jobs': len(recommender.jobs_data)}
+
+    keep = np.ones(len(recommender.jobs_data), dtype=bool)
+    keep[removed] = False
+    kept_rows = np.flatnonzero(keep)
+    jobs_data = JobStore.from_jobs(itertools.chain((recommender.jobs_data[i] for i in kept_rows), appended))
+    new_texts = [j.get('combined_text', '') for j in appended]
+
+    # The log is the source of truth: a crash after this point leaves a store whose content hash
+    # no longer matches, which the next start detects and rebuilds.
+    append_log(get_ingest_log_path(recommender.data_path), entries)
+
+    new_embeddings = models.encode_job_texts(recommender.sentence_model, new_texts)
+    manifest = recommender.store_manifest
+    kept_embeddings = np.asarray(recommender.job_embeddings[kept_rows], dtype=np.float32)
+
+    if needs_refit(manifest, len(appended), len(removed)):
+        embeddings = np.concatenate([kept_embeddings, new_embeddings]) if len(new_texts) else kept_embeddings
+        tfidf_vectorizer, tfidf_matrix, job_embeddings, manifest = models.build_store(
+            jobs_data, store_dir, recommender.model_name, recommender.sentence_model, embeddings
+        )
+        m = models.assemble_models(store_dir, manifest, jobs_data, tfidf_vectorizer, tfidf_matrix,
+                                   recommender.sentence_model, job_embeddings)
+        summary['refit'] = True
+    else:
+        tfidf_vectorizer = recommender.tfidf_vectorizer
+        new_rows = tfidf_vectorizer.transform(new_texts)
+        tfidf_matrix = vstack([recommender.tfidf_matrix[kept_rows], new_rows]).tocsr()
+        dtype = manifest['embedding_dtype']
+        parts = [kept_embeddings]
+        if len(new_texts):
+            parts.append(store.normalize_rows(new_embeddings))
+        job_embeddings = np.concatenate(parts).astype(dtype, copy=False)
+
+        tombstones = recommender.store_rows[removed].tolist()
+        updated = store.append_segment(store_dir, manifest, jobs_data, new_rows, new_embeddings, tombstones)
+        m = models.assemble_models(
+            store_dir, updated, jobs_data, tfidf_vectorizer, tfidf_matrix,
+            recommender.sentence_model, job_embeddings,
+            vector_idx=vector_index.extend_index(
+                recommender.vector_index, store.normalize_rows(new_embeddings), kept_rows, job_embeddings
+            ),
+        )
+
+    logger.info(
+        f"Ingested batch: {counts['added']} added, {counts['updated']} updated, {counts['deleted']} deleted "
+        f"({'TF-IDF refit' if summary['refit'] else 'frozen vocabulary'}); {len(jobs_data)} live jobs"
+    )
+    summary['total_jobs'] = len(jobs_data)
+    summary['store_version'] = m['store_version']
+    summary['revision'] = (m['manifest'] or {}).get('revision', 0)
+    job_stats = recommender.job_stats.updated((recommender.jobs_data[i] for i in removed), appended)
+    return recommender.with_corpus(jobs_data, m, job_stats=job_stats), summary
+
+
+def load_records(path: str) -> List[Dict]:
+    """Jobs from a JSON array / object with a "jobs" list, or JSON Lines."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        return data.get('jobs', [])
+    return data
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingest a batch of jobs into the recommender")
+    parser.add_argument('path', nargs='?', help="JSON array, {\"jobs\": [...]} or JSON Lines file")
+    parser.add_argument('--delete', nargs='*', default=[], metavar='ID', help="job ids to remove")
+    parser.add_argument('--url', default=f"http://localhost:{os.getenv('PORT', os.getenv('FLASK_PORT', '2000'))}",
+                        help="running server to post to")
+    parser.add_argument('--token', default=os.getenv('INGEST_TOKEN', ''), help="ingestion token")
+    parser.add_argument('--local', action='store_true',
+                        help="ingest into the local model store without a running server")
+    args = parser.parse_args(argv)
+
+    records = load_records(args.path) if args.path else []
+    if args.local:
+        from . import JobRecommender
+        logging.basicConfig(level=logging.INFO)
+        _, summary = ingest_jobs(JobRecommender(), records, args.delete)
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    import urllib.error
+    import urllib.request
+    request = urllib.request.Request(
+        args.url.rstrip('/') + '/ingest-jobs',
+        data=json.dumps({'jobs': records, 'delete_ids': args.delete}).encode('utf-8'),
+        headers={'Content-Type': 'application/json', 'Authorization': f"Bearer {args.token}"},
+        method='POST',
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            print(response.read().decode('utf-8'))
+        return 0
+    except urllib.error.HTTPError as e:
+        print(e.read().decode('utf-8'))
+        return 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,272 @@
+"""Secondary indexes, sort orders and keyset cursors for listing jobs (/all-jobs).
+
+Each filterable dimension maps a lowercased key to the sorted row ids of the jobs carrying it:
+
+    location  place tokens with aliases resolved (served by locations.LocationIndex)
+    skill     lowercased skills (the columns of JobFeatures.skill_matrix)
+    level     computed experience level (fresher, junior, mid, senior, internship)
+    source    job source (naukri, linkedin, ...)
+    company   company name
+
+A query ORs the values given for one dimension into a boolean bitmap and ANDs the
+bitmaps of all dimensions. Sort orders are permutations computed once per corpus, so a
+page is a scan from the cursor's position in the permutation: unfiltered pages cost
+O(page size) however deep they are, filtered pages stop as soon as the page is full.
+"""
+import base64
+import hashlib
+import json
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DIMENSIONS = ('location', 'skill', 'level', 'source', 'company')
+# Sort name -> default direction
+SORTS = {'default': 'asc', 'posted': 'desc', 'company': 'asc'}
+
+_POSTED_RE = re.compile(r'(\d+)\+?\s*(minute|hour|day|week|month|year)s?\s+ago', re.IGNORECASE)
+_UNIT_DAYS = {'minute': 1 / 1440, 'hour': 1 / 24, 'day': 1, 'week': 7, 'month': 30, 'year': 365}
+_RECENT = ('today', 'just now', 'few hours ago', 'moments ago')
+
+DAY = 86400.0
+
+
+class InvalidCursor(ValueError):
+    """Cursor that cannot be decoded or was issued for a different query."""
+
+
+def posted_timestamp(published, posted_time, now: float) -> float:
+    """Approximate posting time (epoch seconds) from publishedAt or a relative postedTime; NaN if unknown."""
+    from datetime import datetime
+
+    if isinstance(published, str) and published:
+        try:
+            return datetime.fromisoformat(published.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+    if not isinstance(posted_time, str) or not posted_time:
+        return float('nan')
+    text = posted_time.strip().lower()
+    if text.startswith(_RECENT):
+        return now
+    match = _POSTED_RE.search(text)
+    if match is None:
+        return float('nan')
+    days = int(match.group(1)) * _UNIT_DAYS[match.group(2).lower()]
+    if '+' in match.group(0):
+        days += 0.5  # "30+ Days Ago" sorts after "30 Days Ago"
+    return now - days * DAY
+
+
+def _postings(keys, n_keys: int) -> List:
+    """Row ids grouped by key code: result[k] = sorted rows whose code is k."""
+    import numpy as np
+
+    order = np.argsort(keys, kind='stable')
+    bounds = np.searchsorted(keys[order], np.arange(n_keys + 1))
+    return [order[bounds[k]:bounds[k + 1]].astype(np.int32) for k in range(n_keys)]
+
+
+def _merge(postings: Dict[str, List], key: str, rows) -> None:
+    postings.setdefault(key, []).append(rows)
+
+
+class JobIndex:
+    """Per-dimension postings and sort permutations over one corpus (rows = JobStore positions)."""
+
+    def __init__(self, jobs_data, location_index, postings: Dict[str, Dict], sort_keys: Dict,
+                 sort_labels: Dict[str, List[str]]):
+        self.jobs_data = jobs_data
+        self.location_index = location_index
+        self.n_jobs = len(jobs_data)
+        self.postings = postings
+        self.sort_keys = sort_keys
+        # For rank-valued sort keys: rank -> value, so cursors carry the value, not a corpus-specific rank
+        self.sort_labels = sort_labels
+        self._orders: Dict[Tuple[str, str], Tuple] = {}
+
+    @classmethod
+    def build(cls, jobs_data, features, location_index, now: Optional[float] = None) -> 'JobIndex':
+        """Index a JobStore using the columns JobFeatures already holds (skills, levels)."""
+        import numpy as np
+
+        now = time.time() if now is None else now
+        n = len(jobs_data)
+        postings: Dict[str, Dict] = {dim: {} for dim in DIMENSIONS if dim != 'location'}
+
+        skills_by_job = features.skill_matrix.tocsc()
+        for skill, col in features.skill_vocab.items():
+            rows = skills_by_job.indices[skills_by_job.indptr[col]:skills_by_job.indptr[col + 1]]
+            postings['skill'][skill] = [np.sort(rows).astype(np.int32)]
+
+        groups = {}
+        for code, rows in enumerate(_postings(features.level_codes, len(features.level_names))):
+            _merge(groups, str(features.level_names[code]).lower(), rows)
+        postings['level'] = groups
+
+        company_rank, company_labels = None, []
+        for dim, field in (('source', 'source'), ('company', 'companyName')):
+            codes, values = jobs_data.category_codes(field, missing='')
+            groups = {}
+            keys = [str(v).strip().lower() if v is not None else '' for v in values]
+            for code, rows in enumerate(_postings(codes, len(values))):
+                if len(rows):
+                    _merge(groups, keys[code], rows)
+            postings[dim] = groups
+            if dim == 'company':
+                # Rank of each value's lowercased name, for the company sort
+                company_labels = sorted(set(keys))
+                position = {label: i for i, label in enumerate(company_labels)}
+                rank = np.array([position[k] for k in keys], dtype=np.int64)
+                company_rank = rank[codes] if n else np.zeros(0, np.int64)
+
+        for dim in postings:
+            postings[dim] = {
+                key: parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+                for key, parts in postings[dim].items() if key
+            }
+
+        # postedTime has few distinct values: parse each once, then override rows that carry publishedAt.
+        codes, values = jobs_data.category_codes('postedTime')
+        posted = np.array([posted_timestamp(None, v, now) for v in values], dtype=np.float64)[codes]
+        for row in range(n):
+            published = jobs_data.field(row, 'publishedAt')
+            if isinstance(published, str) and published:
+                posted[row] = posted_timestamp(published, None, now)
+
+        sort_keys = {
+            'default': np.arange(n, dtype=np.float64),
+            'posted': posted,
+            'company': company_rank.astype(np.float64),
+        }
+        return cls(jobs_data, location_index, postings, sort_keys, {'company': company_labels})
+
+    def job_id(self, row: int) -> str:
+        """Job id as the listing reports it (row number when the job has none)."""
+        job_id = self.jobs_data[row].get('id')
+        return job_id if isinstance(job_id, str) else str(row)
+
+    def keys(self, dimension: str) -> List[str]:
+        if dimension == 'location':
+            return list(self.location_index.terms)
+        return list(self.postings[dimension])
+
+    def match(self, filters: Dict[str, Iterable[str]]):
+        """Bitmap of jobs matching every dimension (any of its values); None when nothing is filtered."""
+        import numpy as np
+
+        result = None
+        for dimension, values in filters.items():
+            values = [v.strip().lower() for v in values if v and v.strip()]
+            if not values:
+                continue
+            if dimension == 'location':
+                bitmap = self.location_index.mask(', '.join(values))
+            else:
+                postings = self.postings[dimension]
+                bitmap = np.zeros(self.n_jobs, dtype=bool)
+                for value in values:
+                    rows = postings.get(value)
+                    if rows is not None:
+                        bitmap[rows] = True
+            result = bitmap if result is None else np.logical_and(result, bitmap, out=result)
+        return result
+
+    def order(self, sort: str, direction: str):
+        """(permutation, sorted signed keys, rank of each row) for a sort; NaN keys come last, ties by row."""
+        cached = self._orders.get((sort, direction))
+        if cached is None:
+            import numpy as np
+
+            keys = self.sort_keys[sort]
+            signed = -keys if direction == 'desc' else keys
+            # lexsort: last key is primary -> (missing last, signed key, row)
+            perm = np.lexsort((np.arange(self.n_jobs), np.nan_to_num(signed, nan=0.0), np.isnan(signed)))
+            rank = np.empty(self.n_jobs, dtype=np.int64)
+            rank[perm] = np.arange(self.n_jobs)
+            cached = self._orders[(sort, direction)] = (perm, signed[perm], rank)
+        return cached
+
+    def page(self, bitmap, sort: str, direction: str, start: int, size: int) -> List[int]:
+        """Up to ``size`` matching rows from position ``start`` of the sort permutation."""
+        import numpy as np
+
+        perm = self.order(sort, direction)[0]
+        if bitmap is None:
+            return perm[start:start + size].tolist()
+        rows: List[int] = []
+        chunk = max(size * 8, 1024)
+        while start < self.n_jobs and len(rows) < size:
+            window = perm[start:start + chunk]
+            rows.extend(window[bitmap[window]][:size - len(rows)].tolist())
+            start += chunk
+            chunk *= 2
+        return rows
+
+    def offset_position(self, bitmap, sort: str, direction: str, offset: int) -> int:
+        """Permutation position of the offset-th matching job (page-number pagination)."""
+        import numpy as np
+
+        if bitmap is None:
+            return min(offset, self.n_jobs)
+        positions = np.flatnonzero(bitmap[self.order(sort, direction)[0]])
+        return int(positions[offset]) if offset < len(positions) else self.n_jobs
+
+    def cursor_position(self, state: Dict) -> int:
+        """Position just after the last row a cursor served. Falls back to its sort key if the corpus changed."""
+        import bisect
+        import numpy as np
+
+        sort, direction, row, key = state['s'], state['d'], int(state['r']), state.get('k')
+        perm, sorted_keys, rank = self.order(sort, direction)
+        if 0 <= row < self.n_jobs and self.job_id(row) == state.get('i'):
+            return int(rank[row]) + 1
+        labels = self.sort_labels.get(sort)
+        if key is None:
+            key = np.nan  # missing keys sort last, in searchsorted as in the permutation
+        elif labels is not None:
+            at = bisect.bisect_left(labels, key)
+            if at == len(labels) or labels[at] != key:
+                # Value no longer in the corpus: resume at the first value after it.
+                return int(np.searchsorted(sorted_keys, at - 0.5 if direction == 'asc' else -at + 0.5, side='right'))
+            key = at if direction == 'asc' else -at
+        # Within a run of equal keys rows are in ascending order, so skip those up to the cursor's row.
+        lo, hi = np.searchsorted(sorted_keys, key, side='left'), np.searchsorted(sorted_keys, key, side='right')
+        return int(lo + np.searchsorted(perm[lo:hi], row, side='right'))
+
+    def encode_cursor(self, sort: str, direction: str, row: int, query_key: str) -> str:
+        """Opaque cursor for the page after ``row``: sort, last row, its id and its sort key."""
+        _, sorted_keys, rank = self.order(sort, direction)
+        key = sorted_keys[rank[row]]
+        if key != key:
+            key = None
+        elif sort in self.sort_labels:
+            key = self.sort_labels[sort][int(abs(key))]
+        else:
+            key = float(key)
+        state = {'s': sort, 'd': direction, 'r': int(row), 'i': self.job_id(row), 'k': key, 'q': query_key}
+        return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str, query_key: str) -> Dict:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            state = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            if not isinstance(state, dict) or state.get('s') not in SORTS or state.get('d') not in ('asc', 'desc'):
+                raise ValueError('bad state')
+            int(state['r'])
+            key = state.get('k')
+            if key is not None and not isinstance(key, str if state['s'] in ('company',) else (int, float)):
+                raise ValueError('bad key')
+        except (ValueError, KeyError, TypeError):
+            raise InvalidCursor('Invalid cursor') from None
+        if state.get('q') != query_key:
+            raise InvalidCursor('Cursor was issued for different filters or sort order')
+        return state
+
+
+def query_key(filters: Dict[str, List[str]], sort: str, direction: str) -> str:
+    """Short digest binding a cursor to its filters and sort."""
+    normalized = {k: sorted(v.strip().lower() for v in values if v and v.strip()) for k, values in filters.items()}
+    blob = json.dumps([normalized, sort, direction], sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
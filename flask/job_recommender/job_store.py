@@ -0,0 +1,296 @@
+"""Compact columnar storage for the job corpus.
+
+A list of per-job dicts costs several kilobytes per posting in object headers,
+hash tables and duplicated strings. JobStore keeps one column per field instead:
+
+    text columns      one UTF-8 buffer per field plus int64 offsets (descriptions, titles, ids, URLs)
+    category columns  int32 codes into an interned value table (company, location, source, levels, ...)
+    skills            int32 codes into a skill table, with per-job offsets
+
+``combined_text`` is not stored; it is rebuilt on access, since only indexing reads it.
+
+``store[i]`` returns a JobView, a read-only Mapping that decodes fields on demand, so
+``job.get('title')`` and ``{**job}`` keep working for formatters and routes. Values that do
+not fit a column's type (a non-string in a text column, an unhashable category) are kept
+as-is in a small per-column overflow dict, and so are absent fields. The columns mirror
+preprocessing.JOB_FIELDS plus the fields preprocessing derives.
+"""
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .preprocessing import create_combined_text
+
+TEXT_FIELDS = (
+    'id', 'title', 'description', 'applyUrl', 'jobUrl', 'companyUrl', 'publishedAt',
+    'title_normalized', 'title_core',
+)
+CATEGORY_FIELDS = (
+    'companyName', 'location', 'source', 'experienceLevel', 'job_level', 'contractType',
+    'workType', 'sector', 'postedTime', 'salary', 'applicationsCount',
+)
+LIST_FIELDS = ('skills',)
+COMPUTED_FIELDS = ('combined_text',)
+
+_ABSENT = object()
+
+
+class _TextColumn:
+    """Strings concatenated into one UTF-8 buffer; row i is buffer[offsets[i]:offsets[i + 1]]."""
+
+    __slots__ = ('buffer', 'offsets', 'overflow')
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets = array('q', [0])
+        self.overflow: Dict[int, object] = {}
+
+    def append(self, row: int, value) -> None:
+        if isinstance(value, str):
+            self.buffer += value.encode('utf-8')
+        else:
+            self.overflow[row] = value
+        self.offsets.append(len(self.buffer))
+
+    def get(self, row: int):
+        if row in self.overflow:
+            return self.overflow[row]
+        return self.buffer[self.offsets[row]:self.offsets[row + 1]].decode('utf-8')
+
+    def freeze(self) -> None:
+        """Kept as a bytearray: converting to bytes would copy the whole buffer."""
+
+    def nbytes(self) -> int:
+        return len(self.buffer) + self.offsets.itemsize * len(self.offsets)
+
+
+class _CategoryColumn:
+    """Interned values: per-row int32 code into ``values`` (-1 = see overflow)."""
+
+    __slots__ = ('codes', 'values', 'lookup', 'overflow')
+
+    def __init__(self):
+        self.codes = array('i')
+        self.values: List = []
+        self.lookup: Dict = {}
+        self.overflow: Dict[int, object] = {}
+
+    def append(self, row: int, value) -> None:
+        if value is _ABSENT:
+            self.overflow[row] = value
+            self.codes.append(-1)
+            return
+        try:
+            code = self.lookup.get((type(value), value))
+        except TypeError:
+            self.overflow[row] = value
+            self.codes.append(-1)
+            return
+        if code is None:
+            if isinstance(value, str):
+                value = sys.intern(value)
+            code = self.lookup[(type(value), value)] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def get(self, row: int):
+        code = self.codes[row]
+        if code < 0:
+            return self.overflow[row]
+        return self.values[code]
+
+    def freeze(self) -> None:
+        self.lookup = {}
+
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes)
+
+
+class _ListColumn:
+    """Lists of strings as codes into one interned table, with per-row offsets."""
+
+    __slots__ = ('codes', 'offsets', 'values', 'lookup', 'overflow')
+
+    def __init__(self):
+        self.codes = array('i')
+        self.offsets = array('q', [0])
+        self.values: List[str] = []
+        self.lookup: Dict[str, int] = {}
+        self.overflow: Dict[int, object] = {}
+
+    def append(self, row: int, value) -> None:
+        if isinstance(value, list) and all(isinstance(v, str) for v in value):
+            for item in value:
+                code = self.lookup.get(item)
+                if code is None:
+                    code = self.lookup[item] = len(self.values)
+                    self.values.append(sys.intern(item))
+                self.codes.append(code)
+        else:
+            self.overflow[row] = value
+        self.offsets.append(len(self.codes))
+
+    def get(self, row: int):
+        if row in self.overflow:
+            return self.overflow[row]
+        values = self.values
+        return [values[c] for c in self.codes[self.offsets[row]:self.offsets[row + 1]]]
+
+    def freeze(self) -> None:
+        self.lookup = {}
+
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes) + self.offsets.itemsize * len(self.offsets)
+
+
+class JobView(Mapping):
+    """Read-only, lazily decoded view of one job in a JobStore."""
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: 'JobStore', row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, field: str):
+        value = self._store.field(self._row, field)
+        if value is _ABSENT:
+            raise KeyError(field)
+        return value
+
+    def get(self, field: str, default=None):
+        value = self._store.field(self._row, field)
+        return default if value is _ABSENT else value
+
+    def __contains__(self, field) -> bool:
+        return self._store.field(self._row, field) is not _ABSENT
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self._store.row_fields(self._row):
+            if self._store.field(self._row, field) is not _ABSENT:
+                yield field
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"JobView({dict(self)!r})"
+
+
+class JobStore:
+    """Column-oriented job corpus with a list-like interface (len, indexing, slicing, iteration)."""
+
+    field_names = TEXT_FIELDS + CATEGORY_FIELDS + LIST_FIELDS + COMPUTED_FIELDS
+
+    def __init__(self):
+        self._columns = {}
+        for name in TEXT_FIELDS:
+            self._columns[name] = _TextColumn()
+        for name in CATEGORY_FIELDS:
+            self._columns[name] = _CategoryColumn()
+        for name in LIST_FIELDS:
+            self._columns[name] = _ListColumn()
+        self._known = frozenset(self.field_names)
+        # Fields outside the schema (none after preprocessing.project_job), kept per row as given
+        self._extra: Dict[int, Dict] = {}
+        self._size = 0
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Mapping]) -> 'JobStore':
+        """Build from preprocessed jobs (dicts or views), consuming the iterable one job at a time."""
+        store = cls()
+        for job in jobs:
+            store._append(job)
+        for column in store._columns.values():
+            column.freeze()
+        return store
+
+    def _append(self, job: Mapping) -> None:
+        row = self._size
+        for name, column in self._columns.items():
+            column.append(row, job.get(name, _ABSENT))
+        if isinstance(job, JobView):
+            extra = job._store._extra.get(job._row)
+        else:
+            extra = {k: v for k, v in job.items() if k not in self._known}
+        if extra:
+            self._extra[row] = extra
+        self._size += 1
+
+    def field(self, row: int, name: str):
+        """Value of one field for one job (the _ABSENT sentinel when the job does not have it)."""
+        column = self._columns.get(name)
+        if column is not None:
+            return column.get(row)
+        if name == 'combined_text':
+            return self.combined_text(row)
+        return self._extra.get(row, {}).get(name, _ABSENT)
+
+    def row_fields(self, row: int) -> Iterator[str]:
+        yield from self.field_names
+        yield from self._extra.get(row, ())
+
+    def combined_text(self, row: int) -> str:
+        return create_combined_text(JobView(self, row), self._columns['description'].get(row) or '')
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [JobView(self, i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('job index out of range')
+        return JobView(self, index)
+
+    def __iter__(self) -> Iterator[JobView]:
+        for i in range(self._size):
+            yield JobView(self, i)
+
+    def category_codes(self, name: str, missing: object = None):
+        """(int32 code per job, values) for a category column, every row mapped to a value.
+
+        Rows held in the overflow get extra codes past the interned values: absent fields share
+        ``missing``, unhashable values are keyed by their repr.
+        """
+        import numpy as np
+
+        column = self._columns[name]
+        codes = np.frombuffer(column.codes, dtype=np.int32).copy() if len(column.codes) else np.zeros(0, np.int32)
+        values = list(column.values)
+        extra = {}
+        for row, value in column.overflow.items():
+            key = missing if value is _ABSENT else value
+            try:
+                hash(key)
+            except TypeError:
+                key = repr(key)
+            code = extra.get((type(key), key))
+            if code is None:
+                code = extra[(type(key), key)] = len(values)
+                values.append(key)
+            codes[row] = code
+        return codes, values
+
+    def value_counts(self, name: str, missing: Optional[object] = None) -> Dict:
+        """{value: number of jobs} for a category column, from the codes alone."""
+        import numpy as np
+
+        column = self._columns[name]
+        codes = np.frombuffer(column.codes, dtype=np.int32) if len(column.codes) else np.zeros(0, np.int32)
+        counts = np.bincount(codes[codes >= 0], minlength=len(column.values))
+        result = {value: int(c) for value, c in zip(column.values, counts) if c}
+        for value in column.overflow.values():
+            key = missing if value is _ABSENT else value
+            try:
+                result[key] = result.get(key, 0) + 1
+            except TypeError:
+                continue
+        return result
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the column arrays and buffers (excluding interned tables)."""
+        return sum(column.nbytes() for column in self._columns.values())
@@ -0,0 +1,127 @@
+"""Normalized location index: which jobs a location filter admits, resolved once per filter.
+
+Location strings are split into place tokens ("Hybrid - Pune, Delhi / NCR" -> hybrid, pune,
+delhi, ncr), and common aliases map to one canonical name (Bangalore -> bengaluru,
+Gurgaon -> gurugram). A job is indexed under each token and under each word of a multi-word
+token, so "mumbai" also admits "Navi Mumbai" and "Mumbai Suburban" like the old substring
+filter did. Tokens are computed per distinct location string, not per job.
+
+Retrieval asks ``rows(location_filter)`` for the eligible job rows before scoring, so a
+narrow location gets a full candidate pool instead of whatever survived a global top-k.
+"""
+import re
+from typing import Dict, List, Optional
+
+_SPLIT_RE = re.compile(r'[,/;|()]|\s+-\s+')
+_WHITESPACE_RE = re.compile(r'\s+')
+_DROP = {'', 'all areas'}
+_MAX_CACHED_FILTERS = 256
+
+# Alternate or former names -> canonical token
+LOCATION_ALIASES = {
+    'bangalore': 'bengaluru',
+    'banglore': 'bengaluru',
+    'gurgaon': 'gurugram',
+    'bombay': 'mumbai',
+    'madras': 'chennai',
+    'calcutta': 'kolkata',
+    'poona': 'pune',
+    'mangalore': 'mangaluru',
+    'mysore': 'mysuru',
+    'trivandrum': 'thiruvananthapuram',
+    'cochin': 'kochi',
+    'ernakulam': 'kochi',
+    'vizag': 'visakhapatnam',
+    'baroda': 'vadodara',
+    'pondicherry': 'puducherry',
+    'belgaum': 'belagavi',
+    'hubli': 'hubballi',
+    'trichy': 'tiruchirapalli',
+    'tiruchirappalli': 'tiruchirapalli',
+    'sahibzada ajit singh nagar': 'mohali',
+    'secunderabad': 'hyderabad',
+    'ncr': 'delhi ncr',
+    'work from home': 'remote',
+    'wfh': 'remote',
+}
+
+
+def canonical_location(token: str) -> str:
+    return LOCATION_ALIASES.get(token, token)
+
+
+def location_tokens(location: str) -> List[str]:
+    """Canonical, lowercased place tokens of a location string (multi-city lists, areas in parentheses)."""
+    tokens = []
+    for part in _SPLIT_RE.split((location or '').lower()):
+        token = canonical_location(_WHITESPACE_RE.sub(' ', part).strip(' .'))
+        if token not in _DROP and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def _terms(token: str) -> List[str]:
+    """Index terms for one place token: the token and, for multi-word tokens, each canonical word."""
+    words = token.split(' ')
+    if len(words) == 1:
+        return [token]
+    return [token] + [canonical_location(w) for w in words if w]
+
+
+class LocationIndex:
+    """Location term -> ids of the distinct location strings (JobFeatures.locations) that carry it."""
+
+    def __init__(self, location_ids, terms: Dict[str, List[int]], n_locations: int):
+        self.location_ids = location_ids
+        self.terms = terms
+        self.n_locations = n_locations
+        self._cache: Dict[str, Optional[object]] = {}
+
+    @classmethod
+    def build(cls, features) -> 'LocationIndex':
+        terms: Dict[str, List[int]] = {}
+        for loc_id, location in enumerate(features.locations):
+            for token in location_tokens(location):
+                for term in _terms(token):
+                    ids = terms.setdefault(term, [])
+                    if not ids or ids[-1] != loc_id:
+                        ids.append(loc_id)
+        return cls(features.location_ids, terms, len(features.locations))
+
+    def __len__(self) -> int:
+        return int(self.location_ids.shape[0])
+
+    def matching_locations(self, location_filter: str) -> List[int]:
+        """Distinct-location ids admitted by a filter; tokens without a match fall back to their words."""
+        matched = set()
+        for token in location_tokens(location_filter):
+            ids = self.terms.get(token)
+            if ids is None:
+                ids = [i for word in token.split(' ') for i in self.terms.get(canonical_location(word), ())]
+            matched.update(ids)
+        return sorted(matched)
+
+    def mask(self, location_filter: Optional[str]):
+        """Boolean mask over jobs admitted by the filter, or None when the filter is blank."""
+        import numpy as np
+
+        if not location_filter or not location_filter.strip():
+            return None
+        allowed = np.zeros(self.n_locations, dtype=bool)
+        allowed[self.matching_locations(location_filter)] = True
+        return allowed[self.location_ids]
+
+    def rows(self, location_filter: Optional[str]):
+        """Sorted int64 row ids admitted by the filter (None when blank); memoized per filter string."""
+        import numpy as np
+
+        if not location_filter or not location_filter.strip():
+            return None
+        key = location_filter.strip().lower()
+        rows = self._cache.get(key)
+        if rows is None:
+            rows = np.flatnonzero(self.mask(key)).astype(np.int64)
+            if len(self._cache) >= _MAX_CACHED_FILTERS:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = rows
+        return rows
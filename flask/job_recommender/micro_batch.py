@@ -0,0 +1,160 @@
+"""Dynamic micro-batching in front of the sentence model.
+
+Concurrent requests each encode one resume. MicroBatchEncoder has the SentenceTransformer
+``encode`` signature; small calls are queued, and a background thread runs them as one
+forward pass once ``max_batch`` texts are waiting or ``max_wait_ms`` has passed since the
+first of them arrived. Each caller gets back its own rows. The wait only applies under load
+(the previous batch held several requests): a lone request on an idle batcher runs at once,
+so single-user latency is unchanged, while requests arriving during a forward pass queue up
+for the next one either way. Calls with ``max_batch`` or more texts, or with keyword
+arguments other than batch_size / show_progress_bar, go straight to the model, as they are
+already batched (job encoding, batch recommendations). ``close()`` serves the requests
+already queued, stops the thread, and sends later calls straight to the model.
+
+Batch sizes and queue waits are exported as the ``app_encode_batch_size`` and
+``app_encode_queue_seconds`` histograms.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class _Request:
+    __slots__ = ('texts', 'enqueued', 'done', 'result', 'error')
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatchEncoder:
+    """Coalesces concurrent small ``encode`` calls into batched calls of the wrapped model."""
+
+    def __init__(self, model, max_batch: int = 32, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._last_size = 0
+        self.counts = {'requests': 0, 'batches': 0, 'texts': 0, 'passthrough': 0}
+
+    def __getattr__(self, name):
+        # Everything but encode (e.g. get_sentence_embedding_dimension) is the model's own.
+        if name == 'model':
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        with self._cond:
+            passthrough = self._closed or not texts or len(texts) >= self.max_batch or bool(kwargs)
+            if passthrough:
+                self.counts['passthrough'] += 1
+            else:
+                request = _Request(texts)
+                self._ensure_thread()
+                self._queue.append(request)
+                self.counts['requests'] += 1
+                self._cond.notify()
+        if passthrough:
+            return self.model.encode(sentences, batch_size=batch_size, show_progress_bar=show_progress_bar,
+                                     **kwargs)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result[0] if single else request.result
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name='encode-batcher', daemon=True)
+            self._thread.start()
+
+    def _take_batch(self) -> Optional[List[_Request]]:
+        """Wait for the first request, then gather more until max_batch texts or max_wait has passed.
+
+        None once closed and the queue is drained.
+        """
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            deadline = self._queue[0].enqueued + self.max_wait
+            while not self._closed and (self._last_size > 1 or len(self._queue) > 1) and \
+                    sum(len(r.texts) for r in self._queue) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, size = [], 0
+            while self._queue and (not batch or size + len(self._queue[0].texts) <= self.max_batch):
+                request = self._queue.popleft()
+                batch.append(request)
+                size += len(request.texts)
+            self._last_size = len(batch)
+            self.counts['batches'] += 1
+            self.counts['texts'] += size
+            return batch
+
+    def _loop(self) -> None:
+        import numpy as np
+
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            texts = [text for request in batch for text in request.texts]
+            metrics.observe('app_encode_batch_size', len(texts), buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+                            help_text='Texts per micro-batched encode call')
+            for request in batch:
+                metrics.observe('app_encode_queue_seconds', started - request.enqueued,
+                                buckets=metrics.LATENCY_BUCKETS, help_text='Wait before a micro-batch ran')
+            try:
+                embeddings = np.asarray(self.model.encode(texts, batch_size=len(texts), show_progress_bar=False))
+                error = None
+            except Exception as e:
+                embeddings, error = None, e
+            offset = 0
+            for request in batch:
+                if error is not None:
+                    request.error = error
+                else:
+                    request.result = embeddings[offset:offset + len(request.texts)]
+                offset += len(request.texts)
+                request.done.set()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the batching thread once the queued requests are served."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            counts = dict(self.counts)
+        counts['mean_batch'] = round(counts['texts'] / counts['batches'], 2) if counts['batches'] else 0.0
+        return {**counts, 'max_batch': self.max_batch, 'max_wait_ms': self.max_wait * 1000.0}
+
+
+def wrap(model, enabled: bool, max_batch: int = 32, max_wait_ms: float = 5.0):
+    """``model`` behind a MicroBatchEncoder when enabled (models that already are one are kept as is)."""
+    if not enabled or model is None or isinstance(model, MicroBatchEncoder):
+        return model
+    return MicroBatchEncoder(model, max_batch=max_batch, max_wait_ms=max_wait_ms)
@@ -1,82 +1,146 @@
-"""Model initialization and cache handling for job recommender."""
+"""Model initialization and model store handling for job recommender."""
 import gc
 import os
-import pickle
 import logging
-from typing import Optional, Tuple, Any
+from typing import Any, Dict
+
+from config import (
+    EMBEDDING_STORE_DTYPE,
+    VECTOR_INDEX_BACKEND,
+    VECTOR_INDEX_MIN_JOBS,
+    FAISS_HNSW_M,
+    FAISS_EF_SEARCH,
+    FAISS_NPROBE,
+    SPARSE_RETRIEVAL_ENGINE,
+    BM25_K1,
+    BM25_B,
+    ENCODE_BATCH_ENABLED,
+    ENCODE_BATCH_MAX_SIZE,
+    ENCODE_BATCH_MAX_WAIT_MS,
+    ENCODER_BACKEND,
+    ONNX_MODEL_DIR,
+    ONNX_QUANTIZED,
+    ONNX_THREADS,
+)
+from . import micro_batch
+from . import store
+from . import vector_index
+from . import sparse_retrieval
 
 logger = logging.getLogger(__name__)
 
 
-def load_from_cache(
-    cache_file: str,
-    data_path: str,
-    jobs_count: int,
-    model_name: str,
-) -> Optional[Tuple[Any, Any, Any, Any]]:
-    """Load TF-IDF and embeddings from cache if valid. Returns (tfidf_vectorizer, tfidf_matrix, job_embeddings) or None."""
-    try:
-        if not os.path.exists(cache_file):
-            return None
+def load_sentence_model(model_name: str):
+    """Load the sentence encoder used for job and resume embeddings (runtime per ENCODER_BACKEND)."""
+    if ENCODER_BACKEND == 'onnx':
+        from .onnx_encoder import OnnxEncoder, default_model_dir
+        model_dir = ONNX_MODEL_DIR or default_model_dir(model_name)
+        try:
+            encoder = OnnxEncoder(model_dir, quantized=ONNX_QUANTIZED, threads=ONNX_THREADS)
+            if encoder.model_name != model_name:
+                raise ValueError(f"{model_dir} holds {encoder.model_name}, not {model_name}")
+            logger.info(f"Using ONNX Runtime encoder ({encoder.encoder_backend}) from {model_dir}")
+            return encoder
+        except Exception as e:
+            logger.warning(f"ONNX encoder unavailable ({e}), using sentence-transformers")
+    elif ENCODER_BACKEND != store.DEFAULT_ENCODER_BACKEND:
+        logger.warning(f"Unknown encoder backend {ENCODER_BACKEND!r}, using sentence-transformers")
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
 
-        cache_mtime = os.path.getmtime(cache_file)
-        data_mtime = os.path.getmtime(data_path)
-        if data_mtime > cache_mtime:
-            logger.warning("Cache might be stale (Data file newer), loading anyway to prevent OOM")
 
-        with open(cache_file, 'rb') as f:
-            data = pickle.load(f)
+def encoder_backend(sentence_model) -> str:
+    """Runtime that produced ``sentence_model``'s embeddings, as recorded in the store manifest."""
+    return getattr(sentence_model, 'encoder_backend', store.DEFAULT_ENCODER_BACKEND)
 
-        tfidf_vectorizer = data['tfidf_vectorizer']
-        tfidf_matrix = data['tfidf_matrix']
-        job_embeddings = data['job_embeddings']
 
-        if tfidf_matrix.shape[0] != jobs_count:
-            logger.warning("Cache mismatch: Job count differs")
-            return None
+def encode_job_texts(sentence_model, job_texts: list, batch_size: int = 32):
+    """Encode job texts in batches, assembling the result with a single concatenate."""
+    import numpy as np
 
-        from sentence_transformers import SentenceTransformer
-        sentence_model = SentenceTransformer(model_name)
+    batches = []
+    for i in range(0, len(job_texts), batch_size):
+        batches.append(sentence_model.encode(job_texts[i:i + batch_size], show_progress_bar=False))
+        gc.collect()
+    if not batches:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.concatenate(batches).astype(np.float32, copy=False)
+
+
+def open_vector_index(store_dir: str, manifest: dict, job_embeddings):
+    """Open the configured embedding index from the store, building and persisting it if missing."""
+    backend = VECTOR_INDEX_BACKEND
+    if backend != 'exact' and job_embeddings.shape[0] < VECTOR_INDEX_MIN_JOBS:
+        logger.info(f"{job_embeddings.shape[0]} jobs < VECTOR_INDEX_MIN_JOBS, using exact search")
+        backend = 'exact'
+    params = {'hnsw_m': FAISS_HNSW_M, 'ef_search': FAISS_EF_SEARCH, 'nprobe': FAISS_NPROBE}
+    if manifest is None:
+        return vector_index.build_index(backend, job_embeddings, params)
+
+    version_dir = store.get_version_dir(store_dir, manifest)
+    recorded = manifest.get('vector_index') or {}
+    if recorded.get('revision', 0) == manifest.get('revision', 0):
+        index = vector_index.load_index(backend, version_dir, job_embeddings, params)
+        if index is not None:
+            return index
+
+    index = vector_index.build_index(backend, job_embeddings, params)
+    if index.name == 'exact':
+        return index
+    try:
+        index.save(os.path.join(version_dir, vector_index.index_filename(index.name)))
+        recall = vector_index.measure_recall(index, job_embeddings, k=10)
+        logger.info(f"Built {index.name} index over {index.ntotal} jobs, recall@10 vs exact = {recall:.3f}")
+        store.update_manifest(store_dir, manifest, vector_index={
+            'backend': index.name,
+            'params': params,
+            'recall_at_10': round(recall, 4),
+            'revision': manifest.get('revision', 0),
+        })
+    except Exception as e:
+        logger.warning(f"Failed to persist {index.name} index: {e}")
+    return index
 
-        return (tfidf_vectorizer, tfidf_matrix, sentence_model, job_embeddings)
 
-    except Exception as e:
-        logger.warning(f"Failed to load cache: {e}")
+def open_sparse_retriever(store_dir: str, manifest: dict, tfidf_vectorizer, tfidf_matrix, jobs_data: list):
+    """Open the configured sparse retrieval engine from the store, building and persisting it if missing."""
+    engine = SPARSE_RETRIEVAL_ENGINE
+    params = {'k1': BM25_K1, 'b': BM25_B} if engine == 'bm25' else {}
+    if engine == 'sweep':
         return None
 
-
-def save_to_cache(cache_file: str, tfidf_vectorizer, tfidf_matrix, job_embeddings) -> None:
-    """Save models to cache."""
+    recorded = (manifest or {}).get('sparse_retriever') or {}
+    if (manifest is not None and recorded.get('engine') == engine and recorded.get('params') == params
+            and recorded.get('revision', 0) == manifest.get('revision', 0)):
+        try:
+            return sparse_retrieval.SparseRetriever.load(
+                store.get_version_dir(store_dir, manifest), engine,
+                tfidf_vectorizer, tfidf_matrix.shape[0], params=params,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load {engine} postings: {e}")
+
+    job_texts = [j.get('combined_text', '') for j in jobs_data] if engine == 'bm25' else []
+    retriever = sparse_retrieval.build_retriever(engine, tfidf_vectorizer, tfidf_matrix, job_texts, params)
+    if retriever is None or manifest is None:
+        return retriever
     try:
-        with open(cache_file, 'wb') as f:
-            pickle.dump({
-                'tfidf_vectorizer': tfidf_vectorizer,
-                'tfidf_matrix': tfidf_matrix,
-                'job_embeddings': job_embeddings,
-            }, f)
-        logger.info("Cache saved successfully")
+        retriever.save(store.get_version_dir(store_dir, manifest))
+        store.update_manifest(store_dir, manifest, sparse_retriever={
+            'engine': retriever.engine,
+            'params': params,
+            'revision': manifest.get('revision', 0),
+        })
+        logger.info(f"Built {retriever.engine} inverted index over {retriever.n_jobs} jobs")
     except Exception as e:
-        logger.error(f"Failed to save cache: {e}")
-
-
-def initialize_models(
-    jobs_data: list,
-    data_path: str,
-    model_name: str,
-) -> Tuple[Any, Any, Any, Any]:
-    """Initialize TF-IDF and Sentence Transformer models (or load from cache)."""
-    gc.collect()
+        logger.warning(f"Failed to persist {retriever.engine} postings: {e}")
+    return retriever
 
-    data_dir = os.path.dirname(os.path.abspath(data_path))
-    cache_file = os.path.join(data_dir, 'model_cache.pkl')
-
-    cached = load_from_cache(cache_file, data_path, len(jobs_data), model_name)
-    if cached:
-        return cached
 
+def fit_tfidf(job_texts: list):
+    """Fit the TF-IDF vectorizer on the job corpus. Returns (vectorizer, matrix)."""
     from sklearn.feature_extraction.text import TfidfVectorizer
 
-    job_texts = [j.get('combined_text', '') for j in jobs_data]
     tfidf_vectorizer = TfidfVectorizer(
         max_features=5000,
         stop_words='english',
@@ -84,25 +148,81 @@ def initialize_models(
         min_df=2,
         max_df=0.8,
     )
-    tfidf_matrix = tfidf_vectorizer.fit_transform(job_texts)
+    return tfidf_vectorizer, tfidf_vectorizer.fit_transform(job_texts)
 
-    from sentence_transformers import SentenceTransformer
-    sentence_model = SentenceTransformer(model_name)
-
-    batch_size = 32
-    total_jobs = len(job_texts)
-    job_embeddings = None
-
-    for i in range(0, total_jobs, batch_size):
-        batch = job_texts[i:i + batch_size]
-        batch_emb = sentence_model.encode(batch, show_progress_bar=False)
-        import numpy as np
-        if job_embeddings is None:
-            job_embeddings = batch_emb
-        else:
-            job_embeddings = np.vstack((job_embeddings, batch_emb))
-        del batch, batch_emb
-        gc.collect()
 
-    save_to_cache(cache_file, tfidf_vectorizer, tfidf_matrix, job_embeddings)
-    return (tfidf_vectorizer, tfidf_matrix, sentence_model, job_embeddings)
+def build_store(jobs_data: list, store_dir: str, model_name: str, sentence_model, job_embeddings=None):
+    """Fit TF-IDF, encode jobs (unless embeddings are given), save a new store version and reopen it.
+
+    Returns (tfidf_vectorizer, tfidf_matrix, job_embeddings, manifest); manifest is None if saving failed.
+    """
+    job_texts = [j.get('combined_text', '') for j in jobs_data]
+    tfidf_vectorizer, tfidf_matrix = fit_tfidf(job_texts)
+    if job_embeddings is None:
+        job_embeddings = encode_job_texts(sentence_model, job_texts)
+
+    backend = encoder_backend(sentence_model)
+    store.save_store(
+        store_dir, model_name, jobs_data,
+        tfidf_vectorizer, tfidf_matrix, job_embeddings,
+        embedding_dtype=EMBEDDING_STORE_DTYPE,
+        encoder_backend=backend,
+    )
+    # Serve from the freshly written store so this worker maps the same pages as its siblings.
+    reopened = store.load_store(store_dir, model_name, jobs_data, encoder_backend=backend)
+    if reopened:
+        return reopened
+    return tfidf_vectorizer, tfidf_matrix, store.normalize_rows(job_embeddings), None
+
+
+def assemble_models(store_dir: str, manifest, jobs_data: list, tfidf_vectorizer, tfidf_matrix,
+                    sentence_model, job_embeddings, vector_idx=None, sparse_retriever=None) -> Dict[str, Any]:
+    """The models dict used by JobRecommender; retrieval indexes are opened unless passed in."""
+    if vector_idx is None:
+        vector_idx = open_vector_index(store_dir, manifest, job_embeddings)
+    if sparse_retriever is None:
+        sparse_retriever = open_sparse_retriever(store_dir, manifest, tfidf_vectorizer, tfidf_matrix, jobs_data)
+    return {
+        'tfidf_vectorizer': tfidf_vectorizer,
+        'tfidf_matrix': tfidf_matrix,
+        'sentence_model': sentence_model,
+        'job_embeddings': job_embeddings,
+        'vector_index': vector_idx,
+        'sparse_retriever': sparse_retriever,
+        'manifest': manifest,
+        # Store row of each live job, needed to tombstone it on a later ingest
+        'store_rows': store.live_store_rows(store_dir, manifest, tfidf_matrix.shape[0]),
+        # Identifies the fitted vectorizer, so cached resume TF-IDF vectors never outlive a refit
+        'store_version': manifest.get('version') if manifest else None,
+    }
+
+
+def initialize_models(
+    jobs_data: list,
+    data_path: str,
+    model_name: str,
+    sentence_model=None,
+) -> Dict[str, Any]:
+    """Initialize TF-IDF, Sentence Transformer and retrieval indexes (or open them from the model store).
+
+    A preloaded ``sentence_model`` is used instead of loading ``model_name``, which then only names
+    the embeddings in the store manifest.
+    """
+    gc.collect()
+
+    store_dir = store.get_store_dir(data_path)
+    if sentence_model is None:
+        sentence_model = load_sentence_model(model_name)
+    sentence_model = micro_batch.wrap(sentence_model, ENCODE_BATCH_ENABLED, ENCODE_BATCH_MAX_SIZE,
+                                      ENCODE_BATCH_MAX_WAIT_MS)
+
+    opened = store.load_store(store_dir, model_name, jobs_data, encoder_backend=encoder_backend(sentence_model))
+    if opened:
+        tfidf_vectorizer, tfidf_matrix, job_embeddings, manifest = opened
+    else:
+        tfidf_vectorizer, tfidf_matrix, job_embeddings, manifest = build_store(
+            jobs_data, store_dir, model_name, sentence_model
+        )
+
+    return assemble_models(store_dir, manifest, jobs_data, tfidf_vectorizer, tfidf_matrix,
+                           sentence_model, job_embeddings)
@@ -0,0 +1,226 @@
+"""ONNX Runtime backend for the sentence model: the same transformer, exported and int8-quantized.
+
+Selected with ENCODER_BACKEND=onnx. OnnxEncoder has the SentenceTransformer ``encode``
+signature but needs only onnxruntime and tokenizers at serve time (no PyTorch import), and
+dynamic int8 quantization of the weights cuts CPU latency further. Export once per model
+(needs sentence-transformers, torch and onnxruntime), then check it against the original:
+
+    python -m job_recommender.onnx_encoder export [--model paraphrase-MiniLM-L3-v2] [--model-dir DIR]
+    python -m job_recommender.onnx_encoder verify [--model-dir DIR] [--min-cosine 0.98]
+
+``verify`` encodes sample resumes and job texts with both backends and exits non-zero when
+their mean cosine agreement falls below ``--min-cosine``. The model store records each
+encoder's ``encoder_backend`` (e.g. ``onnx-int8``), so switching backends re-encodes the jobs.
+
+Export directory layout:
+
+    model.onnx          # fp32 export (kept for comparison)
+    model_int8.onnx     # dynamically quantized weights
+    tokenizer.json      # fast tokenizer of the original model
+    encoder.json        # model name, max sequence length, pooling, normalization, dimension
+"""
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ONNX_FILENAME = 'model.onnx'
+ONNX_INT8_FILENAME = 'model_int8.onnx'
+TOKENIZER_FILENAME = 'tokenizer.json'
+CONFIG_FILENAME = 'encoder.json'
+DEFAULT_MODEL_NAME = 'paraphrase-MiniLM-L3-v2'
+
+
+def default_model_dir(model_name: str) -> str:
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, 'onnx_models', model_name.replace('/', '__'))
+
+
+class OnnxEncoder:
+    """Mean- or CLS-pooled transformer embeddings computed with ONNX Runtime on the CPU."""
+
+    def __init__(self, model_dir: str, quantized: bool = True, threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, CONFIG_FILENAME), 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+        self.model_name = self.config['model_name']
+        filename = ONNX_INT8_FILENAME if quantized else ONNX_FILENAME
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(os.path.join(model_dir, filename), options,
+                                            providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILENAME))
+        self.tokenizer.enable_truncation(max_length=self.config['max_seq_length'])
+        self.tokenizer.enable_padding(pad_id=self.config.get('pad_token_id', 0),
+                                      pad_token=self.config.get('pad_token', '[PAD]'))
+        self.encoder_backend = 'onnx-int8' if quantized else 'onnx'
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.config['dimension'])
+
+    def _encode_batch(self, texts: List[str]):
+        import numpy as np
+
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            'input_ids': np.asarray([e.ids for e in encodings], dtype=np.int64),
+            'attention_mask': np.asarray([e.attention_mask for e in encodings], dtype=np.int64),
+            'token_type_ids': np.asarray([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(None, {k: v for k, v in feeds.items() if k in self.input_names})[0]
+        if self.config.get('pooling', 'mean') == 'cls':
+            pooled = hidden[:, 0]
+        else:
+            mask = feeds['attention_mask'][:, :, None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.config.get('normalize'):
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32, copy=False)
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False, **kwargs):
+        """Embeddings as an (N, dimension) float32 array (1-D for a single string)."""
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        out = np.zeros((len(texts), self.get_sentence_embedding_dimension()), dtype=np.float32)
+        # Longest first, like sentence-transformers, so each batch pads to similar lengths.
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        for start in range(0, len(order), max(1, batch_size)):
+            rows = order[start:start + batch_size]
+            out[rows] = self._encode_batch([texts[i] for i in rows])
+        return out[0] if single else out
+
+
+def export(model_name: str, out_dir: str, opset: int = 14) -> Dict:
+    """Export ``model_name``'s transformer to ONNX, quantize it to int8 and save its tokenizer."""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device='cpu')
+    transformer = model[0]
+    pooling = next((m for m in model if type(m).__name__ == 'Pooling'), None)
+    os.makedirs(out_dir, exist_ok=True)
+
+    tokenizer = transformer.tokenizer
+    sample = tokenizer(['an example sentence'], return_tensors='pt')
+    names = [n for n in ('input_ids', 'attention_mask', 'token_type_ids') if n in sample]
+    dynamic = {n: {0: 'batch', 1: 'sequence'} for n in names}
+    dynamic['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+    auto_model = transformer.auto_model.eval()
+
+    class _Hidden(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, *inputs):
+            return self.inner(**dict(zip(names, inputs))).last_hidden_state
+
+    fp32_path = os.path.join(out_dir, ONNX_FILENAME)
+    with torch.no_grad():
+        torch.onnx.export(_Hidden(auto_model), tuple(sample[n] for n in names), fp32_path,
+                          input_names=names, output_names=['last_hidden_state'],
+                          dynamic_axes=dynamic, opset_version=opset)
+    quantize_dynamic(fp32_path, os.path.join(out_dir, ONNX_INT8_FILENAME), weight_type=QuantType.QInt8)
+    tokenizer.backend_tokenizer.save(os.path.join(out_dir, TOKENIZER_FILENAME))
+
+    config = {
+        'model_name': model_name,
+        'max_seq_length': int(model.max_seq_length),
+        'pooling': 'cls' if pooling is not None and pooling.get_pooling_mode_str() == 'cls' else 'mean',
+        'normalize': any(type(m).__name__ == 'Normalize' for m in model),
+        'dimension': int(model.get_sentence_embedding_dimension()),
+        'pad_token': tokenizer.pad_token,
+        'pad_token_id': int(tokenizer.pad_token_id),
+        'opset': opset,
+    }
+    with open(os.path.join(out_dir, CONFIG_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+    return config
+
+
+def _sample_texts(n: int) -> List[str]:
+    from benchmarks.synthetic import load_base_jobs, synthetic_resumes
+
+    base_jobs = load_base_jobs()
+    jobs = [j.get('combined_text', '') for j in base_jobs[:n]]
+    return synthetic_resumes(base_jobs, n) + [t for t in jobs if t.strip()]
+
+
+def verify(model_name: str, model_dir: str, n: int = 100, quantized: bool = True) -> Dict:
+    """Cosine agreement and per-text latency of the ONNX encoder vs sentence-transformers."""
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+
+    texts = _sample_texts(n)
+    reference_model = SentenceTransformer(model_name, device='cpu')
+    onnx_model = OnnxEncoder(model_dir, quantized=quantized)
+
+    def timed(model):
+        start = time.perf_counter()
+        embeddings = np.asarray(model.encode(texts, batch_size=32, show_progress_bar=False), dtype=np.float32)
+        return embeddings, (time.perf_counter() - start) / len(texts) * 1000.0
+
+    expected, reference_ms = timed(reference_model)
+    actual, onnx_ms = timed(onnx_model)
+    expected /= np.clip(np.linalg.norm(expected, axis=1, keepdims=True), 1e-12, None)
+    actual /= np.clip(np.linalg.norm(actual, axis=1, keepdims=True), 1e-12, None)
+    cosine = (expected * actual).sum(axis=1)
+    # Retrieval view: do the two backends rank the sample texts alike for each resume?
+    queries = min(n, len(texts))
+    top_ref = np.argsort(-(expected[:queries] @ expected.T), axis=1)[:, :10]
+    top_onnx = np.argsort(-(actual[:queries] @ actual.T), axis=1)[:, :10]
+    overlap = np.mean([len(set(a) & set(b)) / 10.0 for a, b in zip(top_ref, top_onnx)])
+    return {
+        'model_name': model_name,
+        'backend': onnx_model.encoder_backend,
+        'texts': len(texts),
+        'cosine_mean': round(float(cosine.mean()), 4),
+        'cosine_min': round(float(cosine.min()), 4),
+        'top10_overlap': round(float(overlap), 3),
+        'sentence_transformers_ms_per_text': round(reference_ms, 3),
+        'onnx_ms_per_text': round(onnx_ms, 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    from config import ONNX_MODEL_DIR
+
+    parser = argparse.ArgumentParser(description="Export / verify the ONNX int8 sentence encoder")
+    sub = parser.add_subparsers(dest='command', required=True)
+    export_parser = sub.add_parser('export', help="export and quantize the model")
+    verify_parser = sub.add_parser('verify', help="compare with sentence-transformers on sample texts")
+    for p in (export_parser, verify_parser):
+        p.add_argument('--model', default=DEFAULT_MODEL_NAME)
+        p.add_argument('--model-dir', default=ONNX_MODEL_DIR, help="export directory (default per model)")
+    export_parser.add_argument('--opset', type=int, default=14)
+    verify_parser.add_argument('--texts', type=int, default=100, help="sample resumes (plus as many job texts)")
+    verify_parser.add_argument('--fp32', action='store_true', help="check the unquantized export instead")
+    verify_parser.add_argument('--min-cosine', type=float, default=0.98, help="required mean cosine agreement")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    model_dir = args.model_dir or default_model_dir(args.model)
+    if args.command == 'export':
+        print(json.dumps(export(args.model, model_dir, args.opset), indent=2))
+        return 0
+    result = verify(args.model, model_dir, args.texts, quantized=not args.fp32)
+    result['passed'] = result['cosine_mean'] >= args.min_cosine
+    print(json.dumps(result, indent=2))
+    return 0 if result['passed'] else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Adaptive candidate pool size for recommendation retrieval.
+
+Each retriever returns ``pool`` candidates; fusion then drops jobs outside the resume's
+experience levels and formatting drops duplicates, so the pool needed to fill ``top_k``
+depends on the query. Pools are always ``top_k * factor`` doubled zero or more times, the
+first being the fixed pool retrieval always used. PoolSizer keeps an exponential moving
+average of the pool multiplier (pool needed / top_k) per query class and starts each query
+from the smallest doubling that covers it. A class's starting pool only ever grows, so
+once it has settled an identical query sees the same candidates, and the same results,
+every time. recommend_jobs widens the pool for another round only when too few results
+survived.
+"""
+import math
+import threading
+from typing import Dict, Hashable, Optional
+
+
+class PoolSizer:
+    """EMA of the observed pool multiplier per query class (e.g. experience level, location-filtered)."""
+
+    def __init__(self, factor: float = 3.0, max_pool: int = 1000, rounds: int = 3,
+                 alpha: float = 0.2, headroom: float = 1.25):
+        self.factor = factor
+        self.max_pool = max(1, int(max_pool))
+        self.rounds = max(1, int(rounds))
+        self.alpha = alpha
+        self.headroom = headroom
+        self._multipliers: Dict[Hashable, float] = {}
+        self._doublings: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def initial(self, key: Hashable, top_k: int, limit: Optional[int] = None) -> int:
+        """Pool for the first round: top_k * factor, doubled as often as the class has needed so far."""
+        return self._clamp(top_k * self.factor * 2 ** self._doublings.get(key, 0), top_k, limit)
+
+    def widen(self, pool: int, top_k: int, found: int, limit: Optional[int] = None) -> int:
+        """Next pool after a round that produced only ``found`` < top_k results: at least double."""
+        extrapolated = pool * top_k / max(found, 1) * self.headroom
+        return self._clamp(top_k * self.factor * 2 ** self._doublings_for(max(pool * 2, extrapolated) / top_k, top_k),
+                           top_k, limit)
+
+    def observe(self, key: Hashable, top_k: int, pool: int, found: int, used_fraction: float) -> None:
+        """Record a finished query: ``used_fraction`` of the fused candidates was consumed to fill ``found``."""
+        if top_k <= 0:
+            return
+        if found >= top_k:
+            needed = pool * max(used_fraction, 1.0 / max(pool, 1))
+        else:
+            needed = pool * top_k / max(found, 1)
+        multiplier = min(needed, self.max_pool) / top_k
+        with self._lock:
+            previous = self._multipliers.get(key)
+            average = multiplier if previous is None else (1 - self.alpha) * previous + self.alpha * multiplier
+            self._multipliers[key] = average
+            # Widen only: a class that needed fewer candidates keeps its pool (never below top_k * factor).
+            self._doublings[key] = max(self._doublings.get(key, 0),
+                                       self._doublings_for(average * self.headroom, top_k))
+
+    def _doublings_for(self, multiplier: float, top_k: int) -> int:
+        """Fewest doublings of ``factor`` reaching ``multiplier`` (stopping once the pool reaches max_pool)."""
+        doublings = 0
+        while self.factor * 2 ** doublings < multiplier and top_k * self.factor * 2 ** doublings < self.max_pool:
+            doublings += 1
+        return doublings
+
+    def _clamp(self, pool: float, top_k: int, limit: Optional[int]) -> int:
+        upper = self.max_pool if limit is None else min(self.max_pool, limit)
+        return max(1, min(max(int(math.ceil(pool)), top_k), upper))
+
+    def stats(self) -> Dict:
+        return {str(k): {'multiplier': round(v, 3), 'start_factor': self.factor * 2 ** self._doublings.get(k, 0)}
+                for k, v in self._multipliers.items()}
@@ -1,7 +1,10 @@
 """Job text preprocessing and skill extraction."""
 import re
 import logging
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List
+
+from utils.skill_matcher import SkillMatcher
+from .formatters import determine_job_experience_level, normalize_title
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +21,53 @@ SKILL_PATTERNS = {
 }
 
 
-def preprocess_jobs(jobs_data: List[Dict]) -> List[Dict]:
-    """Clean job descriptions and create combined text."""
-    processed = []
+# Fields the recommender, formatters and routes read, with the aliases folded into each one.
+# Anything else in the source records (raw HTML, duplicate URL/company keys, ...) is dropped.
+JOB_FIELDS = (
+    ('id', ('id',)),
+    ('title', ('title',)),
+    ('companyName', ('companyName', 'company')),
+    ('location', ('location',)),
+    ('skills', ('skills',)),
+    ('experienceLevel', ('experienceLevel', 'experience_level')),
+    ('contractType', ('contractType',)),
+    ('workType', ('workType',)),
+    ('sector', ('sector',)),
+    ('applyUrl', ('applyUrl', 'apply_url')),
+    ('jobUrl', ('jobUrl', 'job_url')),
+    ('postedTime', ('postedTime', 'posted_time')),
+    ('applicationsCount', ('applicationsCount',)),
+    ('companyUrl', ('companyUrl',)),
+    ('publishedAt', ('publishedAt',)),
+    ('salary', ('salary',)),
+    ('source', ('source',)),
+)
+
+
+def project_job(job: Dict) -> Dict:
+    """Keep only JOB_FIELDS (under their canonical names); absent fields stay absent."""
+    projected = {}
+    for name, aliases in JOB_FIELDS:
+        for alias in aliases:
+            value = job.get(alias)
+            if value:
+                projected[name] = value
+                break
+        else:
+            for alias in aliases:
+                if alias in job:
+                    projected[name] = job[alias]
+                    break
+    return projected
+
+
+def preprocess_jobs(jobs_data: Iterable[Dict]) -> List[Dict]:
+    """Clean job descriptions, create combined text and precompute experience level and title keys."""
+    return list(iter_preprocessed(jobs_data))
+
+
+def iter_preprocessed(jobs_data: Iterable[Dict]) -> Iterator[Dict]:
+    """Streaming preprocess_jobs: one projected, cleaned record per input job."""
     for job in jobs_data:
         try:
             desc = job.get('description', '') or job.get('descriptionHtml', '')
@@ -32,28 +79,27 @@ def preprocess_jobs(jobs_data: List[Dict]) -> List[Dict]:
             extracted = extract_skills_from_description(desc)
             final_skills = list(set(existing_skills + extracted)) if existing_skills else extracted
 
-            processed.append({
-                **job,
+            processed_job = project_job(job)
+            processed_job.update({
                 'description': desc,
                 'skills': final_skills,
-                'combined_text': create_combined_text(job, desc)
             })
+            # Built from the projected record, so JobStore can rebuild it on demand instead of storing it.
+            processed_job['combined_text'] = create_combined_text(processed_job, desc)
+            # Pure functions of the job record, so they are computed once here rather than per request.
+            processed_job['job_level'] = determine_job_experience_level(processed_job)
+            processed_job['title_normalized'], processed_job['title_core'] = normalize_title(job.get('title', ''))
+            yield processed_job
         except Exception as e:
             logger.warning(f"Error processing job {job.get('id')}: {e}")
-    return processed
+
+
+SKILL_MATCHER = SkillMatcher({skill: [skill.lower()] for skill in sorted(SKILL_PATTERNS)})
 
 
 def extract_skills_from_description(description: str) -> List[str]:
-    """Extract technical skills from job description."""
-    if not description:
-        return []
-    found = []
-    desc_lower = description.lower()
-    for skill in SKILL_PATTERNS:
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, desc_lower):
-            found.append(skill)
-    return found
+    """Extract technical skills from job description (single pass over SKILL_PATTERNS)."""
+    return SKILL_MATCHER.find(description)
 
 
 def create_combined_text(job: Dict, description: str) -> str:
@@ -29,9 +29,9 @@ def analyze_resume(resume_text: str) -> Dict:
 
 
 def extract_skills_from_description(text: str) -> List[str]:
-    """Extract skills from resume text."""
-    from .preprocessing import extract_skills_from_description as _extract
-    return _extract(text)
+    """Extract skills from resume text with the job preprocessing skill matcher."""
+    from .preprocessing import SKILL_MATCHER
+    return SKILL_MATCHER.find(text)
 
 
 def extract_experience_years(resume_text: str) -> int:
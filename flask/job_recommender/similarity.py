@@ -5,15 +5,21 @@ from typing import List, Tuple, Dict
 logger = logging.getLogger(__name__)
 
 
-def calculate_tfidf_similarity(tfidf_vectorizer, tfidf_matrix, resume_text: str, top_k: int = 50) -> List[Tuple[int, float]]:
-    """Calculate TF-IDF similarity scores."""
+def calculate_tfidf_similarity(tfidf_vectorizer, tfidf_matrix, resume_text: str, top_k: int = 50,
+                               resume_vector=None, rows=None) -> List[Tuple[int, float]]:
+    """Calculate TF-IDF similarity scores (over ``rows`` only, when given)."""
     if tfidf_vectorizer is None or tfidf_matrix is None:
         return []
     try:
         from sklearn.metrics.pairwise import cosine_similarity
         import numpy as np
-        
-        resume_vector = tfidf_vectorizer.transform([resume_text])
+
+        if resume_vector is None:
+            resume_vector = tfidf_vectorizer.transform([resume_text])
+        if rows is not None:
+            similarities = cosine_similarity(resume_vector, tfidf_matrix[rows]).flatten()
+            top_indices = np.argsort(similarities)[::-1][:top_k]
+            return [(int(rows[idx]), float(similarities[idx])) for idx in top_indices]
         similarities = cosine_similarity(resume_vector, tfidf_matrix).flatten()
         top_indices = np.argsort(similarities)[::-1][:top_k]
         return [(int(idx), float(similarities[idx])) for idx in top_indices]
@@ -22,15 +28,32 @@ def calculate_tfidf_similarity(tfidf_vectorizer, tfidf_matrix, resume_text: str,
         return []
 
 
-def calculate_embedding_similarity(sentence_model, job_embeddings, resume_text: str, top_k: int = 50) -> List[Tuple[int, float]]:
-    """Calculate embedding-based similarity."""
+def calculate_embedding_similarity(
+    sentence_model,
+    job_embeddings,
+    resume_text: str,
+    top_k: int = 50,
+    vector_index=None,
+    resume_embedding=None,
+    rows=None,
+) -> List[Tuple[int, float]]:
+    """Calculate embedding-based similarity (through the vector index when one is given, over ``rows`` if given)."""
     if sentence_model is None or job_embeddings is None:
         return []
     try:
         from sklearn.metrics.pairwise import cosine_similarity
         import numpy as np
-        
-        resume_embedding = sentence_model.encode([resume_text])
+        from .vector_index import search_rows
+
+        if resume_embedding is None:
+            resume_embedding = sentence_model.encode([resume_text])
+        if rows is not None:
+            scores, ids = search_rows(vector_index, job_embeddings, resume_embedding, top_k, rows=rows)
+            return [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0]
+        if vector_index is not None:
+            scores, ids = vector_index.search(resume_embedding, top_k)
+            return [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0]
+
         similarities = cosine_similarity(resume_embedding, job_embeddings).flatten()
         top_indices = np.argsort(similarities)[::-1][:top_k]
         return [(int(idx), float(similarities[idx])) for idx in top_indices]
@@ -39,6 +62,64 @@ def calculate_embedding_similarity(sentence_model, job_embeddings, resume_text:
         return []
 
 
+def calculate_tfidf_similarity_batch(
+    tfidf_vectorizer,
+    tfidf_matrix,
+    resume_texts: List[str],
+    top_k: int = 50,
+    resume_vectors=None,
+    rows=None,
+) -> List[List[Tuple[int, float]]]:
+    """TF-IDF similarity for many resumes with one sparse M x N product (rows are L2-normalized)."""
+    if tfidf_vectorizer is None or tfidf_matrix is None:
+        return [[] for _ in resume_texts]
+    try:
+        import numpy as np
+        from .vector_index import select_top_k
+
+        if resume_vectors is None:
+            resume_vectors = tfidf_vectorizer.transform(resume_texts)
+        job_ids = np.arange(tfidf_matrix.shape[0]) if rows is None else np.asarray(rows, dtype=np.int64)
+        matrix = tfidf_matrix if rows is None else tfidf_matrix[rows]
+        sims = (resume_vectors @ matrix.T).toarray()
+        results = []
+        for row in sims:
+            top = select_top_k(row, top_k)
+            results.append([(int(job_ids[idx]), float(row[idx])) for idx in top])
+        return results
+    except Exception as e:
+        logger.error(f"Batch TF-IDF similarity error: {e}")
+        return [[] for _ in resume_texts]
+
+
+def calculate_embedding_similarity_batch(
+    sentence_model,
+    job_embeddings,
+    resume_texts: List[str],
+    top_k: int = 50,
+    vector_index=None,
+    batch_size: int = 32,
+    resume_embeddings=None,
+    rows=None,
+) -> List[List[Tuple[int, float]]]:
+    """Embedding similarity for many resumes: one batched encode, one M x N search (over ``rows`` if given)."""
+    if sentence_model is None or job_embeddings is None:
+        return [[] for _ in resume_texts]
+    try:
+        from .vector_index import search_rows
+
+        if resume_embeddings is None:
+            resume_embeddings = sentence_model.encode(resume_texts, batch_size=batch_size, show_progress_bar=False)
+        scores, ids = search_rows(vector_index, job_embeddings, resume_embeddings, top_k, rows=rows)
+        return [
+            [(int(i), float(s)) for i, s in zip(row_ids, row_scores) if i >= 0]
+            for row_ids, row_scores in zip(ids, scores)
+        ]
+    except Exception as e:
+        logger.error(f"Batch embedding similarity error: {e}")
+        return [[] for _ in resume_texts]
+
+
 def calculate_skill_match_score(resume_skills: List[str], job_skills: List[str]) -> float:
     """Calculate Jaccard similarity for skills."""
     if not resume_skills or not job_skills:
@@ -50,6 +131,15 @@ def calculate_skill_match_score(resume_skills: List[str], job_skills: List[str])
     return len(common) / len(union) if union else 0.0
 
 
+LEVEL_MAP = {
+    'fresher': ['fresher', 'internship'],
+    'junior': ['fresher', 'junior', 'mid'],
+    'mid': ['junior', 'mid', 'senior'],
+    'senior': ['mid', 'senior'],
+}
+DEFAULT_ALLOWED_LEVELS = ['fresher', 'junior', 'mid', 'senior']
+
+
 def combine_similarity_scores(
     jobs_data: List[Dict],
     tfidf_scores: List[Tuple[int, float]],
@@ -59,64 +149,84 @@ def combine_similarity_scores(
     resume_experience_level: str = None,
     resume_job_titles: List[str] = None,
     determine_job_level_fn=None,
+    features=None,
 ) -> List[Tuple[int, float]]:
-    """Combine TF-IDF, embedding, and skill scores with filtering."""
-    from .formatters import determine_job_experience_level
-    fn = determine_job_level_fn or determine_job_experience_level
-
-    tfidf_dict = {idx: s for idx, s in tfidf_scores}
-    embedding_dict = {idx: s for idx, s in embedding_scores}
-    all_indices = set(tfidf_dict.keys()) | set(embedding_dict.keys())
-
-    combined = []
-    for idx in all_indices:
-        if idx >= len(jobs_data):
-            continue
-        job = jobs_data[idx]
-
-        if location_filter and location_filter.strip():
-            kw = location_filter.lower().split()
-            loc = job.get('location', '').lower()
-            if not any(k in loc for k in kw):
-                continue
-
-        if resume_experience_level:
-            job_level = fn(job)
-            level_map = {
-                'fresher': ['fresher', 'internship'],
-                'junior': ['fresher', 'junior', 'mid'],
-                'mid': ['junior', 'mid', 'senior'],
-                'senior': ['mid', 'senior'],
-            }
-            allowed = level_map.get(resume_experience_level, ['fresher', 'junior', 'mid', 'senior'])
-            if job_level not in allowed:
-                continue
-
-        tfidf_s = tfidf_dict.get(idx, 0.0)
-        emb_s = embedding_dict.get(idx, 0.0)
-        skill_s = calculate_skill_match_score(resume_skills, job.get('skills', []))
-        score = 0.20 * tfidf_s + 0.50 * emb_s + 0.30 * skill_s
-
-        if skill_s > 0.5:
-            score *= 1.2
-        if resume_job_titles:
-            jt = job.get('title', '').lower()
-            for t in resume_job_titles:
-                if t.lower() in jt or jt in t.lower():
-                    score *= 1.15
-                    break
-
-        combined.append((idx, score))
-
-    combined.sort(key=lambda x: x[1], reverse=True)
-
-    linkedin = [(i, s) for i, s in combined if jobs_data[i].get('source', 'LinkedIn') != 'Naukri']
-    naukri = [(i, s) for i, s in combined if jobs_data[i].get('source') == 'Naukri']
-    mixed = []
-    for i in range(max(len(linkedin), len(naukri))):
-        if i < len(linkedin):
-            mixed.append(linkedin[i])
-        if i < len(naukri):
-            mixed.append(naukri[i])
-
-    return mixed
+    """Combine TF-IDF, embedding, and skill scores with filtering.
+
+    All candidates are scored at once from the precomputed columnar ``features``
+    (built on the fly when not given); rankings match the per-candidate loop.
+    """
+    import numpy as np
+    from .features import build_job_features
+
+    if features is None or determine_job_level_fn is not None:
+        features = build_job_features(jobs_data, determine_job_level_fn)
+    n_jobs = min(len(jobs_data), len(features))
+
+    # Candidate order follows the union set so ties keep their previous order under the stable sort.
+    all_indices = {idx for idx, _ in tfidf_scores} | {idx for idx, _ in embedding_scores}
+    cand = np.fromiter(all_indices, dtype=np.int64, count=len(all_indices))
+    cand = cand[(cand >= 0) & (cand < n_jobs)]
+
+    if location_filter and location_filter.strip():
+        kw = location_filter.lower().split()
+        loc_ids = features.location_ids[cand]
+        unique_ids = np.unique(loc_ids)
+        ok = np.fromiter(
+            (any(k in features.locations[u] for k in kw) for u in unique_ids),
+            dtype=bool, count=len(unique_ids),
+        )
+        cand = cand[ok[np.searchsorted(unique_ids, loc_ids)]]
+
+    if resume_experience_level:
+        allowed = LEVEL_MAP.get(resume_experience_level, DEFAULT_ALLOWED_LEVELS)
+        allowed_codes = [c for c in (features.level_code(lvl) for lvl in allowed) if c >= 0]
+        cand = cand[np.isin(features.level_codes[cand], allowed_codes)]
+
+    tfidf_s = _scatter_scores(tfidf_scores, n_jobs)[cand]
+    emb_s = _scatter_scores(embedding_scores, n_jobs)[cand]
+
+    skill_s = np.zeros(len(cand), dtype=np.float64)
+    if resume_skills and len(cand):
+        r_vec, r_count = features.resume_skill_vector(resume_skills)
+        job_counts = features.skill_counts[cand]
+        common = features.skill_matrix[cand] @ r_vec if r_vec.size else np.zeros(len(cand), dtype=np.int64)
+        union = r_count + job_counts - common
+        has = job_counts > 0
+        skill_s[has] = common[has].astype(np.float64) / union[has]
+
+    score = 0.20 * tfidf_s + 0.50 * emb_s + 0.30 * skill_s
+    score = np.where(skill_s > 0.5, score * 1.2, score)
+
+    if resume_job_titles and len(cand):
+        jt = np.asarray(features.titles[cand], dtype=str)
+        hit = np.zeros(len(cand), dtype=bool)
+        for t in resume_job_titles:
+            t = t.lower()
+            hit |= (np.char.find(jt, t) >= 0) | (np.char.find(t, jt) >= 0)
+        score = np.where(hit, score * 1.15, score)
+
+    order = np.argsort(-score, kind='stable')
+    cand, score = cand[order], score[order]
+
+    # Interleave LinkedIn and Naukri results: L0, N0, L1, N1, ... then the longer tail.
+    naukri = features.is_naukri[cand]
+    rank_in_group = np.empty(len(cand), dtype=np.int64)
+    rank_in_group[~naukri] = np.arange(int((~naukri).sum()))
+    rank_in_group[naukri] = np.arange(int(naukri.sum()))
+    mixed = np.argsort(2 * rank_in_group + naukri, kind='stable')
+
+    return list(zip(cand[mixed].tolist(), score[mixed].tolist()))
+
+
+def _scatter_scores(scores: List[Tuple[int, float]], n_jobs: int):
+    """Dense per-job score array from (idx, score) pairs; later pairs win like a dict would."""
+    import numpy as np
+
+    dense = np.zeros(n_jobs, dtype=np.float64)
+    if scores:
+        idx = np.fromiter((i for i, _ in scores), dtype=np.int64, count=len(scores))
+        val = np.fromiter((s for _, s in scores), dtype=np.float64, count=len(scores))
+        keep = (idx >= 0) & (idx < n_jobs)
+        dense[idx[keep]] = val[keep]
+    return dense
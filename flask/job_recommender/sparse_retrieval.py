@@ -0,0 +1,182 @@
+"""Inverted-index sparse retrieval over the TF-IDF vocabulary (TF-IDF or BM25 scoring).
+
+Postings are a term-major CSR matrix (vocabulary x jobs) of per-term document
+weights. A query only reads the posting rows of its own terms, so jobs that
+share no term with the resume are never touched, and top-k selection uses
+``np.argpartition`` over the matched jobs only.
+
+Engines (SPARSE_RETRIEVAL_ENGINE):
+    sweep   legacy dense cosine over the whole TF-IDF matrix (similarity.calculate_tfidf_similarity)
+    tfidf   inverted index with the L2-normalized TF-IDF weights (same scores as cosine)
+    bm25    inverted index with Okapi BM25 weights, scaled to [0, 1] per query
+"""
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .vector_index import select_top_k
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ('sweep', 'tfidf', 'bm25')
+
+
+def _count_vectorizer_for(tfidf_vectorizer):
+    """CountVectorizer sharing the TF-IDF analyzer and vocabulary (raw term counts for BM25)."""
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    allowed = CountVectorizer().get_params().keys()
+    params = {k: v for k, v in tfidf_vectorizer.get_params().items() if k in allowed}
+    params['vocabulary'] = tfidf_vectorizer.vocabulary_
+    return CountVectorizer(**params)
+
+
+class SparseRetriever:
+    """Term-postings index: ``postings[t]`` lists (job, weight) for every job containing term t."""
+
+    def __init__(self, engine: str, tfidf_vectorizer, postings, params: Dict = None,
+                 count_vectorizer=None, idf=None):
+        self.engine = engine
+        self.tfidf_vectorizer = tfidf_vectorizer
+        self.postings = postings
+        self.params = params or {}
+        self.count_vectorizer = count_vectorizer
+        self.idf = idf
+
+    @property
+    def n_jobs(self) -> int:
+        return int(self.postings.shape[1])
+
+    @classmethod
+    def from_tfidf(cls, tfidf_vectorizer, tfidf_matrix) -> 'SparseRetriever':
+        """TF-IDF rows are L2-normalized, so the posting weights are the matrix values themselves."""
+        return cls('tfidf', tfidf_vectorizer, tfidf_matrix.T.tocsr())
+
+    @classmethod
+    def from_bm25(cls, tfidf_vectorizer, job_texts: List[str], k1: float = 1.5, b: float = 0.75) -> 'SparseRetriever':
+        import numpy as np
+
+        count_vectorizer = _count_vectorizer_for(tfidf_vectorizer)
+        counts = count_vectorizer.transform(job_texts).tocsr().astype(np.float32)
+        n_docs = counts.shape[0]
+        doc_len = np.asarray(counts.sum(axis=1)).ravel()
+        avgdl = float(doc_len.mean()) if n_docs and doc_len.mean() > 0 else 1.0
+        df = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        # w(t, d) = idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * |d| / avgdl))
+        row_norm = np.repeat(k1 * (1.0 - b + b * doc_len / avgdl), np.diff(counts.indptr)).astype(np.float32)
+        tf = counts.data
+        counts.data = idf[counts.indices] * tf * (k1 + 1.0) / (tf + row_norm)
+        return cls('bm25', tfidf_vectorizer, counts.T.tocsr(), params={'k1': k1, 'b': b},
+                   count_vectorizer=count_vectorizer, idf=idf)
+
+    def query_vectors(self, texts: List[str]):
+        """TF-IDF query vectors; both engines search from these (BM25 only uses their term pattern)."""
+        return self.tfidf_vectorizer.transform(texts)
+
+    def _query_matrix(self, query_vectors):
+        import numpy as np
+
+        q = query_vectors.tocsr()
+        if self.engine == 'bm25':
+            q = q.astype(np.float32)
+            q.data[:] = 1.0
+            # Upper bound of a job's score for this query: every term at saturation, i.e. idf * (k1 + 1).
+            bound = q @ (self.idf * (self.params['k1'] + 1.0))
+            bound[bound == 0] = 1.0
+            return q.multiply(1.0 / bound.reshape(-1, 1)).tocsr()
+        return q
+
+    def search(self, texts: List[str], k: int, rows=None) -> List[Tuple]:
+        """Top-k (ids, scores) per query text, touching only postings of the query's terms."""
+        return self.search_vectors(self.query_vectors(texts), k, rows=rows)
+
+    def search_vectors(self, query_vectors, k: int, rows=None) -> List[Tuple]:
+        """search() for precomputed TF-IDF query vectors (one row per query); ``rows`` restricts the jobs."""
+        import numpy as np
+
+        scores = (self._query_matrix(query_vectors) @ self.postings).tocsr()
+        allowed = None
+        if rows is not None:
+            allowed = np.zeros(self.n_jobs, dtype=bool)
+            allowed[rows] = True
+        results = []
+        for i in range(scores.shape[0]):
+            start, end = scores.indptr[i], scores.indptr[i + 1]
+            job_ids, values = scores.indices[start:end], scores.data[start:end]
+            if allowed is not None:
+                keep = allowed[job_ids]
+                job_ids, values = job_ids[keep], values[keep]
+            top = select_top_k(values, k)
+            results.append((job_ids[top], values[top]))
+        return results
+
+    def save(self, directory: str) -> None:
+        import numpy as np
+        from . import store
+
+        store.save_csr(directory, f'postings_{self.engine}', self.postings)
+        if self.idf is not None:
+            np.save(os.path.join(directory, f'postings_{self.engine}_idf.npy'), self.idf)
+
+    @classmethod
+    def load(cls, directory: str, engine: str, tfidf_vectorizer, n_jobs: int, params: Dict = None) -> 'SparseRetriever':
+        import numpy as np
+        from . import store
+
+        shape = (len(tfidf_vectorizer.vocabulary_), n_jobs)
+        postings = store.load_csr(directory, f'postings_{engine}', shape)
+        if engine == 'bm25':
+            idf = np.load(os.path.join(directory, f'postings_{engine}_idf.npy'), mmap_mode='r')
+            return cls(engine, tfidf_vectorizer, postings, params=params,
+                       count_vectorizer=_count_vectorizer_for(tfidf_vectorizer), idf=idf)
+        return cls(engine, tfidf_vectorizer, postings, params=params)
+
+
+def build_retriever(engine: str, tfidf_vectorizer, tfidf_matrix, job_texts: List[str],
+                    params: Dict = None) -> Optional[SparseRetriever]:
+    """Build the configured engine; 'sweep' returns None (use calculate_tfidf_similarity)."""
+    params = params or {}
+    if engine not in ENGINES:
+        logger.warning(f"Unknown sparse retrieval engine {engine!r}, using tfidf")
+        engine = 'tfidf'
+    if engine == 'sweep' or tfidf_vectorizer is None or tfidf_matrix is None:
+        return None
+    if engine == 'bm25':
+        return SparseRetriever.from_bm25(tfidf_vectorizer, job_texts,
+                                         k1=params.get('k1', 1.5), b=params.get('b', 0.75))
+    return SparseRetriever.from_tfidf(tfidf_vectorizer, tfidf_matrix)
+
+
+def calculate_sparse_similarity(retriever: SparseRetriever, resume_text: str, top_k: int = 50,
+                                resume_vector=None, rows=None) -> List[Tuple[int, float]]:
+    """Drop-in replacement for calculate_tfidf_similarity backed by the inverted index."""
+    if retriever is None:
+        return []
+    try:
+        if resume_vector is None:
+            resume_vector = retriever.query_vectors([resume_text])
+        ids, scores = retriever.search_vectors(resume_vector, top_k, rows=rows)[0]
+        return [(int(i), float(s)) for i, s in zip(ids, scores)]
+    except Exception as e:
+        logger.error(f"Sparse retrieval error: {e}")
+        return []
+
+
+def calculate_sparse_similarity_batch(retriever: SparseRetriever, resume_texts: List[str],
+                                      top_k: int = 50, resume_vectors=None,
+                                      rows=None) -> List[List[Tuple[int, float]]]:
+    """Batched calculate_sparse_similarity: one sparse query-matrix x postings product."""
+    if retriever is None:
+        return [[] for _ in resume_texts]
+    try:
+        if resume_vectors is None:
+            resume_vectors = retriever.query_vectors(resume_texts)
+        return [
+            [(int(i), float(s)) for i, s in zip(ids, scores)]
+            for ids, scores in retriever.search_vectors(resume_vectors, top_k, rows=rows)
+        ]
+    except Exception as e:
+        logger.error(f"Batch sparse retrieval error: {e}")
+        return [[] for _ in resume_texts]
@@ -0,0 +1,144 @@
+"""Aggregate job statistics for /jobs-stats, computed once per corpus.
+
+Counts per dimension (company, location, sector, experience level) are built from the
+JobStore's category codes with one bincount per dimension, overall and per source.
+Rankings are sorted once on first use and responses are memoized, so repeated requests
+cost a dict lookup. Ingestion derives the next JobStats by applying its removed and added
+jobs to the counts instead of recounting the corpus.
+"""
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Response key -> JobStore field
+DIMENSIONS = {
+    'companies': 'companyName',
+    'locations': 'location',
+    'sectors': 'sector',
+    'experience_levels': 'experienceLevel',
+}
+MISSING = 'Unknown'
+ALL_SOURCES = None
+_MEMO_SIZE = 64
+
+
+class JobStats:
+    """Immutable counts for one corpus: ``counts[source][dimension] = {value: n}`` (source None = all)."""
+
+    def __init__(self, counts: Dict, totals: Dict, built_at: str, build_seconds: float):
+        self.counts = counts
+        self.totals = totals
+        self.built_at = built_at
+        self.build_seconds = build_seconds
+        self._rankings: Dict[Tuple, List[Tuple]] = {}
+        self._memo: Dict[Tuple, Dict] = {}
+
+    @classmethod
+    def build(cls, jobs, built_at: Optional[str] = None) -> 'JobStats':
+        """Count every dimension over a JobStore, overall and per source."""
+        import numpy as np
+
+        start = time.perf_counter()
+        source_codes, sources = jobs.category_codes('source', missing=MISSING)
+        sources = [MISSING if s is None else s for s in sources]
+        n_sources = len(sources)
+        counts = {ALL_SOURCES: {}}
+        for source in sources:
+            counts.setdefault(source, {})
+        totals = {ALL_SOURCES: len(jobs)}
+        per_source = np.bincount(source_codes, minlength=n_sources) if len(jobs) else np.zeros(n_sources, int)
+        for source, n in zip(sources, per_source):
+            totals[source] = totals.get(source, 0) + int(n)
+
+        for dimension, field in DIMENSIONS.items():
+            codes, values = jobs.category_codes(field, missing=MISSING)
+            n_values = len(values)
+            # One joint histogram over (source, value) gives the per-source and overall counts.
+            joint = np.bincount(source_codes.astype(np.int64) * n_values + codes,
+                                minlength=n_sources * n_values).reshape(n_sources, n_values) \
+                if len(jobs) and n_values else np.zeros((n_sources, n_values), dtype=np.int64)
+            for source_key, row in [(ALL_SOURCES, joint.sum(axis=0))] + list(zip(sources, joint)):
+                bucket = counts[source_key].setdefault(dimension, {})
+                for code in np.flatnonzero(row):
+                    value = values[code]
+                    bucket[value] = bucket.get(value, 0) + int(row[code])
+
+        for source_key in counts:
+            for dimension in DIMENSIONS:
+                counts[source_key].setdefault(dimension, {})
+        return cls(counts, totals, built_at or datetime.now().isoformat(),
+                   round(time.perf_counter() - start, 4))
+
+    def updated(self, removed: Iterable[Mapping], added: Iterable[Mapping],
+                built_at: Optional[str] = None) -> 'JobStats':
+        """Stats after removing and adding the given jobs (copy-on-write; self is unchanged)."""
+        start = time.perf_counter()
+        counts = {source: {dim: dict(values) for dim, values in dims.items()} for source, dims in self.counts.items()}
+        totals = dict(self.totals)
+        for jobs, delta in ((removed, -1), (added, 1)):
+            for job in jobs:
+                source = job.get('source')
+                if source is None:
+                    source = MISSING
+                for source_key in (ALL_SOURCES, source):
+                    dims = counts.setdefault(source_key, {dim: {} for dim in DIMENSIONS})
+                    totals[source_key] = totals.get(source_key, 0) + delta
+                    for dimension, field in DIMENSIONS.items():
+                        bucket = dims[dimension]
+                        value = job.get(field, MISSING)
+                        bucket[value] = bucket.get(value, 0) + delta
+                        if bucket[value] <= 0:
+                            del bucket[value]
+        for source_key in [s for s, n in totals.items() if s is not ALL_SOURCES and n <= 0]:
+            totals.pop(source_key)
+            counts.pop(source_key, None)
+        return JobStats(counts, totals, built_at or datetime.now().isoformat(),
+                        round(time.perf_counter() - start, 4))
+
+    @property
+    def sources(self) -> Dict[str, int]:
+        return {source: n for source, n in self.totals.items() if source is not ALL_SOURCES}
+
+    def resolve_source(self, source: Optional[str]):
+        """Match a source name case-insensitively; None/'' means all sources. Raises KeyError if unknown."""
+        if not source:
+            return ALL_SOURCES
+        for known in self.sources:
+            if str(known).lower() == source.lower():
+                return known
+        raise KeyError(source)
+
+    def ranking(self, dimension: str, source=ALL_SOURCES) -> List[Tuple]:
+        """(value, count) pairs, most frequent first; ties keep first-seen order. Sorted once."""
+        key = (source, dimension)
+        ranked = self._rankings.get(key)
+        if ranked is None:
+            ranked = sorted(self.counts.get(source, {}).get(dimension, {}).items(), key=lambda x: x[1], reverse=True)
+            self._rankings[key] = ranked
+        return ranked
+
+    def top(self, dimension: str, n: Optional[int] = 10, source=ALL_SOURCES) -> List[Tuple]:
+        ranked = self.ranking(dimension, source)
+        return ranked if n is None else ranked[:n]
+
+    def snapshot(self, top_n: Optional[int] = 10, source=ALL_SOURCES) -> Dict:
+        """The /jobs-stats payload (memoized per top_n and source)."""
+        key = (top_n, source)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+        stats = {
+            'total_jobs': self.totals.get(source, 0),
+            'top_companies': self.top('companies', top_n, source),
+            'top_locations': self.top('locations', top_n, source),
+            'top_sectors': self.top('sectors', top_n, source),
+            'experience_levels': dict(self.counts.get(source, {}).get('experience_levels', {})),
+            'sources': self.sources,
+            'source_filter': source,
+            'last_updated': self.built_at,
+            'stats_build_seconds': self.build_seconds,
+        }
+        if len(self._memo) >= _MEMO_SIZE:
+            self._memo.pop(next(iter(self._memo)))
+        self._memo[key] = stats
+        return stats
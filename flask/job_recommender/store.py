@@ -0,0 +1,364 @@
+"""Versioned on-disk model store: memory-mapped embeddings + CSR TF-IDF components.
+
+Layout (next to the jobs data file):
+
+    model_store/
+        manifest.json          # commit point; names the active version directory
+        v-<hash>/
+            embeddings.npy     # L2-normalized float32/float16, opened with mmap_mode='r'
+            tfidf_data.npy     # CSR components of the TF-IDF matrix
+            tfidf_indices.npy
+            tfidf_indptr.npy
+            tfidf_vectorizer.pkl
+            seg-<rev>/         # rows appended by incremental ingestion (see ingest.py)
+            tombstones.npy     # store rows of removed or replaced jobs
+
+Arrays are opened read-only and memory-mapped, so every worker process shares the
+same pages through the OS page cache and startup only parses the .npy headers.
+Ingestion appends segments under the current version and bumps the manifest
+``revision``; a version with segments or tombstones is assembled in memory when
+opened, until the next refit compacts it into a fresh version.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STORE_DIRNAME = 'model_store'
+MANIFEST_NAME = 'manifest.json'
+FORMAT_VERSION = 1
+SUPPORTED_DTYPES = ('float32', 'float16')
+# Manifests written before encoder backends were recorded hold sentence-transformers embeddings
+DEFAULT_ENCODER_BACKEND = 'sentence-transformers'
+
+
+def get_store_dir(data_path: str) -> str:
+    """Return the model store directory that sits next to the jobs data file."""
+    return os.path.join(os.path.dirname(os.path.abspath(data_path)), STORE_DIRNAME)
+
+
+def compute_content_hash(jobs_data: List[Dict]) -> str:
+    """Hash job ids and combined texts; any change to the indexed corpus changes the hash."""
+    h = hashlib.sha256()
+    for job in jobs_data:
+        h.update(str(job.get('id', '')).encode('utf-8'))
+        h.update(b'\x00')
+        h.update(job.get('combined_text', '').encode('utf-8'))
+        h.update(b'\x01')
+    return h.hexdigest()
+
+
+def _sklearn_version() -> str:
+    import sklearn
+    return sklearn.__version__
+
+
+def read_manifest(store_dir: str) -> Optional[Dict]:
+    """Read the store manifest, or None if there is no usable store."""
+    path = os.path.join(store_dir, MANIFEST_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Unreadable model store manifest {path}: {e}")
+        return None
+
+
+def manifest_mismatch(manifest: Dict, model_name: str, jobs_count: int, content_hash: str,
+                      encoder_backend: str = DEFAULT_ENCODER_BACKEND) -> Optional[str]:
+    """Return a human-readable reason the manifest cannot be used, or None if it matches."""
+    if manifest.get('format_version') != FORMAT_VERSION:
+        return f"format version {manifest.get('format_version')} != {FORMAT_VERSION}"
+    if manifest.get('model_name') != model_name:
+        return f"model {manifest.get('model_name')} != {model_name}"
+    stored_backend = manifest.get('encoder_backend', DEFAULT_ENCODER_BACKEND)
+    if stored_backend != encoder_backend:
+        return f"encoder backend {stored_backend} != {encoder_backend}"
+    if manifest.get('job_count') != jobs_count:
+        return f"job count {manifest.get('job_count')} != {jobs_count}"
+    if manifest.get('content_hash') != content_hash:
+        return "content hash differs"
+    if manifest.get('sklearn_version') != _sklearn_version():
+        return f"sklearn {manifest.get('sklearn_version')} != {_sklearn_version()}"
+    return None
+
+
+def load_store(
+    store_dir: str,
+    model_name: str,
+    jobs_data: List[Dict],
+    encoder_backend: str = DEFAULT_ENCODER_BACKEND,
+) -> Optional[Tuple[Any, Any, Any, Dict]]:
+    """Open the store read-only. Returns (tfidf_vectorizer, tfidf_matrix, job_embeddings, manifest) or None."""
+    import numpy as np
+
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        return None
+
+    reason = manifest_mismatch(manifest, model_name, len(jobs_data), compute_content_hash(jobs_data),
+                               encoder_backend)
+    if reason:
+        logger.warning(f"Model store is stale ({reason}); rebuilding")
+        return None
+
+    try:
+        version_dir = get_version_dir(store_dir, manifest)
+        job_embeddings = np.load(os.path.join(version_dir, 'embeddings.npy'), mmap_mode='r')
+        tfidf_matrix = load_csr(version_dir, 'tfidf', tuple(manifest['tfidf_shape']))
+        with open(os.path.join(version_dir, 'tfidf_vectorizer.pkl'), 'rb') as f:
+            tfidf_vectorizer = pickle.load(f)
+        if manifest.get('segments') or manifest.get('tombstone_count'):
+            job_embeddings, tfidf_matrix = _assemble_segments(version_dir, manifest, job_embeddings, tfidf_matrix)
+    except Exception as e:
+        logger.warning(f"Failed to open model store: {e}")
+        return None
+
+    logger.info(
+        f"Opened model store {manifest['version']} "
+        f"({manifest['job_count']} jobs, {manifest['embedding_dtype']} embeddings, memory-mapped)"
+    )
+    return tfidf_vectorizer, tfidf_matrix, job_embeddings, manifest
+
+
+def save_store(
+    store_dir: str,
+    model_name: str,
+    jobs_data: List[Dict],
+    tfidf_vectorizer,
+    tfidf_matrix,
+    job_embeddings,
+    embedding_dtype: str = 'float32',
+    encoder_backend: str = DEFAULT_ENCODER_BACKEND,
+) -> Optional[Dict]:
+    """Write a new store version and atomically publish it by replacing the manifest."""
+    import numpy as np
+
+    if embedding_dtype not in SUPPORTED_DTYPES:
+        logger.warning(f"Unsupported embedding dtype {embedding_dtype!r}, using float32")
+        embedding_dtype = 'float32'
+
+    try:
+        os.makedirs(store_dir, exist_ok=True)
+        content_hash = compute_content_hash(jobs_data)
+        version = f"v-{content_hash[:16]}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=store_dir)
+
+        embeddings = normalize_rows(np.asarray(job_embeddings, dtype=np.float32))
+        np.save(os.path.join(tmp_dir, 'embeddings.npy'), embeddings.astype(embedding_dtype))
+
+        csr = save_csr(tmp_dir, 'tfidf', tfidf_matrix)
+
+        # stop_words_ holds every pruned term and is only kept for introspection.
+        if getattr(tfidf_vectorizer, 'stop_words_', None) is not None:
+            tfidf_vectorizer.stop_words_ = None
+        with open(os.path.join(tmp_dir, 'tfidf_vectorizer.pkl'), 'wb') as f:
+            pickle.dump(tfidf_vectorizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_dir, os.path.join(store_dir, version))
+
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'version': version,
+            'model_name': model_name,
+            'encoder_backend': encoder_backend,
+            'job_count': len(jobs_data),
+            'content_hash': content_hash,
+            'sklearn_version': _sklearn_version(),
+            'numpy_version': np.__version__,
+            'embedding_dtype': embedding_dtype,
+            'embedding_dim': int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+            'tfidf_shape': list(csr.shape),
+            'created_at': datetime.now().isoformat(),
+            'revision': 0,
+            'store_rows': len(jobs_data),
+            'fitted_rows': len(jobs_data),
+        }
+        write_manifest(store_dir, manifest)
+        _remove_old_versions(store_dir, keep=version)
+        logger.info(f"Model store {version} saved")
+        return manifest
+    except Exception as e:
+        logger.error(f"Failed to save model store: {e}")
+        return None
+
+
+def append_segment(
+    store_dir: str,
+    manifest: Dict,
+    jobs_data: List[Dict],
+    tfidf_rows,
+    embeddings,
+    tombstones: List[int],
+) -> Optional[Dict]:
+    """Append ingested rows and tombstones to the current version and publish a new revision.
+
+    ``jobs_data`` is the full live corpus after the change (it defines the new content hash);
+    ``tfidf_rows``/``embeddings`` hold only the appended rows, ``tombstones`` only the new store rows
+    to drop. Returns the new manifest, or None if the store could not be updated.
+    """
+    import numpy as np
+
+    try:
+        version_dir = get_version_dir(store_dir, manifest)
+        revision = int(manifest.get('revision', 0)) + 1
+        store_rows = int(manifest.get('store_rows', manifest['job_count']))
+        segments = list(manifest.get('segments') or [])
+
+        if embeddings is not None and len(embeddings):
+            name = f"seg-{revision:04d}"
+            tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=version_dir)
+            rows = normalize_rows(np.asarray(embeddings, dtype=np.float32))
+            np.save(os.path.join(tmp_dir, 'embeddings.npy'), rows.astype(manifest['embedding_dtype']))
+            csr = save_csr(tmp_dir, 'tfidf', tfidf_rows)
+            os.replace(tmp_dir, os.path.join(version_dir, name))
+            segments.append({'name': name, 'rows': int(csr.shape[0]), 'tfidf_shape': list(csr.shape)})
+            store_rows += int(csr.shape[0])
+
+        dead = load_tombstones(version_dir, manifest)
+        if tombstones:
+            dead = np.union1d(dead, np.asarray(tombstones, dtype=np.int64))
+            _save_array(os.path.join(version_dir, 'tombstones.npy'), dead)
+
+        updated = dict(manifest)
+        updated.update({
+            'revision': revision,
+            'segments': segments,
+            'store_rows': store_rows,
+            'tombstone_count': int(len(dead)),
+            'job_count': len(jobs_data),
+            'content_hash': compute_content_hash(jobs_data),
+            'updated_at': datetime.now().isoformat(),
+        })
+        write_manifest(store_dir, updated)
+        logger.info(
+            f"Model store {updated['version']} revision {revision}: "
+            f"{store_rows} rows, {len(dead)} tombstoned, {len(jobs_data)} live"
+        )
+        return updated
+    except Exception as e:
+        logger.error(f"Failed to append to model store: {e}")
+        return None
+
+
+def load_tombstones(version_dir: str, manifest: Dict):
+    """Sorted store rows removed since the version was written (empty when there are none)."""
+    import numpy as np
+    if not manifest.get('tombstone_count'):
+        return np.zeros(0, dtype=np.int64)
+    return np.load(os.path.join(version_dir, 'tombstones.npy'))
+
+
+def live_store_rows(store_dir: str, manifest: Optional[Dict], n_rows: int):
+    """Store row of every live job, in corpus order (identity when nothing was ingested)."""
+    import numpy as np
+    if manifest is None:
+        return np.arange(n_rows, dtype=np.int64)
+    total = int(manifest.get('store_rows', manifest['job_count']))
+    dead = load_tombstones(get_version_dir(store_dir, manifest), manifest)
+    return np.setdiff1d(np.arange(total, dtype=np.int64), dead, assume_unique=True)
+
+
+def _assemble_segments(version_dir: str, manifest: Dict, job_embeddings, tfidf_matrix):
+    """Concatenate the base rows with ingested segments and drop tombstoned rows (in memory)."""
+    import numpy as np
+    from scipy.sparse import vstack
+
+    embedding_parts, tfidf_parts = [job_embeddings], [tfidf_matrix]
+    for segment in manifest.get('segments') or []:
+        seg_dir = os.path.join(version_dir, segment['name'])
+        embedding_parts.append(np.load(os.path.join(seg_dir, 'embeddings.npy'), mmap_mode='r'))
+        tfidf_parts.append(load_csr(seg_dir, 'tfidf', tuple(segment['tfidf_shape'])))
+    embeddings = np.concatenate(embedding_parts)
+    matrix = vstack(tfidf_parts).tocsr()
+
+    dead = load_tombstones(version_dir, manifest)
+    if len(dead):
+        keep = np.ones(embeddings.shape[0], dtype=bool)
+        keep[dead] = False
+        embeddings, matrix = embeddings[keep], matrix[keep]
+    logger.info(
+        f"Assembled {len(manifest.get('segments') or [])} ingested segment(s) and "
+        f"{len(dead)} tombstone(s) in memory; the next refit compacts them"
+    )
+    return embeddings, matrix
+
+
+def save_csr(directory: str, prefix: str, matrix):
+    """Save a sparse matrix as <prefix>_data/_indices/_indptr.npy. Returns the CSR that was written."""
+    csr = matrix.tocsr()
+    _save_array(os.path.join(directory, f'{prefix}_data.npy'), csr.data)
+    _save_array(os.path.join(directory, f'{prefix}_indices.npy'), csr.indices)
+    _save_array(os.path.join(directory, f'{prefix}_indptr.npy'), csr.indptr)
+    return csr
+
+
+def _save_array(path: str, array) -> None:
+    """np.save through a temporary file, so readers that mapped the old file keep valid pages."""
+    import numpy as np
+    fd, tmp_path = tempfile.mkstemp(prefix='.array-', dir=os.path.dirname(path))
+    with os.fdopen(fd, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def load_csr(directory: str, prefix: str, shape: Tuple[int, int]):
+    """Open CSR components written by save_csr as memory-mapped, read-only arrays."""
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    data = np.load(os.path.join(directory, f'{prefix}_data.npy'), mmap_mode='r')
+    indices = np.load(os.path.join(directory, f'{prefix}_indices.npy'), mmap_mode='r')
+    indptr = np.load(os.path.join(directory, f'{prefix}_indptr.npy'), mmap_mode='r')
+    return csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+def get_version_dir(store_dir: str, manifest: Dict) -> str:
+    """Directory holding the arrays of the manifest's version."""
+    return os.path.join(store_dir, manifest['version'])
+
+
+def update_manifest(store_dir: str, manifest: Dict, **fields) -> Dict:
+    """Record extra fields (e.g. index metadata) on the current version, if it is still current."""
+    current = read_manifest(store_dir)
+    if not current or current.get('version') != manifest.get('version'):
+        return manifest
+    if current.get('revision', 0) != manifest.get('revision', 0):
+        return manifest
+    current.update(fields)
+    write_manifest(store_dir, current)
+    return current
+
+
+def write_manifest(store_dir: str, manifest: Dict) -> None:
+    """Atomically replace the manifest (the store's commit point)."""
+    fd, tmp_path = tempfile.mkstemp(prefix='.manifest-', dir=store_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(store_dir, MANIFEST_NAME))
+
+
+def normalize_rows(matrix):
+    """L2-normalize rows so cosine similarity becomes a plain dot product."""
+    import numpy as np
+    if matrix.ndim != 2 or matrix.shape[0] == 0:
+        return matrix
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _remove_old_versions(store_dir: str, keep: str) -> None:
+    """Delete superseded versions. Workers that still map them keep valid pages until they reopen."""
+    for name in os.listdir(store_dir):
+        path = os.path.join(store_dir, name)
+        if name != keep and name.startswith('v-') and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,318 @@
+"""Pluggable nearest-neighbour index over L2-normalized job embeddings.
+
+Backends:
+    exact       NumPy inner product + argpartition (always available, the reference path)
+    faiss_hnsw  FAISS HNSW graph (inner-product metric)
+    faiss_ivf   FAISS inverted file with a flat inner-product quantizer
+
+All backends share one interface: ``search(queries, k, rows=None) -> (scores, ids)`` for
+an (M, d) query matrix, so single and batched lookups go through the same code. ``rows``
+(sorted job ids) restricts the search to those jobs, e.g. the ones a location filter admits;
+small subsets are scanned exactly (search_rows), larger ones use a FAISS ID selector.
+"""
+import logging
+import os
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('exact', 'faiss_hnsw', 'faiss_ivf')
+# Restricted searches over at most this many jobs scan their embeddings exactly
+EXACT_SUBSET_MAX = 20000
+# Exact search over a float16 store converts this many rows at a time to float32
+EXACT_BLOCK_ROWS = 8192
+
+
+def select_top_k(scores, k: int):
+    """Indices of the k largest scores, best first; ties broken by lower index."""
+    import numpy as np
+
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < n:
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(n)
+    return part[np.lexsort((part, -scores[part]))]
+
+
+def _as_queries(queries):
+    import numpy as np
+    q = np.ascontiguousarray(queries, dtype=np.float32)
+    if q.ndim == 1:
+        q = q.reshape(1, -1)
+    norms = np.linalg.norm(q, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return q / norms
+
+
+def _inner_products(q, embeddings, rows=None):
+    """(M, n) float32 inner products of ``q`` with the stored rows (all, or ``rows``).
+
+    float32 stores are multiplied directly. Other dtypes (EMBEDDING_STORE_DTYPE=float16) are
+    converted block by block, so a query never copies the whole matrix.
+    """
+    import numpy as np
+
+    if embeddings.dtype == np.float32:
+        return q @ (embeddings if rows is None else embeddings[rows]).T
+    n = int(embeddings.shape[0]) if rows is None else len(rows)
+    sims = np.empty((len(q), n), dtype=np.float32)
+    for start in range(0, n, EXACT_BLOCK_ROWS):
+        stop = min(start + EXACT_BLOCK_ROWS, n)
+        block = embeddings[start:stop] if rows is None else embeddings[rows[start:stop]]
+        sims[:, start:stop] = q @ block.astype(np.float32).T
+    return sims
+
+
+class ExactIndex:
+    """Brute-force inner product over the (memory-mapped) embedding matrix."""
+
+    name = 'exact'
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.embeddings.shape[0])
+
+    def search(self, queries, k: int, rows=None) -> Tuple:
+        import numpy as np
+
+        q = _as_queries(queries)
+        k = min(k, self.ntotal if rows is None else len(rows))
+        sims = _inner_products(q, self.embeddings, rows)
+        ids = np.stack([select_top_k(row, k) for row in sims]) if len(sims) else np.zeros((0, k), dtype=np.int64)
+        scores = np.take_along_axis(sims, ids, axis=1)
+        if rows is not None:
+            ids = np.asarray(rows, dtype=np.int64)[ids]
+        return scores, ids
+
+    def save(self, path: str) -> None:
+        """Nothing to persist: the exact index reads the store's embeddings directly."""
+
+
+class FaissIndex:
+    """Approximate index backed by faiss (HNSW or IVF, inner-product metric)."""
+
+    def __init__(self, index, name: str, nprobe: int = 8, ef_search: int = 64):
+        self.index = index
+        self.name = name
+        self.configure(nprobe=nprobe, ef_search=ef_search)
+
+    @classmethod
+    def build(cls, embeddings, name: str, hnsw_m: int = 32, ef_construction: int = 80,
+              nlist: Optional[int] = None, nprobe: int = 8, ef_search: int = 64) -> 'FaissIndex':
+        import faiss
+        import numpy as np
+
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        dim = vectors.shape[1]
+        if name == 'faiss_hnsw':
+            index = faiss.IndexHNSWFlat(dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = ef_construction
+        elif name == 'faiss_ivf':
+            nlist = nlist or max(1, min(int(4 * np.sqrt(len(vectors))), len(vectors) // 39))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+        else:
+            raise ValueError(f"Unknown faiss backend: {name}")
+        index.add(vectors)
+        return cls(index, name, nprobe=nprobe, ef_search=ef_search)
+
+    @classmethod
+    def load(cls, path: str, name: str, nprobe: int = 8, ef_search: int = 64) -> 'FaissIndex':
+        import faiss
+        try:
+            index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except Exception:
+            index = faiss.read_index(path)
+        return cls(index, name, nprobe=nprobe, ef_search=ef_search)
+
+    def configure(self, nprobe: int = 8, ef_search: int = 64) -> None:
+        import faiss
+        if self.name == 'faiss_ivf':
+            faiss.extract_index_ivf(self.index).nprobe = nprobe
+        elif self.name == 'faiss_hnsw':
+            self.index.hnsw.efSearch = ef_search
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.index.ntotal)
+
+    def search(self, queries, k: int, rows=None) -> Tuple:
+        import numpy as np
+
+        q = _as_queries(queries)
+        if rows is None:
+            k = min(k, self.ntotal)
+            scores, ids = self.index.search(q, k)
+        else:
+            k = min(k, len(rows))
+            scores, ids = self.index.search(q, k, params=self._selector_params(rows))
+        # faiss pads with -1 when fewer than k neighbours are reachable
+        if (ids < 0).any():
+            scores = np.where(ids < 0, -np.inf, scores)
+        return scores, ids
+
+    def _selector_params(self, rows):
+        import faiss
+        import numpy as np
+
+        selector = faiss.IDSelectorBatch(np.ascontiguousarray(rows, dtype=np.int64))
+        if self.name == 'faiss_hnsw':
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=self.index.hnsw.efSearch)
+        if self.name == 'faiss_ivf':
+            return faiss.SearchParametersIVF(sel=selector, nprobe=faiss.extract_index_ivf(self.index).nprobe)
+        return faiss.SearchParameters(sel=selector)
+
+    def extended(self, vectors) -> 'FaissIndex':
+        """Copy of this index with ``vectors`` appended (the original keeps serving searches)."""
+        import faiss
+        index = faiss.clone_index(self.index)
+        index.add(_as_queries(vectors))
+        copy = FaissIndex.__new__(FaissIndex)
+        copy.index, copy.name = index, self.name
+        return copy
+
+    def save(self, path: str) -> None:
+        import faiss
+        tmp_path = f"{path}.tmp"
+        faiss.write_index(self.index, tmp_path)
+        os.replace(tmp_path, path)
+
+
+class RemappedIndex:
+    """An index over store rows exposed in live-row ids: ``row_map[i]`` is -1 for tombstoned rows.
+
+    Used after incremental ingestion so an approximate index can be extended in place of a rebuild.
+    """
+
+    def __init__(self, index, row_map):
+        import numpy as np
+        self.index = index
+        self.row_map = np.asarray(row_map, dtype=np.int64)
+        self.name = index.name
+        self.n_dead = int((self.row_map < 0).sum())
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.row_map.shape[0]) - self.n_dead
+
+    def search(self, queries, k: int, rows=None) -> Tuple:
+        import numpy as np
+
+        if rows is not None:
+            # Live rows -> positions in the wrapped index; tombstones are never selected.
+            allowed = np.zeros(self.ntotal, dtype=bool)
+            allowed[rows] = True
+            base_rows = np.flatnonzero((self.row_map >= 0) & allowed[np.maximum(self.row_map, 0)])
+            k = min(k, len(base_rows))
+            scores, ids = self.index.search(queries, k, rows=base_rows)
+            return scores, np.where(ids >= 0, self.row_map[np.maximum(ids, 0)], -1)
+
+        k = min(k, self.ntotal)
+        scores, ids = self.index.search(queries, k + self.n_dead)
+        mapped = np.where(ids >= 0, self.row_map[np.maximum(ids, 0)], -1)
+        out_scores = np.full((len(ids), k), -np.inf, dtype=np.float32)
+        out_ids = np.full((len(ids), k), -1, dtype=np.int64)
+        for r in range(len(ids)):
+            live = mapped[r] >= 0
+            row_ids, row_scores = mapped[r][live][:k], scores[r][live][:k]
+            out_ids[r, :len(row_ids)] = row_ids
+            out_scores[r, :len(row_scores)] = row_scores
+        return out_scores, out_ids
+
+    def save(self, path: str) -> None:
+        """Not persisted: the store rebuilds the index for the new revision on the next start."""
+
+
+def search_rows(index, embeddings, queries, k: int, rows=None) -> Tuple:
+    """index.search restricted to ``rows``; subsets up to EXACT_SUBSET_MAX are scanned exactly (and exactly ranked)."""
+    if rows is not None and (index is None or isinstance(index, ExactIndex) or len(rows) <= EXACT_SUBSET_MAX):
+        return ExactIndex(embeddings).search(queries, k, rows=rows)
+    if index is None:
+        index = ExactIndex(embeddings)
+    return index.search(queries, k, rows=rows)
+
+
+def extend_index(index, new_vectors, kept_rows, embeddings):
+    """Index for the corpus after ingestion: old live rows ``kept_rows`` (in order) plus ``new_vectors``.
+
+    Exact search simply wraps the new embedding matrix. Approximate indexes are copied and
+    extended, with tombstoned rows hidden through a RemappedIndex.
+    """
+    import numpy as np
+
+    if index is None or isinstance(index, ExactIndex):
+        return ExactIndex(embeddings)
+
+    old_map = index.row_map if isinstance(index, RemappedIndex) else np.arange(index.ntotal, dtype=np.int64)
+    base = index.index if isinstance(index, RemappedIndex) else index
+    live_to_new = np.full(max(int(old_map.max(initial=-1)) + 1, 1), -1, dtype=np.int64)
+    live_to_new[np.asarray(kept_rows, dtype=np.int64)] = np.arange(len(kept_rows), dtype=np.int64)
+    row_map = np.where(old_map >= 0, live_to_new[np.maximum(old_map, 0)], -1)
+    row_map = np.concatenate([row_map, np.arange(len(kept_rows), len(kept_rows) + len(new_vectors))])
+    return RemappedIndex(base.extended(new_vectors) if len(new_vectors) else base, row_map)
+
+
+def index_filename(backend: str) -> str:
+    return f"{backend}.index"
+
+
+def build_index(backend: str, embeddings, params: Dict = None):
+    """Build the configured backend, falling back to exact search if faiss is unavailable."""
+    params = params or {}
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown vector index backend {backend!r}, using exact search")
+        backend = 'exact'
+    if backend == 'exact':
+        return ExactIndex(embeddings)
+    try:
+        return FaissIndex.build(embeddings, backend, **params)
+    except ImportError:
+        logger.warning("faiss is not installed, using exact search")
+    except Exception as e:
+        logger.warning(f"Failed to build {backend} index ({e}), using exact search")
+    return ExactIndex(embeddings)
+
+
+def load_index(backend: str, version_dir: str, embeddings, params: Dict = None):
+    """Open a persisted index from a store version directory, or None if absent/unreadable."""
+    if backend == 'exact':
+        return ExactIndex(embeddings)
+    path = os.path.join(version_dir, index_filename(backend))
+    if not os.path.exists(path):
+        return None
+    params = params or {}
+    try:
+        index = FaissIndex.load(path, backend,
+                                nprobe=params.get('nprobe', 8), ef_search=params.get('ef_search', 64))
+    except Exception as e:
+        logger.warning(f"Failed to load {backend} index: {e}")
+        return None
+    if index.ntotal != int(embeddings.shape[0]):
+        logger.warning(f"{backend} index size {index.ntotal} != {embeddings.shape[0]} embeddings; rebuilding")
+        return None
+    return index
+
+
+def measure_recall(index, embeddings, k: int = 10, sample: int = 200, seed: int = 0) -> float:
+    """recall@k of ``index`` against exact search, using a sample of job embeddings as queries."""
+    import numpy as np
+
+    n = int(embeddings.shape[0])
+    if n == 0:
+        return 1.0
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(n, size=min(sample, n), replace=False)
+    queries = np.asarray(embeddings[np.sort(rows)], dtype=np.float32)
+    k = min(k, n)
+
+    _, exact_ids = ExactIndex(embeddings).search(queries, k)
+    _, approx_ids = index.search(queries, k)
+    hits = sum(len(set(a.tolist()) & set(e.tolist())) for a, e in zip(approx_ids, exact_ids))
+    return hits / float(len(rows) * k)
@@ -1,20 +1,46 @@
-"""Health check endpoint."""
-from flask import Blueprint, jsonify
+"""Health check and metrics endpoints."""
+from flask import Blueprint, Response, jsonify
 import os
 
-from config import ALLOW_ALL_ORIGINS, ALLOWED_ORIGINS, FLASK_PORT
+from config import ALLOW_ALL_ORIGINS, ALLOWED_ORIGINS, FLASK_PORT, RESUME_CACHE_PATH
+import services
+from utils import metrics
 
 bp = Blueprint('health', __name__)
 
 
+def _stats(component):
+    """Stats of a services singleton, or None when nothing has created it yet.
+
+    A probe must not create caches itself: that would open SQLite files and connections.
+    """
+    return component.stats() if component is not None else None
+
+
 @bp.route('/health', methods=['GET'])
 def health():
     return jsonify({
         'status': 'ok',
-        'mode': 'stateless',
-        'description': 'API processes data for recommendations without storing user data',
+        'mode': 'persistent-cache' if RESUME_CACHE_PATH else 'stateless',
+        'description': (
+            'API keeps derived resume data on disk for RESUME_CACHE_TTL seconds'
+            if RESUME_CACHE_PATH else
+            'API processes data for recommendations without storing user data'
+        ),
         'port': os.environ.get("PORT", FLASK_PORT),
         'allowed_origins': '*' if ALLOW_ALL_ORIGINS else ALLOWED_ORIGINS,
         'gemini_configured': bool(os.getenv("GEMINI_API_KEY")),
-        'youtube_configured': bool(os.getenv("YOUTUBE_API_KEY"))
+        'youtube_configured': bool(os.getenv("YOUTUBE_API_KEY")),
+        'resume_cache': _stats(services.resume_cache),
+        'youtube_cache': _stats(services.video_cache),
+        'skill_gap_cache': _stats(services.analysis_cache),
+        'worker_pool': _stats(services.worker_pool),
     })
+
+
+@bp.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Stage and request latency histograms in the Prometheus text exposition format."""
+    if not metrics.enabled:
+        return jsonify({'error': 'Metrics are disabled (METRICS_ENABLED=false)'}), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -1,24 +1,29 @@
 """Job recommendation and listing endpoints."""
-import os
-import tempfile
+import hmac
+import json
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from typing import Dict, List
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 
-from utils.resume_parser import allowed_file, extract_resume_text
-from services import get_job_recommender
+from config import BATCH_MAX_RESUMES, BATCH_CHUNK_SIZE, INGEST_TOKEN, INGEST_MAX_JOBS
+from utils.resume_parser import allowed_file, UploadTooLarge
+from utils import metrics
+from services import get_job_recommender, ingest_jobs, extract_upload_text, recommend_jobs
+from worker_pool import PoolBusy
+from job_recommender.job_index import JobIndex, InvalidCursor, SORTS, query_key as listing_query_key
 
 bp = Blueprint('jobs', __name__)
 
 
 def _process_and_recommend(resume_text: str, location: str, top_k: int, extra_top: bool = False):
     """Shared logic for resume upload and recommend endpoints."""
-    recommender = get_job_recommender()
     rec_top = (top_k * 2) if extra_top else top_k
-    recommendations = recommender.recommend_jobs(
-        resume_text=resume_text,
-        location_filter=None,
-        top_k=rec_top
-    )
+    with metrics.stage('recommend'):
+        recommendations = recommend_jobs(
+            resume_text=resume_text,
+            location_filter=location or None,
+            top_k=rec_top
+        )
     if not recommendations['success']:
         return None, recommendations.get('error', 'Failed to generate recommendations')
 
@@ -54,38 +59,35 @@ def upload_resume_and_recommend():
         provider = request.form.get('provider', 'all')
         only_provider = request.form.get('only_provider', 'false').lower() == 'true'
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file.filename.rsplit('.', 1)[1].lower()}") as temp_file:
-            file.save(temp_file.name)
-            temp_file_path = temp_file.name
-
         try:
-            file_extension = file.filename.rsplit('.', 1)[1].lower()
-            resume_text = extract_resume_text(temp_file_path, file_extension)
-
-            if not resume_text.strip():
-                return jsonify({'error': 'Could not extract text from resume. Please ensure the file contains readable text.'}), 400
-
-            recommendations, err = _process_and_recommend(resume_text, location, top_k, extra_top=True)
-            if err:
-                return jsonify({'error': err}), 500
-
-            response_data = {
-                'success': True,
-                'message': f"Found {len(recommendations['top_jobs'])} job recommendations!",
-                'top_jobs': recommendations['top_jobs'],
-                'jobs': recommendations['top_jobs'],
-                'data': recommendations['top_jobs'],
-                'recommendations': recommendations['top_jobs'],
-                'resume_analysis': recommendations['resume_analysis'],
-                'total_jobs_analyzed': recommendations['total_jobs_analyzed'],
-                'query': recommendations.get('query', ''),
-                'timestamp': recommendations.get('timestamp', ''),
-                'filters_applied': {'location': location, 'provider': provider, 'only_provider': only_provider}
-            }
-            return jsonify(response_data)
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+            resume_text = extract_upload_text(file)
+        except UploadTooLarge as e:
+            return jsonify({'error': str(e)}), 413
+
+        if not resume_text.strip():
+            return jsonify({'error': 'Could not extract text from resume. Please ensure the file contains readable text.'}), 400
+
+        recommendations, err = _process_and_recommend(resume_text, location, top_k, extra_top=True)
+        if err:
+            return jsonify({'error': err}), 500
+
+        response_data = {
+            'success': True,
+            'message': f"Found {len(recommendations['top_jobs'])} job recommendations!",
+            'top_jobs': recommendations['top_jobs'],
+            'jobs': recommendations['top_jobs'],
+            'data': recommendations['top_jobs'],
+            'recommendations': recommendations['top_jobs'],
+            'resume_analysis': recommendations['resume_analysis'],
+            'total_jobs_analyzed': recommendations['total_jobs_analyzed'],
+            'query': recommendations.get('query', ''),
+            'timestamp': recommendations.get('timestamp', ''),
+            'timing': recommendations.get('timing', {}),
+            'filters_applied': {'location': location, 'provider': provider, 'only_provider': only_provider}
+        }
+        return jsonify(response_data)
+    except PoolBusy:
+        raise
     except Exception as e:
         return jsonify({'error': f'An error occurred during job recommendation: {str(e)}'}), 500
 
@@ -104,39 +106,172 @@ def recommend_jobs_enhanced():
         location = request.form.get('location', '')
         top_k = int(request.form.get('top_k', 15))
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file.filename.rsplit('.', 1)[1].lower()}") as temp_file:
-            file.save(temp_file.name)
-            temp_file_path = temp_file.name
-
         try:
-            file_extension = file.filename.rsplit('.', 1)[1].lower()
-            resume_text = extract_resume_text(temp_file_path, file_extension)
-
-            if not resume_text.strip():
-                return jsonify({'error': 'Could not extract text from resume. Please ensure the file contains readable text.'}), 400
-
-            recommendations, err = _process_and_recommend(resume_text, location, top_k, extra_top=False)
-            if err:
-                return jsonify({'error': err}), 500
-
-            return jsonify({
-                'success': True,
-                'message': f"Found {len(recommendations['top_jobs'])} job recommendations!",
-                'jobs': recommendations['top_jobs'],
-                'top_jobs': recommendations['top_jobs'],
-                'resume_analysis': recommendations['resume_analysis'],
-                'total_jobs_analyzed': recommendations['total_jobs_analyzed'],
-                'query': recommendations.get('query', ''),
-                'timestamp': recommendations.get('timestamp', ''),
-                'filters_applied': {'location': location, 'top_k': top_k}
-            })
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+            resume_text = extract_upload_text(file)
+        except UploadTooLarge as e:
+            return jsonify({'error': str(e)}), 413
+
+        if not resume_text.strip():
+            return jsonify({'error': 'Could not extract text from resume. Please ensure the file contains readable text.'}), 400
+
+        recommendations, err = _process_and_recommend(resume_text, location, top_k, extra_top=False)
+        if err:
+            return jsonify({'error': err}), 500
+
+        return jsonify({
+            'success': True,
+            'message': f"Found {len(recommendations['top_jobs'])} job recommendations!",
+            'jobs': recommendations['top_jobs'],
+            'top_jobs': recommendations['top_jobs'],
+            'resume_analysis': recommendations['resume_analysis'],
+            'total_jobs_analyzed': recommendations['total_jobs_analyzed'],
+            'query': recommendations.get('query', ''),
+            'timestamp': recommendations.get('timestamp', ''),
+            'timing': recommendations.get('timing', {}),
+            'filters_applied': {'location': location, 'top_k': top_k}
+        })
+    except PoolBusy:
+        raise
     except Exception as e:
         return jsonify({'error': f'An error occurred during job recommendation: {str(e)}'}), 500
 
 
+def _batch_results(files, location: str, top_k: int):
+    """Yield one result per uploaded file, scoring readable resumes BATCH_CHUNK_SIZE at a time."""
+    recommender = get_job_recommender()
+    chunk_size = max(1, BATCH_CHUNK_SIZE)
+    for start in range(0, len(files), chunk_size):
+        results, texts, positions = [], [], []
+        for file in files[start:start + chunk_size]:
+            entry = {'filename': file.filename}
+            if not allowed_file(file.filename):
+                entry.update(success=False, error='Invalid file type. Please upload PDF, DOCX, or TXT files only.')
+            else:
+                try:
+                    text = extract_upload_text(file)
+                    if text.strip():
+                        positions.append(len(results))
+                        texts.append(text)
+                    else:
+                        entry.update(success=False, error='Could not extract text from resume.')
+                except PoolBusy:
+                    raise
+                except Exception as e:
+                    entry.update(success=False, error=str(e))
+            results.append(entry)
+
+        if texts:
+            with metrics.stage('recommend_batch'):
+                batch = recommender.recommend_jobs_batch(texts, top_k=top_k, location_filter=location or None)
+            per_resume = batch['results'] if batch['success'] else [
+                {'success': False, 'error': batch.get('error', 'Failed to generate recommendations')}
+            ] * len(texts)
+            for pos, rec in zip(positions, per_resume):
+                results[pos].update({
+                    'success': rec['success'],
+                    'top_jobs': rec.get('top_jobs', []),
+                    'resume_analysis': rec.get('resume_analysis', {}),
+                    'query': rec.get('query', ''),
+                    'timing': rec.get('timing', {}),
+                    **({'error': rec['error']} if not rec['success'] else {}),
+                })
+        yield from results
+
+
+@bp.route('/recommend-jobs/batch', methods=['POST'])
+def recommend_jobs_batch():
+    """Score many resumes in one call. Set form field stream=true for NDJSON, one line per resume."""
+    try:
+        files = request.files.getlist('resumes') or request.files.getlist('resume')
+        files = [f for f in files if f.filename]
+        if not files:
+            return jsonify({'error': 'No resume files uploaded'}), 400
+        if len(files) > BATCH_MAX_RESUMES:
+            return jsonify({'error': f'Too many resumes: {len(files)} (max {BATCH_MAX_RESUMES})'}), 400
+
+        location = request.form.get('location', '')
+        top_k = int(request.form.get('top_k', 15))
+        stream = request.form.get('stream', 'false').lower() == 'true'
+
+        if stream:
+            entries = _batch_results(files, location, top_k)
+            # The first chunk runs before the response starts, so a busy pool still answers 503.
+            first = next(entries)
+
+            def generate():
+                yield json.dumps(first) + '\n'
+                sent = 1
+                try:
+                    for entry in entries:
+                        yield json.dumps(entry) + '\n'
+                        sent += 1
+                except PoolBusy as e:
+                    # Too late for a status code: report the remaining files as retryable.
+                    for file in files[sent:]:
+                        yield json.dumps({'filename': file.filename, 'success': False, 'error': str(e),
+                                          'retry_after': e.retry_after}) + '\n'
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+        results = list(_batch_results(files, location, top_k))
+        succeeded = sum(1 for r in results if r.get('success'))
+        return jsonify({
+            'success': True,
+            'message': f"Generated recommendations for {succeeded} of {len(results)} resumes",
+            'results': results,
+            'total_jobs_analyzed': len(get_job_recommender().jobs_data),
+            'timestamp': datetime.now().isoformat(),
+            'filters_applied': {'location': location, 'top_k': top_k},
+        })
+    except PoolBusy:
+        raise
+    except Exception as e:
+        return jsonify({'error': f'An error occurred during batch job recommendation: {str(e)}'}), 500
+
+
+def _ingest_authorized() -> bool:
+    token = request.headers.get('Authorization', '')
+    if token.startswith('Bearer '):
+        token = token[len('Bearer '):]
+    else:
+        token = request.headers.get('X-Ingest-Token', '')
+    return bool(INGEST_TOKEN) and hmac.compare_digest(token, INGEST_TOKEN)
+
+
+@bp.route('/ingest-jobs', methods=['POST'])
+def ingest_jobs_endpoint():
+    """Add, update or remove jobs without a rebuild: JSON {"jobs": [...], "delete_ids": [...]} or a JSON/JSONL file."""
+    if not INGEST_TOKEN:
+        return jsonify({'error': 'Job ingestion is disabled (INGEST_TOKEN not set)'}), 403
+    if not _ingest_authorized():
+        return jsonify({'error': 'Invalid ingestion token'}), 401
+    try:
+        upload = request.files.get('file')
+        if upload:
+            text = upload.read().decode('utf-8')
+            try:
+                payload = json.loads(text)
+            except json.JSONDecodeError:
+                payload = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            payload = request.get_json(silent=True)
+        if payload is None:
+            return jsonify({'error': 'Expected a JSON body or a JSON/JSONL file'}), 400
+
+        if isinstance(payload, list):
+            jobs, delete_ids = payload, []
+        else:
+            jobs, delete_ids = payload.get('jobs', []), payload.get('delete_ids', [])
+        if not isinstance(jobs, list) or not isinstance(delete_ids, list):
+            return jsonify({'error': '"jobs" and "delete_ids" must be lists'}), 400
+        if len(jobs) + len(delete_ids) > INGEST_MAX_JOBS:
+            return jsonify({'error': f'Too many changes: {len(jobs) + len(delete_ids)} (max {INGEST_MAX_JOBS})'}), 400
+
+        summary = ingest_jobs(jobs, delete_ids)
+        return jsonify({'success': True, **summary, 'timestamp': datetime.now().isoformat()})
+    except Exception as e:
+        return jsonify({'error': f'An error occurred during job ingestion: {str(e)}'}), 500
+
+
 @bp.route('/jobs-stats', methods=['GET'])
 def get_jobs_stats():
     try:
@@ -146,88 +281,147 @@ def get_jobs_stats():
         if not jobs_data:
             return jsonify({'success': True, 'total_jobs': 0, 'stats': {}})
 
-        companies, locations, sectors, experience_levels = {}, {}, {}, {}
-        for job in jobs_data:
-            company = job.get('company', job.get('companyName', 'Unknown'))
-            companies[company] = companies.get(company, 0) + 1
-            loc = job.get('location', 'Unknown')
-            locations[loc] = locations.get(loc, 0) + 1
-            sec = job.get('sector', 'Unknown')
-            sectors[sec] = sectors.get(sec, 0) + 1
-            exp = job.get('experience_level', job.get('experienceLevel', 'Unknown'))
-            experience_levels[exp] = experience_levels.get(exp, 0) + 1
-
-        stats = {
-            'total_jobs': len(jobs_data),
-            'top_companies': sorted(companies.items(), key=lambda x: x[1], reverse=True)[:10],
-            'top_locations': sorted(locations.items(), key=lambda x: x[1], reverse=True)[:10],
-            'top_sectors': sorted(sectors.items(), key=lambda x: x[1], reverse=True)[:10],
-            'experience_levels': dict(experience_levels),
-            'last_updated': datetime.now().isoformat()
-        }
+        try:
+            top_n = int(request.args.get('top_n', 10))
+        except ValueError:
+            return jsonify({'error': 'top_n must be an integer'}), 400
+        if top_n < 1:
+            return jsonify({'error': 'top_n must be at least 1'}), 400
+
+        # Counted once per corpus (and updated on ingestion); see job_recommender/stats.py.
+        job_stats = recommender.job_stats
+        try:
+            source = job_stats.resolve_source(request.args.get('source', '').strip())
+        except KeyError:
+            return jsonify({'error': f"Unknown source: {request.args.get('source')}",
+                            'sources': sorted(job_stats.sources)}), 400
+        stats = job_stats.snapshot(top_n=top_n, source=source)
         return jsonify({'success': True, 'stats': stats})
     except Exception as e:
         return jsonify({'error': f'An error occurred getting job statistics: {str(e)}'}), 500
 
 
+_LISTING_FILTERS = ('location', 'skill', 'level', 'source', 'company')
+ALL_JOBS_MAX_PER_PAGE = 100
+
+
+def _listing_filters() -> Dict[str, List[str]]:
+    """Filter values from the query string: repeated params and/or comma-separated lists (company: repeated only)."""
+    filters = {}
+    for name in _LISTING_FILTERS:
+        values = request.args.getlist(name)
+        if name not in ('location', 'company'):
+            values = [v for value in values for v in value.split(',')]
+        values = [v.strip() for v in values if v.strip()]
+        if values:
+            filters[name] = values
+    return filters
+
+
+def _listing_job(job, job_id: str) -> Dict:
+    job_url = job.get('jobUrl', job.get('job_url', ''))
+    apply_url = job.get('applyUrl', job.get('apply_url', ''))
+    primary_apply_link = apply_url if apply_url else job_url
+    desc = job.get('description', '')
+    desc_preview = (desc[:300] + '...') if len(desc) > 300 else desc
+
+    return {
+        'id': job_id,
+        'title': job.get('title', 'No Title'),
+        'company': job.get('companyName', job.get('company', 'Unknown Company')),
+        'location': job.get('location', 'Unknown Location'),
+        'description': desc_preview,
+        'similarity': None,  # no resume to score against when listing
+        'skills_required': job.get('skills', [])[:5],
+        'skills_matched': [],
+        'skills_missing': [],
+        'experience_level': job.get('experienceLevel', job.get('experience_level', '')),
+        'contract_type': job.get('contractType', ''),
+        'work_type': job.get('workType', ''),
+        'sector': job.get('sector', ''),
+        'apply_link': primary_apply_link,
+        'apply_url': apply_url,
+        'job_url': job_url,
+        'linkedin_url': job_url if 'linkedin.com' in job_url else '',
+        'posted_time': job.get('postedTime', job.get('posted_time', '')),
+        'applications_count': job.get('applicationsCount', ''),
+        'company_url': job.get('companyUrl', ''),
+        'salary': job.get('salary', ''),
+        'source': 'LinkedIn' if 'linkedin.com' in job_url else 'Other'
+    }
+
+
 @bp.route('/all-jobs', methods=['GET'])
 def get_all_jobs():
+    """List jobs with optional filters (location, skill, level, source, company), sort and cursor pagination.
+
+    Pass the returned ``next_cursor`` as ``cursor`` for the next page; ``page`` still works for offset paging.
+    """
     try:
         recommender = get_job_recommender()
         jobs_data = recommender.jobs_data
 
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 20))
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-
+        try:
+            page = int(request.args.get('page', 1))
+            per_page = int(request.args.get('per_page', 20))
+        except ValueError:
+            return jsonify({'error': 'page and per_page must be integers'}), 400
+        if page < 1 or not 1 <= per_page <= ALL_JOBS_MAX_PER_PAGE:
+            return jsonify({'error': f'page must be >= 1 and per_page between 1 and {ALL_JOBS_MAX_PER_PAGE}'}), 400
+
+        sort = request.args.get('sort', 'default').lower()
+        if sort not in SORTS:
+            return jsonify({'error': f"Unknown sort: {sort} (use one of {', '.join(SORTS)})"}), 400
+        direction = request.args.get('order', SORTS[sort]).lower()
+        if direction not in ('asc', 'desc'):
+            return jsonify({'error': 'order must be asc or desc'}), 400
+
+        filters = _listing_filters()
+        index = recommender.job_index
+        bitmap = index.match(filters)
+        total = len(jobs_data) if bitmap is None else int(bitmap.sum())
+        key = listing_query_key(filters, sort, direction)
+
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                position = index.cursor_position(JobIndex.decode_cursor(cursor, key))
+            except InvalidCursor as e:
+                return jsonify({'error': str(e)}), 400
+        else:
+            position = index.offset_position(bitmap, sort, direction, (page - 1) * per_page)
+
+        # One row past the page tells whether any matching job follows it.
+        rows = index.page(bitmap, sort, direction, position, per_page + 1)
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
         formatted_jobs = []
         seen_job_ids = set()
-        for i, job in enumerate(jobs_data[start_idx:end_idx], start_idx):
-            job_id = job.get('id', str(i))
+        for row in rows:
+            job_id = index.job_id(row)
             if job_id in seen_job_ids:
                 continue
             seen_job_ids.add(job_id)
+            formatted_jobs.append(_listing_job(jobs_data[row], job_id))
 
-            job_url = job.get('jobUrl', job.get('job_url', ''))
-            apply_url = job.get('applyUrl', job.get('apply_url', ''))
-            primary_apply_link = apply_url if apply_url else job_url
-            desc = job.get('description', '')
-            desc_preview = (desc[:300] + '...') if len(desc) > 300 else desc
-
-            formatted_jobs.append({
-                'id': job_id,
-                'title': job.get('title', 'No Title'),
-                'company': job.get('companyName', job.get('company', 'Unknown Company')),
-                'location': job.get('location', 'Unknown Location'),
-                'description': desc_preview,
-                'similarity': 85,
-                'skills_required': job.get('skills', [])[:5],
-                'skills_matched': [],
-                'skills_missing': [],
-                'experience_level': job.get('experienceLevel', job.get('experience_level', '')),
-                'contract_type': job.get('contractType', ''),
-                'work_type': job.get('workType', ''),
-                'sector': job.get('sector', ''),
-                'apply_link': primary_apply_link,
-                'apply_url': apply_url,
-                'job_url': job_url,
-                'linkedin_url': job_url if 'linkedin.com' in job_url else '',
-                'posted_time': job.get('postedTime', job.get('posted_time', '')),
-                'applications_count': job.get('applicationsCount', ''),
-                'company_url': job.get('companyUrl', ''),
-                'salary': job.get('salary', ''),
-                'source': 'LinkedIn' if 'linkedin.com' in job_url else 'Other'
-            })
+        next_cursor = None
+        if has_more:
+            next_cursor = index.encode_cursor(sort, direction, rows[-1], key)
 
-        return jsonify({
+        response = {
             'success': True,
             'jobs': formatted_jobs,
-            'total_jobs': len(jobs_data),
-            'page': page,
+            'total_jobs': total,
             'per_page': per_page,
-            'total_pages': (len(jobs_data) + per_page - 1) // per_page,
+            'total_pages': (total + per_page - 1) // per_page,
+            'next_cursor': next_cursor,
+            'sort': sort,
+            'order': direction,
+            'filters_applied': filters,
             'message': f'Retrieved {len(formatted_jobs)} jobs'
-        })
+        }
+        if not cursor:
+            response['page'] = page
+        return jsonify(response)
     except Exception as e:
         return jsonify({'error': f'An error occurred getting jobs: {str(e)}'}), 500
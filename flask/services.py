@@ -1,8 +1,107 @@
-"""Lazy-initialized singletons for skill analyzer and job recommender."""
+"""Lazy-initialized singletons for skill analyzer, job recommender, worker pool and the shared resume cache."""
+import logging
 import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 skill_analyzer = None
 job_recommender = None
+resume_cache = None
+pool_sizer = None
+video_cache = None
+analysis_cache = None
+worker_pool = None
+
+_ingest_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_last_refresh_check = 0.0
+
+
+def get_resume_cache():
+    global resume_cache
+    if resume_cache is None:
+        from config import RESUME_CACHE_SIZE, RESUME_CACHE_TTL, RESUME_CACHE_PATH
+        from utils.resume_cache import ResumeCache
+        resume_cache = ResumeCache(
+            max_entries=RESUME_CACHE_SIZE,
+            ttl=RESUME_CACHE_TTL,
+            disk_path=RESUME_CACHE_PATH or None,
+        )
+    return resume_cache
+
+
+def get_pool_sizer():
+    """Candidate pool statistics, shared by every recommender instance (they survive reloads)."""
+    global pool_sizer
+    if pool_sizer is None:
+        from config import RECOMMEND_POOL_FACTOR, RECOMMEND_POOL_MAX, RECOMMEND_POOL_ROUNDS
+        from job_recommender.pool import PoolSizer
+        pool_sizer = PoolSizer(factor=RECOMMEND_POOL_FACTOR, max_pool=RECOMMEND_POOL_MAX,
+                               rounds=RECOMMEND_POOL_ROUNDS)
+    return pool_sizer
+
+
+def get_video_cache():
+    """Persistent YouTube lookup cache, or None when YOUTUBE_CACHE_PATH is empty."""
+    global video_cache
+    if video_cache is None:
+        from config import YOUTUBE_CACHE_PATH, YOUTUBE_CACHE_TTL, YOUTUBE_CACHE_STALE_TTL
+        if not YOUTUBE_CACHE_PATH:
+            return None
+        from skill_gap.video_cache import VideoCache
+        try:
+            video_cache = VideoCache(YOUTUBE_CACHE_PATH, ttl=YOUTUBE_CACHE_TTL, stale_ttl=YOUTUBE_CACHE_STALE_TTL)
+        except Exception as e:
+            logger.warning(f"YouTube video cache unavailable ({e}), fetching without it")
+            return None
+    return video_cache
+
+
+def get_analysis_cache():
+    """Memoized Gemini skill gap analyses (memory LRU, plus SQLite when SKILL_GAP_CACHE_PATH is set)."""
+    global analysis_cache
+    if analysis_cache is None:
+        from config import SKILL_GAP_CACHE_SIZE, SKILL_GAP_CACHE_TTL, SKILL_GAP_CACHE_PATH
+        from utils.cache import TieredCache
+        analysis_cache = TieredCache(max_entries=SKILL_GAP_CACHE_SIZE, ttl=SKILL_GAP_CACHE_TTL,
+                                     disk_path=SKILL_GAP_CACHE_PATH or None, table='skill_gap_analysis')
+    return analysis_cache
+
+
+def get_worker_pool():
+    """Process pool for extraction and scoring, or None when WORKER_POOL_ENABLED is false."""
+    global worker_pool
+    if worker_pool is None:
+        from config import (WORKER_POOL_ENABLED, WORKER_POOL_SIZE, WORKER_POOL_MAX_PENDING,
+                            WORKER_POOL_TIMEOUT, WORKER_POOL_RETRY_AFTER)
+        if not WORKER_POOL_ENABLED:
+            return None
+        from worker_pool import WorkerPool
+        worker_pool = WorkerPool(workers=WORKER_POOL_SIZE, max_pending=WORKER_POOL_MAX_PENDING,
+                                 timeout=WORKER_POOL_TIMEOUT, retry_after=WORKER_POOL_RETRY_AFTER)
+    return worker_pool
+
+
+def extract_upload_text(file) -> str:
+    """Text of an uploaded resume, extracted in the worker pool when it is enabled."""
+    from utils import resume_parser
+    pool = get_worker_pool()
+    if pool is None:
+        return resume_parser.extract_upload_text(file)
+    from utils import metrics
+    with metrics.stage('upload_read'):
+        data = resume_parser.open_upload(file.stream).read()
+    return pool.extract_resume_text(data, resume_parser.upload_extension(file.filename))
+
+
+def recommend_jobs(resume_text: str, location_filter: str = None, top_k: int = 10):
+    """JobRecommender.recommend_jobs, run in the worker pool when it is enabled."""
+    pool = get_worker_pool()
+    if pool is None:
+        return get_job_recommender().recommend_jobs(resume_text, location_filter=location_filter, top_k=top_k)
+    return pool.recommend_jobs(resume_text, location_filter, top_k)
 
 
 def get_skill_analyzer():
@@ -11,14 +110,83 @@ def get_skill_analyzer():
         from skill_gap_analyzer import SkillGapAnalyzer
         skill_analyzer = SkillGapAnalyzer(
             os.getenv("GEMINI_API_KEY"),
-            os.getenv("YOUTUBE_API_KEY")
+            os.getenv("YOUTUBE_API_KEY"),
+            resume_cache=get_resume_cache(),
+            video_cache=get_video_cache(),
+            analysis_cache=get_analysis_cache(),
         )
     return skill_analyzer
 
 
+def warm_video_cache():
+    """Fetch videos for the learning.SKILL_CATEGORIES skills that are not freshly cached."""
+    cache = get_video_cache()
+    analyzer = get_skill_analyzer()
+    if cache is None or analyzer.youtube is None:
+        return None
+    from skill_gap.video_cache import warm_up
+    summary = warm_up(analyzer.youtube, cache)
+    logger.info(f"Warmed YouTube video cache: {summary}")
+    return summary
+
+
 def get_job_recommender():
     global job_recommender
     if job_recommender is None:
         from job_recommender import JobRecommender
-        job_recommender = JobRecommender()
+        job_recommender = JobRecommender(resume_cache=get_resume_cache(), pool_sizer=get_pool_sizer())
+    else:
+        _maybe_refresh_job_recommender()
     return job_recommender
+
+
+def _maybe_refresh_job_recommender():
+    """Pick up jobs ingested through another worker: reload in the background, keep serving meanwhile."""
+    global _last_refresh_check
+    from config import INGEST_POLL_SECONDS
+    now = time.time()
+    if not INGEST_POLL_SECONDS or now - _last_refresh_check < INGEST_POLL_SECONDS:
+        return
+    _last_refresh_check = now
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        stale = job_recommender.is_stale()
+    except Exception:
+        stale = False
+    if not stale:
+        _refresh_lock.release()
+        return
+
+    def reload():
+        global job_recommender
+        try:
+            from job_recommender import JobRecommender
+            with _ingest_lock:
+                fresh = JobRecommender(job_recommender.data_path, job_recommender.model_name,
+                                       resume_cache=get_resume_cache(), pool_sizer=get_pool_sizer(),
+                                       sentence_model=job_recommender.sentence_model)
+                fresh._ensure_models_initialized()
+                job_recommender = fresh
+            logger.info("Reloaded job recommender for a newer model store")
+        except Exception as e:
+            logger.error(f"Failed to reload job recommender: {e}")
+        finally:
+            _refresh_lock.release()
+
+    threading.Thread(target=reload, daemon=True).start()
+
+
+def ingest_jobs(records, delete_ids=()):
+    """Apply a batch of new/changed/removed jobs and swap in the updated recommender."""
+    global job_recommender
+    from job_recommender import JobRecommender, ingest, store
+    current = get_job_recommender()
+    with _ingest_lock, ingest.store_lock(store.get_store_dir(current.data_path)):
+        current = job_recommender
+        if current.is_stale():
+            current = JobRecommender(current.data_path, current.model_name, resume_cache=get_resume_cache(),
+                                     pool_sizer=get_pool_sizer(), sentence_model=current.sentence_model)
+        updated, summary = current.ingest(records, delete_ids)
+        job_recommender = updated
+    return summary
@@ -1,35 +1,22 @@
 """Skill gap analysis using Gemini AI with regex fallback."""
+import hashlib
 import os
 import json
-import google.generativeai as genai
+import re
+import threading
 from googleapiclient.discovery import build
 
+from config import YOUTUBE_TIMEOUT, YOUTUBE_DEADLINE, YOUTUBE_MAX_WORKERS
+
+from . import gemini_client
 from . import skills_extractor
 from . import youtube_client
 from . import learning
+from utils import metrics
 
-
-class SkillGapAnalyzer:
-    """Analyzes skill gap between resume and job description."""
-
-    def __init__(self, gemini_api_key=None, youtube_api_key=None):
-        self.gemini_api_key = gemini_api_key or os.getenv("GEMINI_API_KEY")
-        self.youtube_api_key = youtube_api_key or os.getenv("YOUTUBE_API_KEY")
-        self.youtube = None
-        if self.youtube_api_key:
-            try:
-                self.youtube = build('youtube', 'v3', developerKey=self.youtube_api_key)
-            except Exception:
-                pass
-
-    def analyze_skill_gap(self, resume_text: str, job_description: str) -> dict:
-        """Analyze skill gap using Gemini AI with regex fallback."""
-        try:
-            if not self.gemini_api_key:
-                raise Exception("GEMINI_API_KEY not configured")
-
-            client = genai.Client(api_key=self.gemini_api_key)
-            prompt = """You are an expert technical recruiter performing a detailed skill gap analysis.
+GEMINI_MODEL = 'gemini-2.0-flash-exp'
+RESUME_PROMPT_CHARS = 4000
+PROMPT_TEMPLATE = """You are an expert technical recruiter performing a detailed skill gap analysis.
 
 RESUME:
 {resume_text}
@@ -56,11 +43,83 @@ Return your analysis in this EXACT JSON format (no markdown, no extra text):
 }}
 
 JSON only:"""
+# Part of every cached analysis key: editing the prompt or switching models invalidates old results.
+PROMPT_VERSION = hashlib.sha256(f"{GEMINI_MODEL}\n{PROMPT_TEMPLATE}".encode('utf-8')).hexdigest()[:12]
 
-            response = client.models.generate_content(
-                model='gemini-2.0-flash-exp',
-                contents=prompt.format(resume_text=resume_text[:4000], job_description=job_description)
-            )
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def analysis_key(resume_text: str, job_description: str) -> str:
+    """Cache key: prompt version + hashes of the resume text Gemini sees and the whitespace-normalized JD."""
+    resume_hash = hashlib.sha256(resume_text[:RESUME_PROMPT_CHARS].encode('utf-8')).hexdigest()
+    jd = _WHITESPACE_RE.sub(' ', job_description or '').strip()
+    jd_hash = hashlib.sha256(jd.encode('utf-8')).hexdigest()
+    return f"{PROMPT_VERSION}|{resume_hash}|{jd_hash}"
+
+
+class SkillGapAnalyzer:
+    """Analyzes skill gap between resume and job description."""
+
+    def __init__(self, gemini_api_key=None, youtube_api_key=None, resume_cache=None, youtube_client=None,
+                 youtube_timeout: float = YOUTUBE_TIMEOUT, youtube_deadline: float = YOUTUBE_DEADLINE,
+                 video_cache=None, gemini_client=None, analysis_cache=None):
+        """``youtube_client`` replaces the API client built from the key (e.g. benchmarks.fakes.FakeYouTubeClient);
+        ``video_cache`` (video_cache.VideoCache) serves repeated skill lookups without API calls.
+        ``gemini_client`` replaces the Gemini client (e.g. benchmarks.fakes.FakeGeminiClient) and
+        ``analysis_cache`` (utils.cache.TieredCache) memoizes Gemini analyses by analysis_key."""
+        self.resume_cache = resume_cache
+        self.analysis_cache = analysis_cache
+        self._gemini_client = gemini_client
+        self._gemini_lock = threading.Lock()
+        self.video_cache = video_cache
+        self.gemini_api_key = gemini_api_key or os.getenv("GEMINI_API_KEY")
+        self.youtube_api_key = youtube_api_key or os.getenv("YOUTUBE_API_KEY")
+        self.youtube_timeout = youtube_timeout
+        self.youtube_deadline = youtube_deadline
+        self.youtube = youtube_client
+        if self.youtube is None and self.youtube_api_key:
+            try:
+                self.youtube = build('youtube', 'v3', developerKey=self.youtube_api_key)
+            except Exception:
+                pass
+
+    def gemini_client(self):
+        """The Gemini client, created on first use and shared by every request."""
+        if self._gemini_client is None:
+            with self._gemini_lock:
+                if self._gemini_client is None:
+                    self._gemini_client = gemini_client.create_client(self.gemini_api_key)
+        return self._gemini_client
+
+    def analyze_skill_gap(self, resume_text: str, job_description: str) -> dict:
+        """Analyze skill gap using Gemini AI with regex fallback; Gemini results are memoized."""
+        if self.analysis_cache is None or not self._gemini_available():
+            return self._analyze_skill_gap(resume_text, job_description)[0]
+        key = analysis_key(resume_text, job_description)
+        cached = self.analysis_cache.get(key)
+        if cached is not None:
+            return cached
+        analysis, from_gemini = self._analyze_skill_gap(resume_text, job_description)
+        # Fallback results are cheap to recompute and must not hide Gemini once it recovers.
+        if from_gemini:
+            self.analysis_cache.set(key, analysis)
+        return analysis
+
+    def _gemini_available(self) -> bool:
+        return bool(self.gemini_api_key) or self._gemini_client is not None
+
+    def _analyze_skill_gap(self, resume_text: str, job_description: str):
+        """(analysis, True) from Gemini, or (regex fallback analysis, False)."""
+        try:
+            if not self._gemini_available():
+                raise Exception("GEMINI_API_KEY not configured")
+
+            with metrics.stage('gemini'):
+                response = self.gemini_client().models.generate_content(
+                    model=GEMINI_MODEL,
+                    contents=PROMPT_TEMPLATE.format(resume_text=resume_text[:RESUME_PROMPT_CHARS],
+                                                    job_description=job_description)
+                )
             analysis_text = response.text.strip()
 
             analysis_text = analysis_text.replace('```json', '').replace('```', '').strip()
@@ -97,35 +156,63 @@ JSON only:"""
                 "missing_skills": missing,
                 "additional_skills": additional,
                 "skill_analysis": skill_analysis
-            }
+            }, True
 
         except (json.JSONDecodeError, KeyError, TypeError):
-            return skills_extractor.extract_skills_fallback_improved(resume_text, job_description)
+            return self._fallback_analysis(resume_text, job_description), False
 
         except Exception:
-            return skills_extractor.extract_skills_fallback_improved(resume_text, job_description)
+            return self._fallback_analysis(resume_text, job_description), False
+
+    def _fallback_analysis(self, resume_text: str, job_description: str) -> dict:
+        """Regex skill gap analysis; resume-side skills come from the shared resume cache when available."""
+        with metrics.stage('skill_gap_fallback'):
+            return self._fallback_skills(resume_text, job_description)
+
+    def _fallback_skills(self, resume_text: str, job_description: str) -> dict:
+        resume_skills = None
+        if self.resume_cache is not None:
+            resume_skills = self.resume_cache.get_or_compute(
+                self.resume_cache.key_for(resume_text), 'skill_gap_skills',
+                lambda: skills_extractor.extract_skills_from_text(resume_text),
+            )
+        return skills_extractor.extract_skills_fallback_improved(
+            resume_text, job_description, resume_skills=resume_skills
+        )
 
     def get_youtube_videos(self, skill: str, max_results: int = 3):
         """Get YouTube video suggestions for a skill."""
         return youtube_client.get_youtube_videos(self.youtube, skill, max_results)
 
+    def get_youtube_videos_many(self, skills: list, max_results: int = 3):
+        """Videos for several skills fetched concurrently: ({skill: videos}, skills that hit the deadline)."""
+        return youtube_client.get_youtube_videos_many(
+            self.youtube, skills, max_results,
+            timeout=self.youtube_timeout, deadline=self.youtube_deadline, max_workers=YOUTUBE_MAX_WORKERS,
+            cache=self.video_cache,
+        )
+
     def generate_learning_recommendations(self, missing_skills: list):
         """Generate learning recommendations for missing skills."""
         return learning.generate_learning_recommendations(missing_skills)
 
     def analyze_skill_gap_with_resources(self, resume_text: str, job_description: str) -> dict:
         """Complete skill gap analysis with learning resources."""
-        skill_analysis = self.analyze_skill_gap(resume_text, job_description)
-        missing_skills_videos = {}
-        for skill in (skill_analysis.get('missing_skills') or [])[:5]:
-            videos = self.get_youtube_videos(skill)
-            if videos:
-                missing_skills_videos[skill] = videos
-        recs = self.generate_learning_recommendations(skill_analysis.get('missing_skills', []))
+        with metrics.stage('skill_gap_analysis'):
+            skill_analysis = self.analyze_skill_gap(resume_text, job_description)
+        # The five searches run concurrently; a slow one costs at most youtube_deadline, not its full latency.
+        with metrics.stage('youtube'):
+            missing_skills_videos, timed_out = self.get_youtube_videos_many(
+                (skill_analysis.get('missing_skills') or [])[:5])
+        with metrics.stage('learning_recommendations'):
+            recs = self.generate_learning_recommendations(skill_analysis.get('missing_skills', []))
+        learning_resources = {
+            'youtube_videos': missing_skills_videos,
+            'recommendations': recs
+        }
+        if timed_out:
+            learning_resources['youtube_timed_out'] = timed_out
         return {
             'analysis': skill_analysis,
-            'learning_resources': {
-                'youtube_videos': missing_skills_videos,
-                'recommendations': recs
-            }
+            'learning_resources': learning_resources
         }
@@ -0,0 +1,8 @@
+"""Gemini client construction."""
+
+
+def create_client(api_key: str):
+    """A google-genai client (``client.models.generate_content``), created once per analyzer and reused."""
+    from google import genai
+
+    return genai.Client(api_key=api_key)
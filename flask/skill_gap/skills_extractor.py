@@ -1,180 +1,181 @@
-"""Regex-based skill extraction from text."""
-import re
-from typing import List, Dict
+"""Skill extraction from text with the shared single-pass skill matcher."""
+from typing import List, Dict, Optional
 
-SKILLS_PATTERNS = {
-    "security": r"\bsecurity\b",
-    "monitoring": r"\bmonitoring\b",
-    "detection": r"\bdetection\b",
-    "investigation": r"\binvestigation\b",
-    "response": r"\bresponse\b",
-    "analysis": r"\banalysis\b",
-    "risk assessment": r"\brisk assessment\b",
-    "threat detection": r"\bthreat detection\b",
-    "vulnerability management": r"\bvulnerability management\b",
-    "security monitoring": r"\bsecurity monitoring\b",
-    "python": r"\bpython\b",
-    "javascript": r"\b(?:javascript|js)\b",
-    "java": r"\bjava\b",
-    "typescript": r"\btypescript\b",
-    "c++": r"\bc\+\+\b",
-    "c#": r"\bc#\b",
-    "php": r"\bphp\b",
-    "go": r"\bgo\b",
-    "rust": r"\brust\b",
-    "swift": r"\bswift\b",
-    "kotlin": r"\bkotlin\b",
-    "scala": r"\bscala\b",
-    "ruby": r"\bruby\b",
-    "perl": r"\bperl\b",
-    "r": r"\br\b",
-    "matlab": r"\bmatlab\b",
-    "react": r"\breact\b",
-    "angular": r"\bangular\b",
-    "vue": r"\bvue\b",
-    "node.js": r"\b(?:node\.js|nodejs)\b",
-    "express": r"\bexpress\b",
-    "django": r"\bdjango\b",
-    "flask": r"\bflask\b",
-    "spring": r"\bspring\b",
-    "laravel": r"\blaravel\b",
-    "asp.net": r"\basp\.net\b",
-    "jquery": r"\bjquery\b",
-    "bootstrap": r"\bbootstrap\b",
-    "tailwind": r"\btailwind\b",
-    "sass": r"\bsass\b",
-    "less": r"\bless\b",
-    "mysql": r"\bmysql\b",
-    "postgresql": r"\b(?:postgresql|postgres)\b",
-    "mongodb": r"\bmongodb\b",
-    "redis": r"\bredis\b",
-    "sqlite": r"\bsqlite\b",
-    "oracle": r"\boracle\b",
-    "sql server": r"\bsql server\b",
-    "cassandra": r"\bcassandra\b",
-    "dynamodb": r"\bdynamodb\b",
-    "aws": r"\b(?:aws|amazon web services)\b",
-    "azure": r"\b(?:azure|microsoft azure)\b",
-    "gcp": r"\b(?:gcp|google cloud|google cloud platform)\b",
-    "heroku": r"\bheroku\b",
-    "digitalocean": r"\bdigitalocean\b",
-    "docker": r"\bdocker\b",
-    "kubernetes": r"\b(?:kubernetes|k8s)\b",
-    "jenkins": r"\bjenkins\b",
-    "git": r"\bgit\b",
-    "github": r"\bgithub\b",
-    "gitlab": r"\bgitlab\b",
-    "bitbucket": r"\bbitbucket\b",
-    "terraform": r"\bterraform\b",
-    "ansible": r"\bansible\b",
-    "chef": r"\bchef\b",
-    "puppet": r"\bpuppet\b",
-    "html": r"\bhtml\b",
-    "css": r"\bcss\b",
-    "http": r"\bhttp\b",
-    "rest": r"\brest\b",
-    "graphql": r"\bgraphql\b",
-    "soap": r"\bsoap\b",
-    "websocket": r"\bwebsocket\b",
-    "agile": r"\bagile\b",
-    "scrum": r"\bscrum\b",
-    "kanban": r"\bkanban\b",
-    "devops": r"\bdevops\b",
-    "ci/cd": r"\b(?:ci/cd|continuous integration|continuous deployment)\b",
-    "tdd": r"\b(?:tdd|test driven development)\b",
-    "bdd": r"\b(?:bdd|behavior driven development)\b",
-    "machine learning": r"\b(?:machine learning|ml)\b",
-    "deep learning": r"\bdeep learning\b",
-    "ai": r"\b(?:ai|artificial intelligence)\b",
-    "tensorflow": r"\btensorflow\b",
-    "pytorch": r"\bpytorch\b",
-    "scikit-learn": r"\b(?:scikit-learn|sklearn)\b",
-    "pandas": r"\bpandas\b",
-    "numpy": r"\bnumpy\b",
-    "matplotlib": r"\bmatplotlib\b",
-    "seaborn": r"\bseaborn\b",
-    "linux": r"\blinux\b",
-    "unix": r"\bunix\b",
-    "windows": r"\bwindows\b",
-    "macos": r"\b(?:macos|mac os)\b",
-    "android": r"\bandroid\b",
-    "ios": r"\bios\b",
-    "firebase": r"\bfirebase\b",
-    "elasticsearch": r"\belasticsearch\b",
-    "kafka": r"\bkafka\b",
-    "rabbitmq": r"\brabbitmq\b",
-    "nginx": r"\bnginx\b",
-    "apache": r"\bapache\b",
-    "cybersecurity": r"\b(?:cybersecurity|cyber security|cyber-security)\b",
-    "information security": r"\b(?:information security|infosec)\b",
-    "network security": r"\bnetwork security\b",
-    "penetration testing": r"\b(?:penetration testing|pen testing|pentesting)\b",
-    "vulnerability assessment": r"\bvulnerability assessment\b",
-    "siem": r"\bsiem\b",
-    "splunk": r"\bsplunk\b",
-    "wireshark": r"\bwireshark\b",
-    "metasploit": r"\bmetasploit\b",
-    "nmap": r"\bnmap\b",
-    "burp suite": r"\b(?:burp suite|burpsuite)\b",
-    "owasp": r"\bowasp\b",
-    "firewall": r"\bfirewall\b",
-    "ids": r"\b(?:ids|intrusion detection system)\b",
-    "ips": r"\b(?:ips|intrusion prevention system)\b",
-    "vpn": r"\bvpn\b",
-    "encryption": r"\bencryption\b",
-    "ssl": r"\b(?:ssl|tls)\b",
-    "pki": r"\bpki\b",
-    "iam": r"\b(?:iam|identity and access management)\b",
-    "soc": r"\b(?:soc|security operations center)\b",
-    "incident response": r"\bincident response\b",
-    "threat intelligence": r"\bthreat intelligence\b",
-    "malware analysis": r"\bmalware analysis\b",
-    "forensics": r"\b(?:forensics|digital forensics)\b",
-    "compliance": r"\bcompliance\b",
-    "gdpr": r"\bgdpr\b",
-    "hipaa": r"\bhipaa\b",
-    "pci dss": r"\b(?:pci dss|pci-dss)\b",
-    "iso 27001": r"\biso 27001\b",
-    "kali linux": r"\b(?:kali linux|kali)\b",
-    "nessus": r"\bnessus\b",
-    "qualys": r"\bqualys\b",
-    "rapid7": r"\brapid7\b",
-    "crowdstrike": r"\bcrowdstrike\b",
-    "sentinel": r"\bsentinel\b",
-    "carbon black": r"\bcarbon black\b",
-    "palo alto": r"\b(?:palo alto|paloalto)\b",
-    "checkpoint": r"\bcheckpoint\b",
-    "fortinet": r"\bfortinet\b",
-    "sql": r"\b(?:sql|structured query language)\b",
-    "nosql": r"\b(?:nosql|no sql)\b",
-    "api": r"\b(?:api|application programming interface)\b",
-    "microservices": r"\bmicroservices\b",
-    "gitlab ci": r"\b(?:gitlab ci|gitlab-ci)\b",
-    "github actions": r"\bgithub actions\b",
-    "jira": r"\bjira\b",
-    "confluence": r"\bconfluence\b",
-    "slack": r"\bslack\b",
-    "microsoft office": r"\b(?:microsoft office|ms office|office 365)\b",
-    "excel": r"\bexcel\b",
-    "powerpoint": r"\bpowerpoint\b",
-    "word": r"\bword\b",
+from utils.skill_matcher import SkillMatcher
+
+SKILL_ALIASES = {
+    "security": ["security"],
+    "monitoring": ["monitoring"],
+    "detection": ["detection"],
+    "investigation": ["investigation"],
+    "response": ["response"],
+    "analysis": ["analysis"],
+    "risk assessment": ["risk assessment"],
+    "threat detection": ["threat detection"],
+    "vulnerability management": ["vulnerability management"],
+    "security monitoring": ["security monitoring"],
+    "python": ["python"],
+    "javascript": ["javascript", "js"],
+    "java": ["java"],
+    "typescript": ["typescript"],
+    "c++": ["c++"],
+    "c#": ["c#"],
+    "php": ["php"],
+    "go": ["go"],
+    "rust": ["rust"],
+    "swift": ["swift"],
+    "kotlin": ["kotlin"],
+    "scala": ["scala"],
+    "ruby": ["ruby"],
+    "perl": ["perl"],
+    "r": ["r"],
+    "matlab": ["matlab"],
+    "react": ["react"],
+    "angular": ["angular"],
+    "vue": ["vue"],
+    "node.js": ["node.js", "nodejs"],
+    "express": ["express"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "spring": ["spring"],
+    "laravel": ["laravel"],
+    "asp.net": ["asp.net"],
+    "jquery": ["jquery"],
+    "bootstrap": ["bootstrap"],
+    "tailwind": ["tailwind"],
+    "sass": ["sass"],
+    "less": ["less"],
+    "mysql": ["mysql"],
+    "postgresql": ["postgresql", "postgres"],
+    "mongodb": ["mongodb"],
+    "redis": ["redis"],
+    "sqlite": ["sqlite"],
+    "oracle": ["oracle"],
+    "sql server": ["sql server"],
+    "cassandra": ["cassandra"],
+    "dynamodb": ["dynamodb"],
+    "aws": ["aws", "amazon web services"],
+    "azure": ["azure", "microsoft azure"],
+    "gcp": ["gcp", "google cloud", "google cloud platform"],
+    "heroku": ["heroku"],
+    "digitalocean": ["digitalocean"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "jenkins": ["jenkins"],
+    "git": ["git"],
+    "github": ["github"],
+    "gitlab": ["gitlab"],
+    "bitbucket": ["bitbucket"],
+    "terraform": ["terraform"],
+    "ansible": ["ansible"],
+    "chef": ["chef"],
+    "puppet": ["puppet"],
+    "html": ["html"],
+    "css": ["css"],
+    "http": ["http"],
+    "rest": ["rest"],
+    "graphql": ["graphql"],
+    "soap": ["soap"],
+    "websocket": ["websocket"],
+    "agile": ["agile"],
+    "scrum": ["scrum"],
+    "kanban": ["kanban"],
+    "devops": ["devops"],
+    "ci/cd": ["ci/cd", "continuous integration", "continuous deployment"],
+    "tdd": ["tdd", "test driven development"],
+    "bdd": ["bdd", "behavior driven development"],
+    "machine learning": ["machine learning", "ml"],
+    "deep learning": ["deep learning"],
+    "ai": ["ai", "artificial intelligence"],
+    "tensorflow": ["tensorflow"],
+    "pytorch": ["pytorch"],
+    "scikit-learn": ["scikit-learn", "sklearn"],
+    "pandas": ["pandas"],
+    "numpy": ["numpy"],
+    "matplotlib": ["matplotlib"],
+    "seaborn": ["seaborn"],
+    "linux": ["linux"],
+    "unix": ["unix"],
+    "windows": ["windows"],
+    "macos": ["macos", "mac os"],
+    "android": ["android"],
+    "ios": ["ios"],
+    "firebase": ["firebase"],
+    "elasticsearch": ["elasticsearch"],
+    "kafka": ["kafka"],
+    "rabbitmq": ["rabbitmq"],
+    "nginx": ["nginx"],
+    "apache": ["apache"],
+    "cybersecurity": ["cybersecurity", "cyber security", "cyber-security"],
+    "information security": ["information security", "infosec"],
+    "network security": ["network security"],
+    "penetration testing": ["penetration testing", "pen testing", "pentesting"],
+    "vulnerability assessment": ["vulnerability assessment"],
+    "siem": ["siem"],
+    "splunk": ["splunk"],
+    "wireshark": ["wireshark"],
+    "metasploit": ["metasploit"],
+    "nmap": ["nmap"],
+    "burp suite": ["burp suite", "burpsuite"],
+    "owasp": ["owasp"],
+    "firewall": ["firewall"],
+    "ids": ["ids", "intrusion detection system"],
+    "ips": ["ips", "intrusion prevention system"],
+    "vpn": ["vpn"],
+    "encryption": ["encryption"],
+    "ssl": ["ssl", "tls"],
+    "pki": ["pki"],
+    "iam": ["iam", "identity and access management"],
+    "soc": ["soc", "security operations center"],
+    "incident response": ["incident response"],
+    "threat intelligence": ["threat intelligence"],
+    "malware analysis": ["malware analysis"],
+    "forensics": ["forensics", "digital forensics"],
+    "compliance": ["compliance"],
+    "gdpr": ["gdpr"],
+    "hipaa": ["hipaa"],
+    "pci dss": ["pci dss", "pci-dss"],
+    "iso 27001": ["iso 27001"],
+    "kali linux": ["kali linux", "kali"],
+    "nessus": ["nessus"],
+    "qualys": ["qualys"],
+    "rapid7": ["rapid7"],
+    "crowdstrike": ["crowdstrike"],
+    "sentinel": ["sentinel"],
+    "carbon black": ["carbon black"],
+    "palo alto": ["palo alto", "paloalto"],
+    "checkpoint": ["checkpoint"],
+    "fortinet": ["fortinet"],
+    "sql": ["sql", "structured query language"],
+    "nosql": ["nosql", "no sql"],
+    "api": ["api", "application programming interface"],
+    "microservices": ["microservices"],
+    "gitlab ci": ["gitlab ci", "gitlab-ci"],
+    "github actions": ["github actions"],
+    "jira": ["jira"],
+    "confluence": ["confluence"],
+    "slack": ["slack"],
+    "microsoft office": ["microsoft office", "ms office", "office 365"],
+    "excel": ["excel"],
+    "powerpoint": ["powerpoint"],
+    "word": ["word"],
 }
 
 
+_MATCHER = SkillMatcher(SKILL_ALIASES)
+
+
 def extract_skills_from_text(text: str) -> List[str]:
-    """Extract skills from text using regex patterns."""
-    found = []
-    text_lower = text.lower()
-    for skill_name, pattern in SKILLS_PATTERNS.items():
-        if re.search(pattern, text_lower):
-            found.append(skill_name.title())
-    return found
+    """Extract skills from text in one pass over the skill vocabulary."""
+    return [skill_name.title() for skill_name in _MATCHER.find(text)]
 
 
-def extract_skills_fallback_improved(resume_text: str, job_description: str) -> Dict:
-    """Fallback skill gap analysis using regex extraction."""
+def extract_skills_fallback_improved(resume_text: str, job_description: str,
+                                     resume_skills: Optional[List[str]] = None) -> Dict:
+    """Fallback skill gap analysis using regex extraction (resume_skills may be passed in pre-extracted)."""
     job_skills = extract_skills_from_text(job_description)
-    resume_skills = extract_skills_from_text(resume_text)
+    if resume_skills is None:
+        resume_skills = extract_skills_from_text(resume_text)
     job_norm = [s.lower().strip() for s in job_skills]
     resume_norm = [s.lower().strip() for s in resume_skills]
 
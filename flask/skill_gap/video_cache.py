@@ -0,0 +1,120 @@
+"""Persistent cache of YouTube learning-video lookups, keyed by normalized skill and max_results.
+
+Missing skills repeat heavily across users (Docker, AWS, Kubernetes, ...), so search results
+are kept in SQLite (utils.cache.DiskCache) and shared by every worker:
+
+    fresh   younger than ``ttl``: served, no API call
+    stale   up to ``stale_ttl`` past expiry: served at once, refreshed in the background
+    missing fetched inline (concurrently, see youtube_client.get_youtube_videos_many)
+
+Empty results are not stored, since get_youtube_videos also returns [] for API errors and
+quota exhaustion. ``warm_up`` fills the cache for the skills in learning.SKILL_CATEGORIES:
+
+    python -m skill_gap.video_cache [--skills docker aws] [--max-results 3]
+"""
+import logging
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+FRESH, STALE, MISSING = 'fresh', 'stale', 'missing'
+
+
+def normalize_skill(skill: str) -> str:
+    return _WHITESPACE_RE.sub(' ', (skill or '').strip().lower())
+
+
+class VideoCache:
+    """Video lists per (skill, max_results) with TTL and a stale-while-revalidate window."""
+
+    def __init__(self, path: str, ttl: float = 7 * 86400, stale_ttl: float = 30 * 86400):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.disk = DiskCache(path, ttl=ttl, table='youtube_videos')
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.counts = {FRESH: 0, STALE: 0, MISSING: 0, 'refreshes': 0}
+
+    @staticmethod
+    def key_for(skill: str, max_results: int) -> str:
+        return f"{normalize_skill(skill)}|{int(max_results)}"
+
+    def lookup(self, skill: str, max_results: int) -> Tuple[Optional[List[Dict]], str]:
+        """(videos, FRESH | STALE | MISSING); entries past the stale window count as missing."""
+        videos, age, expired = self.disk.get_with_age(self.key_for(skill, max_results))
+        if age is None or (expired and age > self.ttl + self.stale_ttl):
+            state = MISSING
+        else:
+            state = STALE if expired else FRESH
+        with self._lock:
+            self.counts[state] += 1
+        return (videos if state != MISSING else None), state
+
+    def store(self, skill: str, max_results: int, videos: List[Dict]) -> None:
+        if videos:
+            self.disk.set(self.key_for(skill, max_results), videos)
+
+    def claim_refresh(self, skill: str, max_results: int) -> bool:
+        """True if the caller should refresh this entry (no refresh of it is already running)."""
+        key = self.key_for(skill, max_results)
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.counts['refreshes'] += 1
+            return True
+
+    def release_refresh(self, skill: str, max_results: int) -> None:
+        with self._lock:
+            self._refreshing.discard(self.key_for(skill, max_results))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = dict(self.counts)
+        return {**counts, 'entries': len(self.disk), 'ttl': self.ttl, 'stale_ttl': self.stale_ttl}
+
+
+def warm_up(youtube_client, cache: VideoCache, skills: Optional[Iterable[str]] = None,
+            max_results: int = 3, deadline: Optional[float] = 60.0) -> Dict:
+    """Fetch every skill (default: learning.SKILL_CATEGORIES) whose entry is not fresh."""
+    from . import learning
+    from .youtube_client import get_youtube_videos_many
+
+    skills = list(skills) if skills is not None else list(learning.SKILL_CATEGORIES)
+    pending = [s for s in skills if cache.lookup(s, max_results)[1] != FRESH]
+    videos, timed_out = get_youtube_videos_many(youtube_client, pending, max_results,
+                                                deadline=deadline, cache=cache, refresh=True)
+    return {'skills': len(skills), 'fetched': len(videos), 'already_fresh': len(skills) - len(pending),
+            'empty': [s for s in pending if s not in videos and s not in timed_out], 'timed_out': timed_out}
+
+
+def main():
+    import argparse
+    import json
+    import os
+
+    from config import YOUTUBE_CACHE_PATH, YOUTUBE_CACHE_TTL, YOUTUBE_CACHE_STALE_TTL
+
+    parser = argparse.ArgumentParser(description='Warm the YouTube learning-video cache.')
+    parser.add_argument('--skills', nargs='*', help="skills to fetch (default: learning.SKILL_CATEGORIES)")
+    parser.add_argument('--max-results', type=int, default=3)
+    args = parser.parse_args()
+    if not YOUTUBE_CACHE_PATH:
+        parser.error('YOUTUBE_CACHE_PATH is empty: the video cache is disabled')
+    if not os.getenv('YOUTUBE_API_KEY'):
+        parser.error('YOUTUBE_API_KEY is not set')
+
+    from googleapiclient.discovery import build
+    youtube = build('youtube', 'v3', developerKey=os.getenv('YOUTUBE_API_KEY'))
+    cache = VideoCache(YOUTUBE_CACHE_PATH, ttl=YOUTUBE_CACHE_TTL, stale_ttl=YOUTUBE_CACHE_STALE_TTL)
+    print(json.dumps(warm_up(youtube, cache, args.skills, args.max_results), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,29 @@
-"""YouTube API client for learning resources."""
-from typing import List, Dict, Optional, Any
+"""YouTube API client for learning resources.
 
+get_youtube_videos_many fans the per-skill searches out over a shared thread pool. Each call
+runs on its worker thread's own HTTP connection (httplib2 is not thread-safe) whose socket
+timeout bounds the call; the batch as a whole waits at most ``deadline`` seconds and returns
+whatever finished, listing the skills it gave up on. With a video_cache.VideoCache only
+uncached skills are searched; stale entries are served and refreshed in the background, on
+a separate small pool so refreshes never queue ahead of a request's own searches.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Iterable, Optional, Any, Tuple
 
-def get_youtube_videos(youtube_client: Optional[Any], skill: str, max_results: int = 3) -> List[Dict]:
-    """Get YouTube video suggestions for a skill."""
+# Background refreshes of stale cache entries run on their own pool of this many threads
+REFRESH_WORKERS = 2
+
+# Thread pools by (purpose, max_workers), so each caller's max_workers is honoured
+_executors: Dict[Tuple[str, int], ThreadPoolExecutor] = {}
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_youtube_videos(youtube_client: Optional[Any], skill: str, max_results: int = 3,
+                       http: Optional[Any] = None) -> List[Dict]:
+    """Get YouTube video suggestions for a skill (``http``: connection to execute the request on)."""
     if not youtube_client:
         return []
     try:
@@ -14,7 +34,7 @@ def get_youtube_videos(youtube_client: Optional[Any], skill: str, max_results: i
             maxResults=max_results,
             order="relevance"
         )
-        response = request.execute()
+        response = request.execute(http=http) if http is not None else request.execute()
         videos = []
         for item in response.get('items', []):
             video_id = item['id'].get('videoId')
@@ -33,3 +53,102 @@ def get_youtube_videos(youtube_client: Optional[Any], skill: str, max_results: i
         return videos
     except Exception:
         return []
+
+
+def _get_executor(max_workers: int, purpose: str = 'youtube') -> ThreadPoolExecutor:
+    key = (purpose, max_workers)
+    executor = _executors.get(key)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(key)
+            if executor is None:
+                executor = _executors[key] = ThreadPoolExecutor(max_workers=max_workers,
+                                                                thread_name_prefix=purpose)
+    return executor
+
+
+def _thread_http(timeout: Optional[float]):
+    """This worker thread's HTTP connection with a socket timeout (None for clients that bring their own)."""
+    if timeout is None:
+        return None
+    http = getattr(_local, 'http', None)
+    if http is None or getattr(_local, 'timeout', None) != timeout:
+        try:
+            import httplib2
+        except ImportError:
+            return None
+        http = _local.http = httplib2.Http(timeout=timeout)
+        _local.timeout = timeout
+    return http
+
+
+def _fetch(youtube_client: Any, skill: str, max_results: int, timeout: Optional[float], cache=None) -> List[Dict]:
+    http = _thread_http(timeout) if getattr(youtube_client, 'uses_http', True) else None
+    videos = get_youtube_videos(youtube_client, skill, max_results, http=http)
+    if cache is not None:
+        # Stored even when the request already gave up on this lookup, so the next one is a hit.
+        cache.store(skill, max_results, videos)
+    return videos
+
+
+def _refresh(youtube_client: Any, skill: str, max_results: int, timeout: Optional[float], cache) -> None:
+    try:
+        _fetch(youtube_client, skill, max_results, timeout, cache)
+    finally:
+        cache.release_refresh(skill, max_results)
+
+
+def get_youtube_videos_many(
+    youtube_client: Optional[Any],
+    skills: Iterable[str],
+    max_results: int = 3,
+    timeout: Optional[float] = 3.0,
+    deadline: Optional[float] = 5.0,
+    max_workers: int = 8,
+    cache=None,
+    refresh: bool = False,
+) -> Tuple[Dict[str, List[Dict]], List[str]]:
+    """Search for every skill concurrently: ({skill: videos} for lookups with results, skills timed out).
+
+    ``timeout`` is the socket timeout of each call; lookups not finished ``deadline`` seconds after
+    the start are left running in the background and reported as timed out. With ``cache``, only
+    skills it lacks are searched (all of them when ``refresh``) and new results are stored.
+    """
+    from .video_cache import MISSING, STALE
+
+    skills = list(dict.fromkeys(skills))
+    if not skills:
+        return {}, []
+    start = time.monotonic()
+    found: Dict[str, List[Dict]] = {}
+    to_fetch = skills
+    if cache is not None and not refresh:
+        to_fetch = []
+        for skill in skills:
+            videos, state = cache.lookup(skill, max_results)
+            if state == MISSING:
+                to_fetch.append(skill)
+                continue
+            found[skill] = videos
+            if state == STALE and youtube_client and cache.claim_refresh(skill, max_results):
+                _get_executor(REFRESH_WORKERS, 'youtube-refresh').submit(
+                    _refresh, youtube_client, skill, max_results, timeout, cache)
+
+    timed_out = []
+    if youtube_client and to_fetch:
+        executor = _get_executor(max_workers)
+        futures = {executor.submit(_fetch, youtube_client, skill, max_results, timeout, cache): skill
+                   for skill in to_fetch}
+        remaining = None if deadline is None else max(0.0, deadline - (time.monotonic() - start))
+        done, _ = wait(futures, timeout=remaining)
+        for future, skill in futures.items():
+            if future not in done:
+                future.cancel()
+                timed_out.append(skill)
+                continue
+            try:
+                found[skill] = future.result()
+            except Exception:
+                pass
+    return {skill: found[skill] for skill in skills if found.get(skill)}, timed_out
+
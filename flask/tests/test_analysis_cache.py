@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from benchmarks.fakes import FakeGeminiClient
+from skill_gap.analyzer import RESUME_PROMPT_CHARS, SkillGapAnalyzer, analysis_key
+from utils.cache import TieredCache
+
+RESUME = "Backend engineer, 5 years of Python, Flask, PostgreSQL and Docker."
+JOB_DESCRIPTION = "We need a Python developer with Docker and Kubernetes.\nAWS is a plus."
+REPLY = {'present_skills': ['Python', 'Docker'], 'missing_skills': ['Kubernetes'],
+         'additional_skills': ['Flask'], 'skill_details': {}}
+
+
+def test_key_ignores_jd_whitespace():
+    assert analysis_key(RESUME, JOB_DESCRIPTION) == analysis_key(RESUME, f"  {JOB_DESCRIPTION.replace(' ', '   ')}\n")
+
+
+def test_key_changes_with_content():
+    key = analysis_key(RESUME, JOB_DESCRIPTION)
+    assert analysis_key(RESUME, JOB_DESCRIPTION + " Go too.") != key
+    assert analysis_key(RESUME + " Go.", JOB_DESCRIPTION) != key
+
+
+def test_key_ignores_resume_text_gemini_never_sees():
+    long_resume = RESUME.ljust(RESUME_PROMPT_CHARS, '.')
+    assert analysis_key(long_resume, JOB_DESCRIPTION) == analysis_key(long_resume + " extra", JOB_DESCRIPTION)
+
+
+@pytest.fixture
+def disk_path(tmp_path):
+    return str(tmp_path / 'analysis.sqlite')
+
+
+def _analyzer(client, disk_path):
+    cache = TieredCache(max_entries=16, disk_path=disk_path, table='skill_gap_analysis')
+    return SkillGapAnalyzer(gemini_client=client, analysis_cache=cache)
+
+
+def test_repeated_pair_is_a_hit(disk_path):
+    client = FakeGeminiClient(REPLY)
+    analyzer = _analyzer(client, disk_path)
+    first = analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION)
+    assert analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION) == first
+    assert analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION.replace('\n', '  ')) == first
+    assert first['missing_skills'] == ['Kubernetes']
+    assert len(client.calls) == 1
+
+
+def test_different_jd_is_a_miss(disk_path):
+    client = FakeGeminiClient(REPLY)
+    analyzer = _analyzer(client, disk_path)
+    analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION)
+    analyzer.analyze_skill_gap(RESUME, "Senior Go engineer with Kafka.")
+    assert len(client.calls) == 2
+
+
+def test_second_analyzer_reads_from_disk(disk_path):
+    _analyzer(FakeGeminiClient(REPLY), disk_path).analyze_skill_gap(RESUME, JOB_DESCRIPTION)
+    client = FakeGeminiClient(REPLY)
+    analysis = _analyzer(client, disk_path).analyze_skill_gap(RESUME, JOB_DESCRIPTION)
+    assert analysis['missing_skills'] == ['Kubernetes']
+    assert client.calls == []
+
+
+def test_fallback_is_not_cached(disk_path):
+    failing = FakeGeminiClient("not json")
+    analyzer = _analyzer(failing, disk_path)
+    analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION)
+    analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION)
+    assert len(failing.calls) == 2
+    assert analyzer.analysis_cache.get(analysis_key(RESUME, JOB_DESCRIPTION)) is None
+
+    # Once Gemini answers, its analysis is what gets cached.
+    recovered = FakeGeminiClient(json.dumps(REPLY))
+    analyzer = _analyzer(recovered, disk_path)
+    assert analyzer.analyze_skill_gap(RESUME, JOB_DESCRIPTION)['missing_skills'] == ['Kubernetes']
+    assert analyzer.analysis_cache.get(analysis_key(RESUME, JOB_DESCRIPTION)) is not None
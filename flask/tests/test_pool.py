@@ -0,0 +1,46 @@
+import pytest
+
+from benchmarks.bench_loader import write_dump
+from benchmarks.synthetic import HashingEncoder, load_base_jobs, synthetic_resumes
+from job_recommender import JobRecommender
+from job_recommender.pool import PoolSizer
+
+
+def test_initial_pool_never_below_factor():
+    sizer = PoolSizer(factor=3.0)
+    for _ in range(20):
+        # Filters dropped nothing: only the first 40% of the fused list was needed.
+        sizer.observe('junior', top_k=10, pool=30, found=10, used_fraction=0.4)
+    assert sizer.initial('junior', 10) == 30
+
+
+def test_initial_pool_widens_in_doublings():
+    sizer = PoolSizer(factor=3.0, max_pool=1000)
+    sizer.observe('senior', top_k=10, pool=30, found=4, used_fraction=1.0)
+    assert sizer.initial('senior', 10) == 120
+    assert sizer.initial('senior', 10, limit=50) == 50
+
+
+@pytest.fixture(scope='module')
+def recommender(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('corpus')
+    write_dump(str(directory), 1500, 'jsonl')
+    recommender = JobRecommender(str(directory / 'data.json'), 'stub-hashing-384', pool_sizer=PoolSizer(),
+                                 sentence_model=HashingEncoder())
+    recommender._ensure_models_initialized()
+    return recommender
+
+
+def _ids(result):
+    return [job['id'] for job in result['top_jobs']]
+
+
+def test_repeated_requests_are_identical(recommender):
+    resumes = synthetic_resumes(load_base_jobs(), 20)
+    # One warm-up pass lets each query class settle its starting pool.
+    for resume in resumes:
+        recommender.recommend_jobs(resume, top_k=10)
+    first = {resume: _ids(recommender.recommend_jobs(resume, top_k=10)) for resume in resumes}
+    for _ in range(3):
+        for resume in resumes:
+            assert _ids(recommender.recommend_jobs(resume, top_k=10)) == first[resume]
@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from benchmarks.fakes import FakeYouTubeClient
+from skill_gap.video_cache import FRESH, MISSING, STALE, VideoCache
+from skill_gap.youtube_client import get_youtube_videos_many
+
+SKILLS = ['Kubernetes', 'Docker', 'AWS']
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_fan_out_returns_partial_results_at_deadline():
+    client = FakeYouTubeClient(latency={'Kubernetes': 0.05, 'Docker': 3.0, 'AWS': 0.05})
+    start = time.monotonic()
+    found, timed_out = get_youtube_videos_many(client, SKILLS, timeout=None, deadline=0.5)
+    assert time.monotonic() - start < 2.0
+    assert sorted(found) == ['AWS', 'Kubernetes']
+    assert timed_out == ['Docker']
+    assert [v['videoId'] for v in found['AWS']] == ['AWS-0', 'AWS-1', 'AWS-2']
+
+
+def test_fan_out_drops_failing_searches():
+    client = FakeYouTubeClient(failing=['Docker'])
+    found, timed_out = get_youtube_videos_many(client, SKILLS, timeout=None, deadline=5.0)
+    assert sorted(found) == ['AWS', 'Kubernetes']
+    assert timed_out == []
+
+
+def test_fan_out_deduplicates_skills():
+    client = FakeYouTubeClient()
+    found, _ = get_youtube_videos_many(client, ['AWS', 'AWS', 'Docker'], timeout=None, deadline=5.0)
+    assert sorted(found) == ['AWS', 'Docker']
+    assert sorted(client.calls) == ['AWS', 'Docker']
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return VideoCache(str(tmp_path / 'videos.sqlite'), ttl=0.2, stale_ttl=60)
+
+
+def test_cache_serves_fresh_entries_without_calls(cache):
+    client = FakeYouTubeClient()
+    get_youtube_videos_many(client, SKILLS, timeout=None, cache=cache)
+    assert len(client.calls) == 3
+    found, _ = get_youtube_videos_many(client, ['  docker ', 'AWS'], timeout=None, cache=cache)
+    assert sorted(found) == ['  docker ', 'AWS']
+    assert len(client.calls) == 3
+    assert cache.lookup('kubernetes', 3)[1] == FRESH
+
+
+def test_cache_serves_stale_entries_and_refreshes_once(cache):
+    client = FakeYouTubeClient()
+    get_youtube_videos_many(client, ['Docker'], timeout=None, cache=cache)
+    time.sleep(0.3)
+    assert cache.lookup('Docker', 3)[1] == STALE
+
+    slow = FakeYouTubeClient(latency=0.3)
+    start = time.monotonic()
+    found, timed_out = get_youtube_videos_many(slow, ['Docker'], timeout=None, deadline=5.0, cache=cache)
+    # Served from the stale entry at once; the refresh runs in the background.
+    assert time.monotonic() - start < 0.2
+    assert [v['videoId'] for v in found['Docker']] == ['Docker-0', 'Docker-1', 'Docker-2']
+    assert timed_out == []
+    # A second request while the refresh is in flight does not start another one.
+    get_youtube_videos_many(slow, ['Docker'], timeout=None, cache=cache)
+    assert _wait_for(lambda: cache.lookup('Docker', 3)[1] == FRESH)
+    assert slow.calls == ['Docker']
+
+
+def test_cache_does_not_store_empty_results(cache):
+    failing = FakeYouTubeClient(failing=['AWS'])
+    get_youtube_videos_many(failing, ['AWS'], timeout=None, cache=cache)
+    assert cache.lookup('AWS', 3) == (None, MISSING)
+    client = FakeYouTubeClient()
+    found, _ = get_youtube_videos_many(client, ['AWS'], timeout=None, cache=cache)
+    assert 'AWS' in found
+    assert client.calls == ['AWS']
+
+
+def test_stale_refreshes_do_not_delay_misses(cache):
+    stale_skills = [f'skill-{i}' for i in range(8)]
+    get_youtube_videos_many(FakeYouTubeClient(), stale_skills, timeout=None, cache=cache)
+    time.sleep(0.3)
+
+    latency = {skill: 1.0 for skill in stale_skills}
+    latency['Go'] = 0.05
+    client = FakeYouTubeClient(latency=latency)
+    found, timed_out = get_youtube_videos_many(client, stale_skills + ['Go'], timeout=None, deadline=0.5,
+                                               max_workers=2, cache=cache)
+    assert timed_out == []
+    assert sorted(found) == sorted(stale_skills + ['Go'])
@@ -0,0 +1,176 @@
+"""Small thread-safe caches: bounded in-memory LRU with TTL, SQLite disk tier, and the two combined."""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded LRU mapping with an optional per-entry time-to-live (seconds, 0 = no expiry)."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 0):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                expires_at, value = item
+                if not expires_at or expires_at > time.time():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.time() + ttl if ttl else 0, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        return {'size': len(self._data), 'max_entries': self.max_entries,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class DiskCache:
+    """Pickled values in a single SQLite file, with expiry timestamps. Safe to share between threads."""
+
+    def __init__(self, path: str, ttl: float = 0, table: str = 'cache'):
+        self.path = path
+        self.ttl = ttl
+        self.table = table
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {table} '
+            '(key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get_with_age(self, key: str) -> Tuple[Any, Optional[float], bool]:
+        """(value, age in seconds, expired) for key; (None, None, True) when absent.
+
+        Expired rows are returned rather than dropped so callers can serve stale data while refreshing.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT value, stored_at, expires_at FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None, None, True
+        value, stored_at, expires_at = row
+        try:
+            value = pickle.loads(value)
+        except Exception:
+            self.delete(key)
+            return None, None, True
+        now = time.time()
+        return value, now - stored_at, bool(expires_at) and expires_at <= now
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value, age, expired = self.get_with_age(key)
+        if age is None or expired:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)',
+                (key, blob, now, now + ttl if ttl else 0),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                f'DELETE FROM {self.table} WHERE expires_at != 0 AND expires_at <= ?', (time.time(),)
+            )
+        return cur.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def stats(self) -> Dict:
+        return {'path': self.path, 'size': len(self), 'hits': self.hits, 'misses': self.misses}
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional DiskCache; disk hits are promoted to memory."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 0, disk_path: Optional[str] = None,
+                 table: str = 'cache'):
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.disk = DiskCache(disk_path, ttl=ttl, table=table) if disk_path else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self.memory.set(key, value)
+                return value
+        return default
+
+    def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """(value, was_cached). Concurrent misses may compute twice; the last write wins."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value, True
+        value = compute()
+        self.set(key, value)
+        return value, False
+
+    def stats(self) -> Dict:
+        stats = {'memory': self.memory.stats()}
+        if self.disk is not None:
+            stats['disk'] = self.disk.stats()
+        return stats
@@ -0,0 +1,211 @@
+"""Lightweight hot-path instrumentation: stage timers, histograms and Prometheus text export.
+
+    with metrics.stage('tfidf'):
+        ...
+
+records the block's duration in the ``app_stage_seconds`` histogram (label ``stage``) and, while
+a request is being handled, in that request's Server-Timing list. ``observe`` adds a value to
+any histogram (e.g. the candidate pool size). ``init_app`` times every request, adds the
+Server-Timing header when enabled, and ``render`` produces the /metrics text.
+
+When METRICS_ENABLED is false, ``stage`` returns a shared no-op context manager and
+``observe`` returns at once, so instrumented code pays one function call per stage.
+"""
+import bisect
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import METRICS_ENABLED, SERVER_TIMING_ENABLED
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+enabled = METRICS_ENABLED
+server_timing = SERVER_TIMING_ENABLED
+
+# (stage, seconds) recorded during the current request, or None outside a request
+_request_stages: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    'request_stages', default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label set (Prometheus semantics)."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS,
+                 label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.label_names = tuple(label_names)
+        self._series: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Tuple = ()) -> None:
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][slot] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self) -> Dict[Tuple, Dict]:
+        """{labels: {'count', 'sum', 'buckets': [(upper bound, cumulative count), ...]}}."""
+        with self._lock:
+            items = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        result = {}
+        for labels, counts, total, count in items:
+            cumulative, running = [], 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                running += n
+                cumulative.append((bound, running))
+            result[labels] = {'count': count, 'sum': total, 'buckets': cumulative}
+        return result
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, s in sorted(self.snapshot().items()):
+            base = [f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels)]
+            for bound, n in s['buckets']:
+                le = '+Inf' if bound == float('inf') else _format_number(bound)
+                bucket_labels = ','.join(base + [f'le="{le}"'])
+                lines.append(f'{self.name}_bucket{{{bucket_labels}}} {n}')
+            suffix = f'{{{",".join(base)}}}' if base else ''
+            lines.append(f'{self.name}_sum{suffix} {_format_number(s["sum"])}')
+            lines.append(f'{self.name}_count{suffix} {s["count"]}')
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+_histograms: Dict[str, Histogram] = {}
+_registry_lock = threading.Lock()
+
+
+def histogram(name: str, help_text: str = '', buckets: Sequence[float] = LATENCY_BUCKETS,
+              label_names: Sequence[str] = ()) -> Histogram:
+    """Get or create a registered histogram."""
+    h = _histograms.get(name)
+    if h is None:
+        with _registry_lock:
+            h = _histograms.get(name)
+            if h is None:
+                h = _histograms[name] = Histogram(name, help_text or name, buckets, label_names)
+    return h
+
+
+STAGE_SECONDS = histogram('app_stage_seconds', 'Time spent in each processing stage', label_names=('stage',))
+REQUEST_SECONDS = histogram('app_request_seconds', 'HTTP request latency',
+                            label_names=('endpoint', 'method', 'status'))
+
+
+class _Stage:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name: str):
+    """Context manager timing one stage (a shared no-op when metrics are disabled)."""
+    return _Stage(name) if enabled else _NO_STAGE
+
+
+def record(name: str, seconds: float) -> None:
+    """Record an already measured stage duration."""
+    if not enabled:
+        return
+    STAGE_SECONDS.observe(seconds, (name,))
+    stages = _request_stages.get()
+    if stages is not None:
+        stages.append((name, seconds))
+
+
+@contextlib.contextmanager
+def collect_stages():
+    """Collect the stages recorded inside the block into the yielded list (e.g. to replay them elsewhere)."""
+    stages: List[Tuple[str, float]] = []
+    token = _request_stages.set(stages)
+    try:
+        yield stages
+    finally:
+        _request_stages.reset(token)
+
+
+def observe(name: str, value: float, buckets: Sequence[float] = SIZE_BUCKETS, help_text: str = '') -> None:
+    """Add a value to an unlabelled histogram (created with ``buckets`` on first use)."""
+    if enabled:
+        histogram(name, help_text, buckets).observe(value)
+
+
+def server_timing_header(stages: List[Tuple[str, float]]) -> str:
+    """Server-Timing value; repeated stages (e.g. several retrieval rounds) are summed."""
+    totals: Dict[str, float] = {}
+    for name, seconds in stages:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ', '.join(f'{name};dur={seconds * 1000:.2f}' for name, seconds in totals.items())
+
+
+def render() -> str:
+    """All registered histograms in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for name in sorted(_histograms):
+        lines.extend(_histograms[name].render())
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(app) -> None:
+    """Time every request; add a Server-Timing header with its stages when SERVER_TIMING_ENABLED."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_timer():
+        if enabled:
+            g._metrics_start = time.perf_counter()
+            g._metrics_token = _request_stages.set([])
+
+    @app.after_request
+    def _finish_request_timer(response):
+        start = g.pop('_metrics_start', None)
+        token = g.pop('_metrics_token', None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        REQUEST_SECONDS.observe(elapsed, (request.endpoint or 'unknown', request.method, str(response.status_code)))
+        stages = _request_stages.get() or []
+        if token is not None:
+            _request_stages.reset(token)
+        if server_timing:
+            response.headers['Server-Timing'] = server_timing_header(stages + [('total', elapsed)])
+        return response
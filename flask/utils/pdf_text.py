@@ -0,0 +1,208 @@
+"""Pluggable PDF text extraction.
+
+Backends:
+    pypdf2   PyPDF2 (always available, the reference path)
+    pymupdf  PyMuPDF (``fitz``), several times faster on long documents; optional dependency
+
+PDF_BACKEND='auto' uses PyMuPDF when it is installed. Each backend opens a document from
+bytes or a seekable binary stream and exposes ``page_count`` and ``page_text(i)``. At most
+PDF_MAX_PAGES pages are read, and their text is joined once at the end.
+
+PDFs with at least PDF_POOL_MIN_PAGES pages are split into page ranges extracted in a
+spawned process pool. Each range may take PDF_PAGE_TIMEOUT seconds per page. When a range
+overruns, its pages are left out and the pool is terminated, which kills the stuck worker.
+A new pool is started on next use, so one pathological upload cannot stall a web worker.
+In-process extraction cannot be interrupted mid-page; it stops between pages once the same
+budget is spent.
+"""
+import importlib.util
+import io
+import logging
+import multiprocessing
+import threading
+import time
+from typing import BinaryIO, List, Optional, Union
+
+from config import PDF_BACKEND, PDF_MAX_PAGES, PDF_PAGE_TIMEOUT, PDF_POOL_MIN_PAGES, PDF_POOL_WORKERS
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('pypdf2', 'pymupdf')
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_disabled = False
+
+
+class PyPDF2Document:
+    name = 'pypdf2'
+
+    def __init__(self, source: Union[bytes, BinaryIO]):
+        import PyPDF2
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        self._reader = PyPDF2.PdfReader(source)
+
+    @property
+    def page_count(self) -> int:
+        return len(self._reader.pages)
+
+    def page_text(self, i: int) -> str:
+        return self._reader.pages[i].extract_text() or ""
+
+    def close(self) -> None:
+        pass
+
+
+class PyMuPDFDocument:
+    name = 'pymupdf'
+
+    def __init__(self, source: Union[bytes, BinaryIO]):
+        import fitz
+
+        data = source if isinstance(source, (bytes, bytearray)) else _read_all(source)
+        self._doc = fitz.open(stream=data, filetype='pdf')
+
+    @property
+    def page_count(self) -> int:
+        return self._doc.page_count
+
+    def page_text(self, i: int) -> str:
+        return self._doc.load_page(i).get_text() or ""
+
+    def close(self) -> None:
+        self._doc.close()
+
+
+_DOCUMENTS = {'pypdf2': PyPDF2Document, 'pymupdf': PyMuPDFDocument}
+
+
+def _read_all(source: Union[bytes, BinaryIO]) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, memoryview):
+        return source.tobytes()
+    source.seek(0)
+    return source.read()
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """Backend name to use for ``name`` (default PDF_BACKEND); falls back to pypdf2."""
+    name = (name or PDF_BACKEND or 'auto').lower()
+    if name == 'auto':
+        return 'pymupdf' if importlib.util.find_spec('fitz') is not None else 'pypdf2'
+    if name not in _DOCUMENTS:
+        logger.warning(f"Unknown PDF backend {name!r}, using pypdf2")
+        return 'pypdf2'
+    if name == 'pymupdf' and importlib.util.find_spec('fitz') is None:
+        logger.warning("PDF_BACKEND=pymupdf but PyMuPDF is not installed, using pypdf2")
+        return 'pypdf2'
+    return name
+
+
+def _extract_range(backend: str, data: bytes, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) - runs in a pool worker."""
+    doc = _DOCUMENTS[backend](data)
+    try:
+        return [doc.page_text(i) for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def _get_pool(workers: int):
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: forking a threaded server process can deadlock the child
+                _pool = multiprocessing.get_context('spawn').Pool(workers)
+    return _pool
+
+
+def _discard_pool(pool) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.terminate()
+
+
+def disable_pool() -> None:
+    """Extract every PDF in-process from now on (e.g. inside a worker_pool worker)."""
+    global _pool_disabled
+    _pool_disabled = True
+
+
+def start_pool(workers: int = PDF_POOL_WORKERS) -> None:
+    """Spawn the pool's workers now rather than on the first long PDF."""
+    _get_pool(workers).map(len, [()] * workers)
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.terminate()
+
+
+def _extract_pooled(backend: str, data: bytes, pages: int, page_timeout: float, workers: int) -> List[str]:
+    pool = _get_pool(workers)
+    size = -(-pages // workers)
+    ranges = [(start, min(start + size, pages)) for start in range(0, pages, size)]
+    started = time.monotonic()
+    pending = [(start, stop, pool.apply_async(_extract_range, (backend, data, start, stop))) for start, stop in ranges]
+    texts: List[str] = []
+    overran = False
+    for start, stop, result in pending:
+        remaining = max(0.0, started + page_timeout * (stop - start) - time.monotonic())
+        try:
+            texts.extend(result.get(timeout=remaining))
+        except multiprocessing.TimeoutError:
+            overran = True
+            logger.warning(f"PDF pages {start + 1}-{stop} exceeded {page_timeout}s per page, skipped")
+    if overran:
+        _discard_pool(pool)
+    return texts
+
+
+def _extract_inline(doc, pages: int, page_timeout: float) -> List[str]:
+    deadline = time.monotonic() + page_timeout * pages
+    texts = []
+    for i in range(pages):
+        texts.append(doc.page_text(i))
+        if time.monotonic() > deadline and i + 1 < pages:
+            logger.warning(f"PDF extraction exceeded {page_timeout}s per page, stopped after {i + 1} of {pages} pages")
+            break
+    return texts
+
+
+def extract_pdf_text(
+    source: Union[bytes, BinaryIO],
+    backend: Optional[str] = None,
+    max_pages: int = PDF_MAX_PAGES,
+    page_timeout: float = PDF_PAGE_TIMEOUT,
+    pool_min_pages: int = PDF_POOL_MIN_PAGES,
+    pool_workers: int = PDF_POOL_WORKERS,
+) -> str:
+    """Text of the first ``max_pages`` pages (0 = all), one line break between pages.
+
+    Documents with at least ``pool_min_pages`` pages (0 = never) are extracted in the process pool.
+    """
+    backend = resolve_backend(backend)
+    doc = _DOCUMENTS[backend](source)
+    try:
+        total = doc.page_count
+        pages = min(total, max_pages) if max_pages > 0 else total
+        if pages < total:
+            logger.info(f"PDF has {total} pages, extracting the first {pages}")
+        metrics.observe('app_pdf_pages', pages, help_text='Pages extracted per PDF')
+        if not _pool_disabled and pool_min_pages > 0 and pages >= pool_min_pages and pool_workers > 0:
+            texts = _extract_pooled(backend, _read_all(source), pages, page_timeout, pool_workers)
+        else:
+            texts = _extract_inline(doc, pages, page_timeout)
+    finally:
+        doc.close()
+    return "\n".join(texts).strip()
@@ -0,0 +1,54 @@
+"""Cache of per-resume derived data (analysis, TF-IDF vector, embedding, ...) keyed by a hash of the text.
+
+The same resume is often submitted several times in a row (retries, a different
+top_k or location, then a skill-gap analysis), so everything derived purely from
+the extracted text is kept here and shared by the job recommender and the skill
+gap analyzer. Fields that depend on a model carry a version tag in their name
+(``"embedding:<model>"``) so a model change never serves stale vectors.
+"""
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from .cache import TieredCache
+
+_MISSING = object()
+
+
+class ResumeCache:
+    """Bounded LRU (optionally persisted to SQLite) with per-field hit/miss counters."""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600, disk_path: Optional[str] = None):
+        self._cache = TieredCache(max_entries=max_entries, ttl=ttl, disk_path=disk_path, table='resume_cache')
+        self._lock = threading.Lock()
+        self._field_stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def key_for(resume_text: str) -> str:
+        return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+
+    def get_or_compute(self, text_hash: str, field: str, compute: Callable[[], Any]) -> Any:
+        value, cached = self._cache.get_or_compute(f"{field}|{text_hash}", compute)
+        self._record(field, cached)
+        return value
+
+    def get(self, text_hash: str, field: str, default: Any = None) -> Any:
+        value = self._cache.get(f"{field}|{text_hash}", _MISSING)
+        self._record(field, value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def set(self, text_hash: str, field: str, value: Any) -> None:
+        self._cache.set(f"{field}|{text_hash}", value)
+
+    def _record(self, field: str, hit: bool) -> None:
+        name = field.split(':', 1)[0]
+        with self._lock:
+            counters = self._field_stats.setdefault(name, {'hits': 0, 'misses': 0})
+            counters['hits' if hit else 'misses'] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            fields = {k: dict(v) for k, v in self._field_stats.items()}
+        hits = sum(v['hits'] for v in fields.values())
+        misses = sum(v['misses'] for v in fields.values())
+        return {'hits': hits, 'misses': misses, 'fields': fields, **self._cache.stats()}
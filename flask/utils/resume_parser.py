@@ -1,9 +1,25 @@
-"""Extract text from resume files (PDF, DOCX, TXT)."""
-import PyPDF2
+"""Extract text from resume files (PDF, DOCX, TXT).
+
+Uploads are parsed straight from the request stream: Werkzeug already holds small files in
+memory and spools larger ones to an anonymous temporary file, so PDF and DOCX readers get
+the stream itself and TXT is decoded from one read of it (a view, for bytes given as BytesIO).
+"""
+import io
+import tempfile
+from typing import BinaryIO, Set, Union
+
 import docx2txt
-from typing import Set
+
+from config import RESUME_MAX_BYTES, RESUME_SPOOL_BYTES
+from utils import metrics
+from utils.pdf_text import extract_pdf_text
 
 ALLOWED_EXTENSIONS: Set[str] = {'pdf', 'docx', 'txt'}
+_CHUNK = 64 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """Resume upload larger than RESUME_MAX_BYTES."""
 
 
 def allowed_file(filename: str) -> bool:
@@ -11,22 +27,80 @@ def allowed_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def extract_resume_text(file_path: str, file_extension: str) -> str:
-    """Extract text from resume file based on its extension."""
+def upload_extension(filename: str) -> str:
+    return filename.rsplit('.', 1)[1].lower()
+
+
+def open_upload(stream: BinaryIO, max_bytes: int = RESUME_MAX_BYTES) -> BinaryIO:
+    """Seekable binary stream positioned at 0 holding at most ``max_bytes``; raises UploadTooLarge.
+
+    Seekable streams are measured and returned as they are. Others are copied chunk by chunk
+    into a SpooledTemporaryFile (in memory up to RESUME_SPOOL_BYTES), stopping at the cap.
+    """
+    if stream.seekable():
+        size = stream.seek(0, io.SEEK_END)
+        if size > max_bytes:
+            raise UploadTooLarge(f"Resume is larger than {max_bytes // 1024} KB")
+        stream.seek(0)
+        return stream
+    spool = tempfile.SpooledTemporaryFile(max_size=RESUME_SPOOL_BYTES)
+    size = 0
+    while True:
+        chunk = stream.read(_CHUNK)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            spool.close()
+            raise UploadTooLarge(f"Resume is larger than {max_bytes // 1024} KB")
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def extract_upload_text(file, max_bytes: int = RESUME_MAX_BYTES) -> str:
+    """Text of an uploaded resume (a Werkzeug FileStorage), parsed without writing it to disk."""
+    with metrics.stage('upload_read'):
+        stream = open_upload(file.stream, max_bytes)
+    return extract_resume_text(stream, upload_extension(file.filename))
+
+
+def _buffer(stream: BinaryIO) -> Union[memoryview, bytes]:
+    """The stream's bytes: a view of a BytesIO's buffer without copying, else read from the start."""
+    if isinstance(stream, io.BytesIO):
+        return stream.getbuffer()
+    stream.seek(0)
+    return stream.read()
+
+
+def extract_resume_text(source: Union[str, bytes, BinaryIO], file_extension: str) -> str:
+    """Extract text from a resume given as a file path, bytes or a seekable binary stream."""
+    label = file_extension if file_extension in ALLOWED_EXTENSIONS else 'other'
+    with metrics.stage(f'extract_{label}'):
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                return _extract_resume_text(f, file_extension)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        return _extract_resume_text(source, file_extension)
+
+
+def _extract_resume_text(stream: BinaryIO, file_extension: str) -> str:
     try:
         if file_extension == 'pdf':
-            text = ""
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    page_text = page.extract_text() or ""
-                    text += page_text + "\n"
-            return text.strip()
+            return extract_pdf_text(stream)
         if file_extension == 'docx':
-            return docx2txt.process(file_path)
+            return docx2txt.process(stream)
         if file_extension == 'txt':
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read().strip()
+            buffer = _buffer(stream)
+            try:
+                text = str(buffer, 'utf-8')
+            finally:
+                if isinstance(buffer, memoryview):
+                    buffer.release()
+            if '\r' in text:  # newline translation, as reading in text mode did
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text.strip()
         raise ValueError("Unsupported resume format. Use PDF, DOCX, or TXT.")
     except Exception as e:
         raise Exception(f"Error extracting text from {file_extension} file: {str(e)}")
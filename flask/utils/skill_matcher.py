@@ -0,0 +1,62 @@
+"""Single-pass skill matcher shared by job preprocessing, resume analysis and skill-gap extraction.
+
+The vocabulary is compiled once into a table keyed by the first word token of
+every surface form ("c" for "c++", "node" for "node.js", "sql" for
+"sql server"). Matching walks the word tokens of the text once; at each token
+only the forms that start with it are compared, so the cost no longer grows
+with the number of skills. A form matches when it starts at a word boundary
+and is not followed by a word character, which also handles forms that end in
+punctuation such as "c++" and "c#".
+"""
+import re
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """Match a fixed vocabulary of canonical skills, each with one or more lowercase surface forms."""
+
+    def __init__(self, aliases: Dict[str, Iterable[str]]):
+        self.canonical: List[str] = list(aliases)
+        self._forms_by_token: Dict[str, List[Tuple[str, int]]] = {}
+        for order, (canonical, forms) in enumerate(aliases.items()):
+            for form in forms:
+                form = form.lower()
+                first = _TOKEN_RE.match(form)
+                if not first:
+                    raise ValueError(f"Skill form must start with a word character: {form!r}")
+                self._forms_by_token.setdefault(first.group(), []).append((form, order))
+        # Longest forms first so the common case ("sql server" before "sql") reads naturally.
+        for forms in self._forms_by_token.values():
+            forms.sort(key=lambda f: -len(f[0]))
+
+    def find_ids(self, text: str) -> List[int]:
+        """Vocabulary positions of the skills present in text, in vocabulary order."""
+        if not text:
+            return []
+        text = text.lower()
+        n = len(text)
+        found = set()
+        forms_by_token = self._forms_by_token
+        for m in _TOKEN_RE.finditer(text):
+            forms = forms_by_token.get(m.group())
+            if not forms:
+                continue
+            pos = m.start()
+            for form, order in forms:
+                if order in found or not text.startswith(form, pos):
+                    continue
+                end = pos + len(form)
+                if end == n or not _is_word_char(text[end]):
+                    found.add(order)
+        return sorted(found)
+
+    def find(self, text: str) -> List[str]:
+        """Canonical names of the skills present in text, in vocabulary order."""
+        canonical = self.canonical
+        return [canonical[i] for i in self.find_ids(text)]
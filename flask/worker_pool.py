@@ -0,0 +1,180 @@
+"""Process pool for CPU-bound resume work: text extraction and recommendation scoring.
+
+Request threads hand tasks to WORKER_POOL_SIZE spawned processes, so parsing, regex analysis,
+encoding and fusion run outside the web process's GIL. Each worker loads its own
+JobRecommender with models initialized up front; the job embeddings and TF-IDF matrix are
+opened memory-mapped from the model store, so workers share them read-only through the
+page cache. Workers pick up ingested jobs the same way other web workers do
+(services._maybe_refresh_job_recommender).
+
+At most WORKER_POOL_MAX_PENDING tasks are queued or running. Past that, when a task does
+not finish within WORKER_POOL_TIMEOUT seconds, and when its worker dies (the broken pool is
+shut down and replaced), PoolBusy is raised; the app turns it into 503 with Retry-After. Stage timings recorded in a worker are replayed into the caller's
+request metrics.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Set in each worker by _init_worker: warm-up pings wait here until every worker holds one.
+_warm_barrier = None
+
+
+class PoolBusy(RuntimeError):
+    """The worker pool cannot take (or finish) the task now; retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _init_worker(warm_barrier=None) -> None:
+    global _warm_barrier
+    from job_recommender import ingest, store
+    from services import get_job_recommender
+    from utils import pdf_text
+
+    # Long PDFs are already off the request thread here; a nested pool would only add processes.
+    pdf_text.disable_pool()
+    _warm_barrier = warm_barrier
+    recommender = get_job_recommender()
+    # The first worker builds a missing model store; the others wait, then open it memory-mapped.
+    with ingest.store_lock(store.get_store_dir(recommender.data_path)):
+        recommender._ensure_models_initialized()
+    logger.info(f"Worker {os.getpid()} ready")
+
+
+def _run(task: str, args: tuple, submitted: float):
+    """Run one task in a worker: (result, stages recorded while running it)."""
+    started = time.time()
+    with metrics.collect_stages() as stages:
+        if task == 'extract':
+            from utils.resume_parser import extract_resume_text
+            result = extract_resume_text(*args)
+        elif task == 'recommend':
+            from services import get_job_recommender
+            result = get_job_recommender().recommend_jobs(*args)
+        elif task == 'ping':
+            # A worker blocked here cannot take another ping, so each ping lands in its own process.
+            if _warm_barrier is not None:
+                _warm_barrier.wait(*args)
+            result = os.getpid()
+        else:
+            result = None
+    return result, [('worker_queue', max(0.0, started - submitted))] + stages
+
+
+class WorkerPool:
+    """Bounded ProcessPoolExecutor with warm workers and a pending-task limit."""
+
+    def __init__(self, workers: int = 2, max_pending: int = 8, timeout: float = 60.0, retry_after: int = 2):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor = None
+        self._warm_barrier = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.counts = {'completed': 0, 'rejected': 0, 'timed_out': 0, 'restarts': 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            import multiprocessing
+            # spawn: forking a threaded server process can deadlock the child
+            context = multiprocessing.get_context('spawn')
+            self._warm_barrier = context.Barrier(self.workers)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self._warm_barrier,), mp_context=context)
+        return self._executor
+
+    def _discard_executor(self, executor) -> None:
+        """Drop a broken executor (a worker died, e.g. killed for memory); the next task starts a fresh one.
+
+        Call with ``_lock`` held.
+        """
+        if self._executor is executor:
+            self._executor = None
+            self.counts['restarts'] += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _done(self, future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.counts['completed'] += 1
+
+    def _call(self, task: str, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.counts['rejected'] += 1
+                raise PoolBusy(f"Server busy: {self._pending} resumes in progress, try again shortly",
+                               self.retry_after)
+            executor = self._get_executor()
+            try:
+                future = executor.submit(_run, task, args, time.time())
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                executor = self._get_executor()
+                future = executor.submit(_run, task, args, time.time())
+            self._pending += 1
+        future.add_done_callback(self._done)
+        try:
+            result, stages = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self.counts['timed_out'] += 1
+            raise PoolBusy(f"Resume processing took longer than {self.timeout:g}s", self.retry_after)
+        except BrokenProcessPool:
+            # The worker running this task died; the task itself may be what killed it, so no retry.
+            with self._lock:
+                self._discard_executor(executor)
+            raise PoolBusy("A resume worker stopped unexpectedly, try again shortly", self.retry_after)
+        for name, seconds in stages:
+            metrics.record(name, seconds)
+        return result
+
+    def extract_resume_text(self, data: bytes, file_extension: str) -> str:
+        return self._call('extract', data, file_extension)
+
+    def recommend_jobs(self, resume_text: str, location_filter: str = None, top_k: int = 10) -> Dict:
+        return self._call('recommend', resume_text, location_filter, top_k)
+
+    def warm_up(self) -> int:
+        """Start every worker now (each loads the models) instead of on the first request.
+
+        One ping per worker, each held at a barrier until all have arrived, so every process has
+        run _init_worker when this returns. Returns the number of workers that answered.
+        """
+        with self._lock:
+            executor, barrier = self._get_executor(), self._warm_barrier
+        futures = [executor.submit(_run, 'ping', (self.timeout,), time.time()) for _ in range(self.workers)]
+        pids = set()
+        for future in futures:
+            try:
+                pids.add(future.result()[0])
+            except threading.BrokenBarrierError:
+                pass
+        if len(pids) < self.workers:
+            barrier.reset()
+            logger.warning(f"Worker pool warm-up: {len(pids)} of {self.workers} workers ready "
+                           f"within {self.timeout:g}s")
+        return len(pids)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self.counts, 'pending': self._pending, 'workers': self.workers,
+                    'max_pending': self.max_pending, 'started': self._executor is not None}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)